@@ -73,6 +73,12 @@ def tray(debug=False):
               help="Clockify API key.")
 @click.option("--clockify-workspace", envvar="CLOCKIFY_WORKSPACE",
               help="Clockify workspace")
+@click.option("--processor-workers", type=int, default=1,
+              envvar="FTRACK_EVENT_PROCESSOR_WORKERS",
+              help="Count of projects which events are processed in parallel")
+@click.option("--coalesce-window", type=float, default=0,
+              envvar="FTRACK_EVENT_COALESCE_WINDOW",
+              help="Seconds in which update events are merged into one event")
 def eventserver(debug,
                 ftrack_url,
                 ftrack_user,
@@ -82,7 +88,9 @@ def eventserver(debug,
                 store_credentials,
                 legacy,
                 clockify_api_key,
-                clockify_workspace):
+                clockify_workspace,
+                processor_workers,
+                coalesce_window):
     """Launch ftrack event server.
 
     This should be ideally used by system service (such us systemd or upstart
@@ -104,7 +112,9 @@ def eventserver(debug,
         store_credentials,
         legacy,
         clockify_api_key,
-        clockify_workspace
+        clockify_workspace,
+        processor_workers,
+        coalesce_window
     )
 
 
@@ -168,6 +178,34 @@ def texturecopy(debug, project, asset, path):
     PypeCommands().texture_copy(project, asset, path)
 
 
+@main.command()
+@click.option("-d", "--debug", is_flag=True, help="Print debug messages")
+@click.option("-p", "--project", required=True,
+              help="name of project which roots are cleaned")
+@click.option("--dry-run", is_flag=True,
+              help="only report unreferenced blobs")
+def contentstoregc(debug, project, dry_run):
+    """Remove unreferenced blobs from content store of project roots.
+
+    Blob is unreferenced when no published file is hardlinked to it. Reports
+    count and size of removed blobs and disk space saved by kept blobs.
+    """
+    if debug:
+        os.environ['OPENPYPE_DEBUG'] = '3'
+    PypeCommands().content_store_gc(project, dry_run)
+
+
+@main.command()
+@click.option("--max-age", type=float,
+              help="remove also hashes not used for this count of days")
+def prunehashcache(max_age):
+    """Remove invalid hashes from persistent file hash cache.
+
+    Hash is invalid when the hashed file does not exist or was changed.
+    """
+    PypeCommands().prune_file_hash_cache(max_age)
+
+
 @main.command(context_settings={"ignore_unknown_options": True})
 @click.option("--app", help="Registered application name")
 @click.option("--project", help="Project name",
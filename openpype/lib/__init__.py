@@ -26,7 +26,10 @@ from .terminal import Terminal
 from .execute import (
     get_pype_execute_args,
     execute,
-    run_subprocess
+    run_subprocess,
+    get_subprocess_workers,
+    SubprocessJob,
+    SubprocessPool
 )
 from .log import PypeLogger, timeit
 from .mongo import (
@@ -47,6 +50,7 @@ from .vendor_bin_utils import (
     get_vendor_bin_path,
     get_oiio_tools_path,
     get_ffmpeg_tool_path,
+    ffprobe_data,
     ffprobe_streams
 )
 
@@ -122,12 +126,39 @@ from .plugin_tools import (
     should_decompress
 )
 
+from .burnin_tools import (
+    find_burnin_profile,
+    filter_burnins_by_families,
+    filter_burnins_by_tags,
+    prepare_burnin_options,
+    prepare_burnin_values,
+    prepare_basic_burnin_data,
+    prepare_repre_burnin_data
+)
+
 from .path_tools import (
     version_up,
     get_version_from_path,
     get_last_version_from_path
 )
 
+from .file_transfers import (
+    replace_file,
+    FileTransferError,
+    FileTransfers
+)
+from .file_hash_cache import (
+    FileHashCache,
+    file_content_hash,
+    get_file_hash_cache,
+    get_file_hash
+)
+from .content_store import (
+    ContentStore,
+    get_content_store,
+    collect_content_store_garbage
+)
+
 from .editorial import (
     is_overlapping_otio_ranges,
     otio_range_to_frame_range,
@@ -145,6 +176,9 @@ __all__ = [
     "get_pype_execute_args",
     "execute",
     "run_subprocess",
+    "get_subprocess_workers",
+    "SubprocessJob",
+    "SubprocessPool",
 
     "env_value_to_bool",
     "get_paths_from_environ",
@@ -153,6 +187,7 @@ __all__ = [
     "get_vendor_bin_path",
     "get_oiio_tools_path",
     "get_ffmpeg_tool_path",
+    "ffprobe_data",
     "ffprobe_streams",
 
     "modules_from_path",
@@ -215,6 +250,14 @@ __all__ = [
     "get_decompress_dir",
     "should_decompress",
 
+    "find_burnin_profile",
+    "filter_burnins_by_families",
+    "filter_burnins_by_tags",
+    "prepare_burnin_options",
+    "prepare_burnin_values",
+    "prepare_basic_burnin_data",
+    "prepare_repre_burnin_data",
+
     "version_up",
     "get_version_from_path",
     "get_last_version_from_path",
@@ -235,6 +278,17 @@ __all__ = [
 
     "timeit",
 
+    "replace_file",
+    "FileTransferError",
+    "FileTransfers",
+    "FileHashCache",
+    "file_content_hash",
+    "get_file_hash_cache",
+    "get_file_hash",
+    "ContentStore",
+    "get_content_store",
+    "collect_content_store_garbage",
+
     "is_overlapping_otio_ranges",
     "otio_range_with_handles",
     "convert_to_padded_path",
@@ -4,6 +4,7 @@ import copy
 import platform
 import collections
 import numbers
+import string
 
 from openpype.settings.lib import (
     get_default_anatomy_settings,
@@ -18,6 +19,13 @@ try:
 except NameError:
     StringType = str
 
+try:
+    from _string import formatter_field_name_split
+except ImportError:
+    # Python 2
+    def formatter_field_name_split(field_name):
+        return field_name._formatter_field_name_split()
+
 
 def merge_dict(main_dict, enhance_dict):
     """Merges dictionaries by keys.
@@ -426,14 +434,42 @@ class TemplateResult(str):
 
 
 class TemplatesDict(dict):
-    """Holds and wrap TemplateResults for easy bug report."""
+    """Holds and wrap TemplateResults for easy bug report.
+
+    When `solver` is passed the dictionary is lazy. Values are unsolved
+    templates which are solved by `solver` on first access and the result
+    is stored in place of the template. Methods returning all values
+    (`values`, `items`, `missing_keys`, ...) solve all templates of the
+    dictionary.
+
+    Args:
+        in_data (dict): Template results or templates in lazy mode.
+        key (str): Key under which is dictionary stored in parent.
+        parent (TemplatesDict): Parent dictionary.
+        strict (bool): Raise `TemplateUnsolved` when unsolved template
+            is accessed. Inherited from parent when not set.
+        solver (callable): Callback which converts template string
+            to `TemplateResult`.
+    """
 
-    def __init__(self, in_data, key=None, parent=None, strict=None):
+    def __init__(
+        self, in_data, key=None, parent=None, strict=None, solver=None
+    ):
         super(TemplatesDict, self).__init__()
+        self._solver = solver
+        self._unsolved_keys = set()
         for _key, _value in in_data.items():
             if isinstance(_value, dict):
-                _value = self.__class__(_value, _key, self)
-            self[_key] = _value
+                # Empty groups are not available in solved templates
+                if solver is not None and not _value:
+                    continue
+                _value = self.__class__(_value, _key, self, solver=solver)
+                self[_key] = _value
+
+            else:
+                self[_key] = _value
+                if solver is not None and isinstance(_value, StringType):
+                    self._unsolved_keys.add(_key)
 
         self.key = key
         self.parent = parent
@@ -441,6 +477,45 @@ class TemplatesDict(dict):
         if self.parent is None and strict is None:
             self.strict = True
 
+    def _solve_value(self, key):
+        """Value of key which is solved if was not solved yet."""
+        value = super(TemplatesDict, self).__getitem__(key)
+        if key in self._unsolved_keys:
+            value = self._solver(value)
+            super(TemplatesDict, self).__setitem__(key, value)
+            self._unsolved_keys.discard(key)
+        return value
+
+    def _solve_all(self):
+        for key in tuple(self._unsolved_keys):
+            self._solve_value(key)
+
+    def __setitem__(self, key, value):
+        self._unsolved_keys.discard(key)
+        super(TemplatesDict, self).__setitem__(key, value)
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self._solve_value(key)
+
+    def values(self):
+        self._solve_all()
+        return super(TemplatesDict, self).values()
+
+    def items(self):
+        self._solve_all()
+        return super(TemplatesDict, self).items()
+
+    def pop(self, key, *args):
+        if key in self:
+            self._solve_value(key)
+        return super(TemplatesDict, self).pop(key, *args)
+
+    def copy(self):
+        self._solve_all()
+        return super(TemplatesDict, self).copy()
+
     def __getitem__(self, key):
         # Raise error about missing key in anatomy.yaml
         if key not in self.keys():
@@ -448,7 +523,7 @@ class TemplatesDict(dict):
             hier.append(key)
             raise TemplateMissingKey(hier)
 
-        value = super(TemplatesDict, self).__getitem__(key)
+        value = self._solve_value(key)
         if isinstance(value, self.__class__):
             return value
 
@@ -530,6 +605,347 @@ class TemplatesDict(dict):
         return self.__class__(result, key=self.key, parent=self.parent)
 
 
+class TemplateNotCompilable(Exception):
+    """Template can't be compiled and must be formatted the regex way."""
+
+
+class CompiledTemplateKey(object):
+    """Formatting key of a template prepared for repeated formatting.
+
+    Everything that `Templates._format` resolves with regexes on each call
+    (key name without padding, sub-dictionary keys, format specification)
+    is resolved once here.
+
+    Args:
+        field_name (str): Field name as parsed by `string.Formatter`
+            (e.g. "project[name]").
+        format_spec (str): Format specification of the key (e.g. "0>4").
+        conversion (str): Conversion character ("r" or "s") or None.
+    """
+
+    __slots__ = (
+        "raw_key", "key", "key_parts", "first", "accessors",
+        "format_spec", "conversion", "placeholder"
+    )
+
+    def __init__(self, field_name, format_spec, conversion):
+        if "{" in format_spec:
+            raise TemplateNotCompilable(
+                "Nested keys in format specification are not supported."
+            )
+
+        if conversion not in (None, "r", "s"):
+            raise TemplateNotCompilable(
+                "Unknown conversion \"{}\".".format(conversion)
+            )
+
+        raw_key = field_name
+        if conversion:
+            raw_key += "!" + conversion
+        if format_spec:
+            raw_key += ":" + format_spec
+
+        key = raw_key
+        key_padding = Templates.key_padding_pattern.findall(key)
+        if key_padding:
+            key = key_padding[0]
+
+        first, accessors = formatter_field_name_split(field_name)
+
+        self.raw_key = raw_key
+        self.key = key
+        self.key_parts = tuple(Templates.sub_dict_pattern.findall(key))
+        self.first = first
+        self.accessors = tuple(accessors)
+        self.format_spec = format_spec
+        self.conversion = conversion
+        self.placeholder = self._placeholder()
+
+    def _placeholder(self):
+        """Value used in filled template when the key can't be filled."""
+        if self.first == self.key and not self.accessors:
+            try:
+                return self.format_value("{" + self.key + "}")
+            except ValueError:
+                pass
+
+        elif len(self.key_parts) > 1 and self.raw_key == self.key:
+            return "{" + self.key + "}"
+        return "{" + self.raw_key + "}"
+
+    def rootless_value(self):
+        """Replacement of filled root value in rootless path."""
+        try:
+            return self.format_value("{" + self.key + "}")
+        except ValueError:
+            return "{" + self.raw_key + "}"
+
+    def format_value(self, value):
+        if self.conversion == "r":
+            value = repr(value)
+        elif self.conversion == "s":
+            value = str(value)
+        return format(value, self.format_spec)
+
+    def validate(self, data):
+        """Check if data contain value of valid type for the key.
+
+        Same logic as `Templates._validate_data_key` with precalculated keys.
+
+        Returns:
+            tuple: Missing key and invalid type. Both are None if key is valid.
+        """
+        key_parts = self.key_parts
+        if len(key_parts) <= 1:
+            if self.key not in data:
+                return self.key, None
+            value = data[self.key]
+
+        else:
+            value = data
+            used_keys = []
+            missing_key = False
+            invalid_type = False
+            for sub_key in key_parts:
+                if (
+                    value is None
+                    or (hasattr(value, "items") and sub_key not in value)
+                ):
+                    missing_key = True
+                    used_keys.append(sub_key)
+                    break
+
+                elif not hasattr(value, "items"):
+                    invalid_type = True
+                    break
+
+                used_keys.append(sub_key)
+                value = value.get(sub_key)
+
+            if missing_key or invalid_type:
+                if not used_keys:
+                    invalid_key = key_parts[0]
+                else:
+                    invalid_key = used_keys[0] + "".join(
+                        "[{0}]".format(sub_key) for sub_key in used_keys[1:]
+                    )
+
+                if missing_key:
+                    return invalid_key, None
+                return None, {invalid_key: type(value)}
+
+        if isinstance(value, (numbers.Number, StringType, Roots, RootItem)):
+            return None, None
+        return self.key, {self.key: type(value)}
+
+    def solve(self, data):
+        """Format value of the key from data.
+
+        Raises:
+            KeyError, TypeError: When value can't be received or formatted.
+        """
+        value = data[self.first]
+        for is_attr, key in self.accessors:
+            if is_attr:
+                value = getattr(value, key)
+            else:
+                value = value[key]
+        return self.format_value(value)
+
+
+class CompiledTemplateVariant(object):
+    """Template without optional markers split into literals and keys.
+
+    Args:
+        template (str): Template where optional parts were already resolved.
+    """
+
+    def __init__(self, template):
+        tokens = []
+        keys = []
+        try:
+            for literal, field_name, format_spec, conversion in (
+                string.Formatter().parse(template)
+            ):
+                key = None
+                if field_name is not None:
+                    key = CompiledTemplateKey(
+                        field_name, format_spec, conversion
+                    )
+                    keys.append(key)
+                tokens.append((literal, key))
+
+        except ValueError as exc:
+            raise TemplateNotCompilable(str(exc))
+
+        self.template = template
+        self.tokens = tuple(tokens)
+        self.keys = tuple(keys)
+        self.has_root = "{root" in template
+
+    def join(self, values, rootless=False):
+        """Join literals with values of keys.
+
+        Args:
+            values (list): Formatted value for each key in `keys`. None is
+                used for keys which could not be filled.
+            rootless (bool): Replace filled root values with root keys.
+        """
+        output = []
+        values_iter = iter(values)
+        for literal, key in self.tokens:
+            output.append(literal)
+            if key is None:
+                continue
+
+            value = next(values_iter)
+            if value is None:
+                value = key.placeholder
+            elif rootless and key.key_parts and key.key_parts[0] == "root":
+                value = key.rootless_value()
+            output.append(value)
+        return "".join(output)
+
+
+class CompiledTemplate(object):
+    """Template parsed once and prepared for fast repeated formatting.
+
+    Optional parts ("<...>") and formatting keys are found only on
+    initialization. Formatting then only validates and fills keys, without
+    regex matching or copying of passed data. Result is the same
+    `TemplateResult` as `Templates._format` would return.
+
+    Args:
+        template (str): Anatomy template with solved inner keys.
+
+    Raises:
+        TemplateNotCompilable: When template uses formatting features that
+            are not handled by compiled formatting.
+    """
+
+    def __init__(self, template):
+        parts = Templates.optional_pattern.split(template)
+        self.template = template
+        # Even indexes are static parts and odd are optional parts
+        self._static_parts = tuple(parts[0::2])
+        self._optional_parts = tuple(parts[1::2])
+        self._optional_keys = tuple(
+            CompiledTemplateVariant(optional_part[1:-1]).keys
+            for optional_part in self._optional_parts
+        )
+        self._variants = {}
+        # Compile template with all optional parts to find issues early
+        self.get_variant((True, ) * len(self._optional_parts))
+
+    def get_variant(self, valid_optionals):
+        """Template variant with only valid optional parts.
+
+        Args:
+            valid_optionals (tuple): Boolean for each optional part.
+        """
+        variant = self._variants.get(valid_optionals)
+        if variant is None:
+            parts = [self._static_parts[0]]
+            for idx, valid in enumerate(valid_optionals):
+                if valid:
+                    parts.append(self._optional_parts[idx][1:-1])
+                parts.append(self._static_parts[idx + 1])
+            variant = CompiledTemplateVariant("".join(parts))
+            self._variants[valid_optionals] = variant
+        return variant
+
+    @staticmethod
+    def _solve_key(key, data, solved_keys):
+        """Validate and format key with caching of result per data."""
+        result = solved_keys.get(key.raw_key)
+        if result is None:
+            missing_key, invalid_type = key.validate(data)
+            value = None
+            if missing_key is None and invalid_type is None:
+                try:
+                    value = key.solve(data)
+                except (TypeError, KeyError):
+                    missing_key = key.key
+            result = (missing_key, invalid_type, value)
+            solved_keys[key.raw_key] = result
+        return result
+
+    def format(self, data):
+        """Fill template with data.
+
+        Args:
+            data (dict): Containing keys to be filled into template.
+
+        Returns:
+            TemplateResult: Filled or partially filled template.
+        """
+        solved_keys = {}
+        missing_optional = []
+        invalid_optional = []
+        valid_optionals = []
+        for optional_keys in self._optional_keys:
+            valid = True
+            for key in optional_keys:
+                missing_key, invalid_type, _ = self._solve_key(
+                    key, data, solved_keys
+                )
+                if missing_key is not None:
+                    missing_optional.append(missing_key)
+                    valid = False
+
+                if invalid_type is not None:
+                    invalid_optional.append(invalid_type)
+                    valid = False
+            valid_optionals.append(valid)
+
+        variant = self.get_variant(tuple(valid_optionals))
+
+        used_values = {}
+        missing_required = []
+        invalid_required = []
+        values = []
+        for key in variant.keys:
+            missing_key, invalid_type, value = self._solve_key(
+                key, data, solved_keys
+            )
+            if invalid_type is not None:
+                invalid_required.append(invalid_type)
+                value = None
+
+            elif missing_key is not None:
+                missing_required.append(missing_key)
+                value = None
+
+            elif len(key.key_parts) <= 1:
+                used_values[key.key] = value
+
+            else:
+                current_used = used_values
+                for sub_key in key.key_parts[:-1]:
+                    current_used = current_used.setdefault(sub_key, {})
+                current_used[key.key_parts[-1]] = value
+            values.append(value)
+
+        solved = not missing_required and not invalid_required
+        missing_keys = missing_required + missing_optional
+        invalid_types = invalid_required + invalid_optional
+
+        filled_template = variant.join(values)
+        rootless_path = filled_template
+        if (
+            variant.has_root
+            and "root" in used_values
+            and "root" not in missing_keys
+            and not any("root" in item for item in invalid_types)
+        ):
+            rootless_path = variant.join(values, rootless=True)
+
+        return TemplateResult(
+            filled_template, self.template, solved, rootless_path,
+            used_values, missing_keys, invalid_types
+        )
+
+
 class Templates:
     key_pattern = re.compile(r"(\{.*?[^{0]*\})")
     key_padding_pattern = re.compile(r"([^:]+)\S+[><]\S+")
@@ -539,6 +955,11 @@ class Templates:
     inner_key_pattern = re.compile(r"(\{@.*?[^{}0]*\})")
     inner_key_name_pattern = re.compile(r"\{@(.*?[^{}0]*)\}")
 
+    # Format templates with compiled templates (regex based when disabled)
+    use_compiled_templates = True
+    # Compiled templates by template string shared across all projects
+    _compiled_templates = {}
+
     def __init__(self, anatomy):
         self.anatomy = anatomy
         self.loaded_project = None
@@ -965,6 +1386,32 @@ class Templates:
         final_data["root"] = roots_dict["root"]
         return template.format(**final_data)
 
+    @classmethod
+    def compile_template(cls, template):
+        """Compiled template for passed template string.
+
+        Templates are compiled only once and cached.
+
+        Args:
+            template (str): Anatomy template with solved inner keys.
+
+        Returns:
+            CompiledTemplate: Compiled template or None if template can't
+                be compiled.
+        """
+        if template in cls._compiled_templates:
+            return cls._compiled_templates[template]
+
+        try:
+            compiled = CompiledTemplate(template)
+        except TemplateNotCompilable as exc:
+            log.debug(
+                "Template \"{}\" can't be compiled. {}".format(template, exc)
+            )
+            compiled = None
+        cls._compiled_templates[template] = compiled
+        return compiled
+
     def _format(self, orig_template, data):
         """ Figure out with whole formatting.
 
@@ -979,6 +1426,11 @@ class Templates:
             TemplateResult: Filled or partially filled template containing all
                 data needed or missing for filling template.
         """
+        if self.use_compiled_templates:
+            compiled = self.compile_template(orig_template)
+            if compiled is not None:
+                return compiled.format(data)
+
         template, missing_optional, invalid_optional = (
             self._filter_optional(orig_template, data)
         )
@@ -1086,30 +1538,37 @@ class Templates:
 
         return output
 
-    def format_all(self, in_data, only_keys=True):
+    def format_all(self, in_data, only_keys=True, lazy=False):
         """ Solves templates based on entered data.
 
         Args:
             data (dict): Containing keys to be filled into template.
             only_keys (bool, optional): Decides if environ will be used to
                 fill templates or only keys in data.
+            lazy (bool, optional): Templates are solved on first access.
 
         Returns:
             TemplatesDict: Output `TemplateResult` have `strict` attribute
                 set to False so accessing unfilled keys in templates won't
                 raise any exceptions.
         """
-        output = self.format(in_data, only_keys)
+        output = self.format(in_data, only_keys, lazy)
         output.strict = False
         return output
 
-    def format(self, in_data, only_keys=True):
+    def format(self, in_data, only_keys=True, lazy=False):
         """ Solves templates based on entered data.
 
+        With `lazy` set to True are templates solved on first access
+        of the key in output. That is preferred when only few templates
+        are used from the output. Nested values in data should not be
+        changed until the output is used.
+
         Args:
             data (dict): Containing keys to be filled into template.
             only_keys (bool, optional): Decides if environ will be used to
                 fill templates or only keys in data.
+            lazy (bool, optional): Templates are solved on first access.
 
         Returns:
             TemplatesDict: Output `TemplateResult` have `strict` attribute
@@ -1117,7 +1576,8 @@ class Templates:
                 raise exceptions with explaned error.
         """
         # Create a copy of inserted data
-        data = copy.deepcopy(in_data)
+        # - only top level keys are changed so deep copy is not needed
+        data = dict(in_data)
 
         # Add environment variable to data
         if only_keys is False:
@@ -1128,6 +1588,13 @@ class Templates:
         roots = self.roots
         if roots:
             data["root"] = roots
+
+        if lazy:
+            return TemplatesDict(
+                self.templates,
+                solver=lambda template: self._format(template, data)
+            )
+
         solved = self.solve_dict(self.templates, data)
 
         return TemplatesDict(solved)
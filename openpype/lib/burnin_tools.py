@@ -0,0 +1,365 @@
+"""Burnin definitions and data shared by plugins creating burnins.
+
+Burnins are burned by ExtractBurnin into review outputs or drawn during
+encoding of review by ExtractReview (see its 'burnins_in_review'). Both use
+these functions so profile, options, values and data for burnin strings are
+the same.
+"""
+import re
+import copy
+import json
+import logging
+
+from .applications import compile_list_of_regexes
+from .profiles_filtering import _profile_exclusion
+
+log = logging.getLogger(__name__)
+
+# Positions of burnin texts in burnin definitions
+BURNIN_POSITIONS = [
+    "top_left", "top_centered", "top_right",
+    "bottom_right", "bottom_centered", "bottom_left"
+]
+# Default options for burnins for cases that are not set in presets.
+DEFAULT_BURNIN_OPTIONS = {
+    "opacity": 1,
+    "x_offset": 5,
+    "y_offset": 5,
+    "bg_padding": 5,
+    "bg_opacity": 0.5,
+    "font_size": 42
+}
+
+
+def _validate_value_by_regexes(value, in_list):
+    """Validate if any regex from list match entered value.
+
+    Returns:
+        int: Returns `0` when list is not set or is empty. Returns `1` when
+            any regex match value and returns `-1` when none of regexes
+            match value entered.
+    """
+    if not in_list:
+        return 0
+
+    for regex in compile_list_of_regexes(in_list):
+        if re.match(regex, value):
+            return 1
+    return -1
+
+
+def find_burnin_profile(profiles, host_name, task_name, family, logger=None):
+    """Filter burnin profiles by Host name, Task name and main Family.
+
+    Filtering keys are "hosts" (list), "tasks" (list), "families" (list).
+    If key is not find or is empty than it's expected to match.
+
+    Args:
+        profiles (list): Profiles definition from presets.
+        host_name (str): Current running host name.
+        task_name (str): Current context task name.
+        family (str): Main family of current Instance.
+        logger (logging.Logger): Logger used for logging.
+
+    Returns:
+        dict/None: Return most matching profile or None if none of profiles
+            match at least one criteria.
+    """
+    if logger is None:
+        logger = log
+
+    matching_profiles = []
+    highest_points = -1
+    for profile in profiles or tuple():
+        profile_points = 0
+        profile_value = []
+        for key, value in (
+            ("hosts", host_name),
+            ("tasks", task_name),
+            ("families", family)
+        ):
+            match = _validate_value_by_regexes(value, profile.get(key))
+            if match == -1:
+                break
+            profile_points += match
+            profile_value.append(bool(match))
+        else:
+            if profile_points > highest_points:
+                matching_profiles = []
+                highest_points = profile_points
+
+            if profile_points == highest_points:
+                matching_profiles.append((profile, profile_value))
+
+    return _profile_exclusion(matching_profiles, logger)
+
+
+def _families_filter_validation(families, output_families_filter):
+    """Determine if entered families intersect with families filters.
+
+    All family values are lowered to avoid unexpected results.
+    """
+    if not output_families_filter:
+        return True
+
+    for family_filter in output_families_filter:
+        if not family_filter:
+            continue
+
+        if not isinstance(family_filter, (list, tuple)):
+            if family_filter.lower() not in families:
+                continue
+            return True
+
+        valid = True
+        for family in family_filter:
+            if family.lower() not in families:
+                valid = False
+                break
+
+        if valid:
+            return True
+    return False
+
+
+def filter_burnins_by_families(profile, families):
+    """Filter burnin definitions of profile not supported for families.
+
+    Burnin definitions without families filter are marked as valid.
+
+    Args:
+        profile (dict): Profile from presets matching current context.
+        families (list): All families of current instance.
+
+    Returns:
+        dict: Burnin definitions by filename suffix matching families.
+    """
+    families = [family.lower() for family in families]
+    filtered_burnin_defs = {}
+    for filename_suffix, burnin_def in (
+        (profile.get("burnins") or {}).items()
+    ):
+        burnin_filter = burnin_def.get("filter") or {}
+        if _families_filter_validation(
+            families, burnin_filter.get("families")
+        ):
+            filtered_burnin_defs[filename_suffix] = burnin_def
+    return filtered_burnin_defs
+
+
+def filter_burnins_by_tags(burnin_defs, tags):
+    """Filter burnin definitions by entered representation tags.
+
+    Burnin definitions without tags filter are marked as valid.
+
+    Args:
+        burnin_defs (dict): Burnin definitions by filename suffix.
+        tags (list): Tags of processed representation.
+
+    Returns:
+        dict: Burnin definitions matching entered tags.
+    """
+    filtered_burnins = {}
+    repre_tags_low = [tag.lower() for tag in tags]
+    for filename_suffix, burnin_def in burnin_defs.items():
+        tag_filters = (burnin_def.get("filter") or {}).get("tags")
+        if tag_filters:
+            tag_filters_low = [tag.lower() for tag in tag_filters]
+            if not any(tag in tag_filters_low for tag in repre_tags_low):
+                continue
+
+        filtered_burnins[filename_suffix] = burnin_def
+    return filtered_burnins
+
+
+def prepare_burnin_options(options, burnin_def):
+    """Options of burnin definition.
+
+    Default options are overridden by global options and then by options
+    of burnin definition. Options set to None are ignored.
+    """
+    output = copy.deepcopy(DEFAULT_BURNIN_OPTIONS)
+    for _options in (options, burnin_def.get("options")):
+        for key, value in (_options or {}).items():
+            if value is not None:
+                output[key] = value
+    return output
+
+
+def prepare_burnin_values(fields, burnin_def):
+    """Burnin texts by position of burnin definition.
+
+    Global fields are overridden by burnin definition, position set to
+    None in burnin definition is removed.
+    """
+    values = {}
+    for key, value in (fields or {}).items():
+        key_low = key.lower()
+        if key_low in BURNIN_POSITIONS and value is not None:
+            values[key_low] = value
+
+    for key, value in burnin_def.items():
+        key_low = key.lower()
+        if key_low not in BURNIN_POSITIONS:
+            continue
+
+        if value is not None:
+            values[key_low] = value
+        else:
+            values.pop(key_low, None)
+    return values
+
+
+def prepare_basic_burnin_data(instance, logger=None):
+    """Pick data from instance for processing and for burnin strings.
+
+    Args:
+        instance (Instance): Currently processed instance.
+        logger (logging.Logger): Logger used for logging.
+
+    Returns:
+        tuple: `(burnin_data, temp_data)` - `burnin_data` contain data for
+            filling burnin strings. `temp_data` are for repre pre-process
+            preparation.
+    """
+    if logger is None:
+        logger = log
+
+    logger.debug("Prepring basic data for burnins")
+    context = instance.context
+
+    version = instance.data.get("version")
+    if version is None:
+        version = context.data.get("version")
+
+    frame_start = instance.data.get("frameStart")
+    if frame_start is None:
+        logger.warning(
+            "Key \"frameStart\" is not set. Setting to \"0\"."
+        )
+        frame_start = 0
+    frame_start = int(frame_start)
+
+    frame_end = instance.data.get("frameEnd")
+    if frame_end is None:
+        logger.warning(
+            "Key \"frameEnd\" is not set. Setting to \"1\"."
+        )
+        frame_end = 1
+    frame_end = int(frame_end)
+
+    handles = instance.data.get("handles")
+    if handles is None:
+        handles = context.data.get("handles")
+        if handles is None:
+            handles = 0
+
+    handle_start = instance.data.get("handleStart")
+    if handle_start is None:
+        handle_start = context.data.get("handleStart")
+        if handle_start is None:
+            handle_start = handles
+
+    handle_end = instance.data.get("handleEnd")
+    if handle_end is None:
+        handle_end = context.data.get("handleEnd")
+        if handle_end is None:
+            handle_end = handles
+
+    frame_start_handle = frame_start - handle_start
+    frame_end_handle = frame_end + handle_end
+
+    burnin_data = copy.deepcopy(instance.data["anatomyData"])
+
+    if "slate.farm" in instance.data["families"]:
+        frame_start_handle += 1
+
+    burnin_data.update({
+        "version": int(version),
+        "comment": context.data.get("comment") or ""
+    })
+
+    intent_label = context.data.get("intent") or ""
+    if intent_label and isinstance(intent_label, dict):
+        value = intent_label.get("value")
+        if value:
+            intent_label = intent_label["label"]
+        else:
+            intent_label = ""
+
+    burnin_data["intent"] = intent_label
+
+    temp_data = {
+        "frame_start": frame_start,
+        "frame_end": frame_end,
+        "frame_start_handle": frame_start_handle,
+        "frame_end_handle": frame_end_handle
+    }
+
+    logger.debug(
+        "Basic burnin_data: {}".format(json.dumps(burnin_data, indent=4))
+    )
+
+    return burnin_data, temp_data
+
+
+def prepare_repre_burnin_data(instance, repre, burnin_data, temp_data):
+    """Add representation data to copy of basic burnin data.
+
+    Adds representation name, frame range with or without handles, frames
+    of slate, filled anatomy and source camera name.
+
+    Args:
+        instance (Instance): Currently processed Instance.
+        repre (dict): Currently processed representation.
+        burnin_data (dict): Copy of basic burnin data based on instance
+            data.
+        temp_data (dict): Copy of basic temp data, "duration" is added.
+    """
+    # Add representation name to burnin data
+    burnin_data["representation"] = repre["name"]
+
+    # no handles switch from profile tags
+    if "no-handles" in repre["tags"]:
+        burnin_frame_start = temp_data["frame_start"]
+        burnin_frame_end = temp_data["frame_end"]
+
+    else:
+        burnin_frame_start = temp_data["frame_start_handle"]
+        burnin_frame_end = temp_data["frame_end_handle"]
+
+    burnin_duration = burnin_frame_end - burnin_frame_start + 1
+
+    burnin_data.update({
+        "frame_start": burnin_frame_start,
+        "frame_end": burnin_frame_end,
+        "duration": burnin_duration,
+    })
+    temp_data["duration"] = burnin_duration
+
+    # Add values for slate frames
+    burnin_slate_frame_start = burnin_frame_start
+
+    # Move frame start by 1 frame when slate is used.
+    if (
+        "slate" in instance.data["families"]
+        and "slate-frame" in repre["tags"]
+    ):
+        burnin_slate_frame_start -= 1
+
+    burnin_data.update({
+        "slate_frame_start": burnin_slate_frame_start,
+        "slate_frame_end": burnin_frame_end,
+        "slate_duration": (
+            burnin_frame_end - burnin_slate_frame_start + 1
+        )
+    })
+
+    # Add anatomy keys to burnin_data.
+    anatomy = instance.context.data["anatomy"]
+    burnin_data["anatomy"] = anatomy.format_all(burnin_data).get_solved()
+
+    # Add source camera name to burnin data
+    camera_name = repre.get("camera_name")
+    if camera_name:
+        burnin_data["camera_name"] = camera_name
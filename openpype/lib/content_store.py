@@ -0,0 +1,236 @@
+"""Content addressed store of published files.
+
+Each project root may contain a store directory with blobs named by hash of
+their content. Published files are hardlinks to the blobs so files with the
+same content published multiple times take disk space only once.
+
+Blob is referenced as long as any published file is hardlinked to it. Blobs
+which have only one link (the blob itself) are not used and can be removed
+with `ContentStore.collect_garbage`.
+"""
+import os
+import errno
+import shutil
+import logging
+import uuid
+
+from .file_hash_cache import get_file_hash
+
+log = logging.getLogger(__name__)
+
+# Name of store directory created in root
+STORE_DIRNAME = ".openpype_store"
+HASH_ALGORITHM = "sha256"
+
+
+def create_dirs(dirpath):
+    """Create directories if they don't exist."""
+    try:
+        os.makedirs(dirpath)
+    except OSError as exc:
+        if exc.errno != errno.EEXIST:
+            raise
+
+
+def find_path_root(anatomy, path):
+    """Find root of anatomy in which is path located.
+
+    Args:
+        anatomy (Anatomy): Project anatomy.
+        path (str): Absolute path.
+
+    Returns:
+        str: Root path of current platform or None if path is not in any
+            of roots.
+    """
+    path = os.path.normcase(os.path.normpath(path))
+    matching_root = None
+    for root in anatomy.root_environments().values():
+        if not root:
+            continue
+        _root = os.path.normcase(os.path.normpath(root))
+        if path != _root and not path.startswith(_root + os.path.sep):
+            continue
+
+        # Use the most specific root
+        if matching_root is None or len(root) > len(matching_root):
+            matching_root = root
+    return matching_root
+
+
+class ContentStore(object):
+    """Content addressed store of files in a root.
+
+    Blobs are stored in `<root>/.openpype_store/<algorithm>/<xx>/<hash>`
+    where `<xx>` are first two characters of hash.
+
+    Args:
+        root (str): Root directory where store directory is created.
+        algorithm (str): Hash algorithm used for blob names.
+    """
+
+    def __init__(self, root, algorithm=HASH_ALGORITHM):
+        self.root = root
+        self.algorithm = algorithm
+        self.store_dir = os.path.join(root, STORE_DIRNAME, algorithm)
+
+    def file_hash(self, filepath):
+        """Hash of file content used for blob names.
+
+        Hashes of unchanged files are not calculated again thanks to
+        persistent file hash cache.
+        """
+        return get_file_hash(filepath, self.algorithm)
+
+    def get_blob_path(self, content_hash):
+        return os.path.join(self.store_dir, content_hash[:2], content_hash)
+
+    def store_file(self, src_path):
+        """Store file content to store if is not stored yet.
+
+        Args:
+            src_path (str): Path to file which should be stored.
+
+        Returns:
+            tuple: Blob path and bool if content was already stored.
+        """
+        content_hash = self.file_hash(src_path)
+        blob_path = self.get_blob_path(content_hash)
+        if os.path.exists(blob_path):
+            return blob_path, True
+
+        blob_dir = os.path.dirname(blob_path)
+        create_dirs(blob_dir)
+        # Copy to temp file first so blob is never partially written
+        tmp_path = os.path.join(
+            blob_dir, ".{}.{}".format(content_hash, uuid.uuid4().hex)
+        )
+        try:
+            shutil.copyfile(src_path, tmp_path)
+            if os.path.exists(blob_path):
+                # Stored by other process in meantime
+                os.remove(tmp_path)
+                return blob_path, True
+            os.rename(tmp_path, blob_path)
+
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return blob_path, False
+
+    def link_file(self, src_path, dst_path):
+        """Create file in destination as hardlink to blob with content.
+
+        Args:
+            src_path (str): Source file which is stored if is not stored yet.
+            dst_path (str): Destination path of hardlink.
+
+        Returns:
+            bool: Content was already stored and file was not copied.
+        """
+        # avalon module is not imported at the top
+        from avalon.vendor import filelink
+
+        blob_path, existed = self.store_file(src_path)
+        create_dirs(os.path.dirname(dst_path))
+        if os.path.exists(dst_path):
+            os.remove(dst_path)
+        filelink.create(blob_path, dst_path, filelink.HARDLINK)
+        return existed
+
+    def iter_blobs(self):
+        """Iterate over all blobs in store.
+
+        Yields:
+            tuple: Blob path and its `os.stat` result.
+        """
+        if not os.path.exists(self.store_dir):
+            return
+
+        for dirpath, _dirnames, filenames in os.walk(self.store_dir):
+            for filename in filenames:
+                # Skip temp files
+                if filename.startswith("."):
+                    continue
+                blob_path = os.path.join(dirpath, filename)
+                yield blob_path, os.stat(blob_path)
+
+    def get_stats(self):
+        """Statistics of store.
+
+        Returns:
+            dict: Count of blobs, size of stored content, count of
+                unreferenced blobs and size which would be used by published
+                files without the store.
+        """
+        output = {
+            "blobs": 0,
+            "stored_size": 0,
+            "unreferenced": 0,
+            "saved_size": 0
+        }
+        for _blob_path, stat in self.iter_blobs():
+            output["blobs"] += 1
+            output["stored_size"] += stat.st_size
+            links = stat.st_nlink - 1
+            if links < 1:
+                output["unreferenced"] += 1
+            elif links > 1:
+                output["saved_size"] += (links - 1) * stat.st_size
+        return output
+
+    def collect_garbage(self, dry_run=False):
+        """Remove blobs which are not referenced by any published file.
+
+        Args:
+            dry_run (bool): Only report unreferenced blobs.
+
+        Returns:
+            dict: Count and size of removed blobs and size saved by blobs
+                which are kept.
+        """
+        output = {
+            "removed": 0,
+            "removed_size": 0,
+            "saved_size": 0
+        }
+        for blob_path, stat in self.iter_blobs():
+            links = stat.st_nlink - 1
+            if links > 1:
+                output["saved_size"] += (links - 1) * stat.st_size
+
+            if links > 0:
+                continue
+
+            log.debug("Removing unreferenced blob {}".format(blob_path))
+            if not dry_run:
+                os.remove(blob_path)
+            output["removed"] += 1
+            output["removed_size"] += stat.st_size
+        return output
+
+
+def get_content_store(anatomy, path):
+    """Content store of root where path is located.
+
+    Returns:
+        ContentStore: Store in root or None if path is not in any root.
+    """
+    root = find_path_root(anatomy, path)
+    if root is None:
+        return None
+    return ContentStore(root)
+
+
+def collect_content_store_garbage(anatomy, dry_run=False):
+    """Remove unreferenced blobs from content stores of anatomy roots.
+
+    Returns:
+        dict: Output of `ContentStore.collect_garbage` by root path.
+    """
+    output = {}
+    for root in set(anatomy.root_environments().values()):
+        if root and os.path.exists(root):
+            output[root] = ContentStore(root).collect_garbage(dry_run)
+    return output
@@ -1,6 +1,11 @@
 import logging
 import os
+import time
 import subprocess
+import threading
+import multiprocessing
+
+from six.moves import queue
 
 from .log import PypeLogger as Logger
 
@@ -163,3 +168,248 @@ def get_pype_execute_args(*args):
         pype_args.extend(args)
 
     return pype_args
+
+
+def get_subprocess_workers(workers=None, cpus_per_job=None):
+    """Count of subprocesses which should run in parallel.
+
+    Args:
+        workers (int): Requested count of parallel subprocesses. Count is
+            based on available cpus when is not set or is lower than 1.
+        cpus_per_job (int): Cpus expected to be used by one subprocess (e.g.
+            multithreaded encoders). Default is `SubprocessPool.cpus_per_job`.
+
+    Returns:
+        int: Count of subprocesses running in parallel, at least 1.
+    """
+    if workers and workers > 0:
+        return int(workers)
+
+    if not cpus_per_job or cpus_per_job < 1:
+        cpus_per_job = SubprocessPool.cpus_per_job
+
+    try:
+        cpu_count = multiprocessing.cpu_count()
+    except NotImplementedError:
+        cpu_count = 1
+    return max(1, cpu_count // int(cpus_per_job))
+
+
+class SubprocessJob(object):
+    """Subprocess which should be executed by `SubprocessPool`.
+
+    Arguments are passed to subprocess Popen same way as to `run_subprocess`.
+    Result of execution is stored to `output` or `error` after pool finished.
+
+    Args:
+        *args: Arguments passed to subprocess Popen.
+        **kwargs: Keyword arguments passed to subprocess Popen. Value under
+            "label" is used as prefix of job's log messages.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.label = kwargs.pop("label", None)
+        self.args = args
+        self.kwargs = kwargs
+        self.output = None
+        self.error = None
+        self.duration = None
+        self.finished = False
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+
+class _JobLoggerAdapter(logging.LoggerAdapter):
+    """Prefix messages of job so output of parallel jobs can be recognized.
+    """
+
+    def process(self, msg, kwargs):
+        return "[{}] {}".format(self.extra["label"], msg), kwargs
+
+
+def _read_output_lines(stream, lines, log_func):
+    """Read lines of process output until stream is closed.
+
+    Args:
+        stream (file): Stdout or stderr of process.
+        lines (list): Read lines are appended to the list.
+        log_func (callable): Function logging each line.
+    """
+    while True:
+        line = stream.readline()
+        if not line:
+            break
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        lines.append(line)
+        log_func(line.rstrip("\r\n"))
+    stream.close()
+
+
+class SubprocessPool(object):
+    """Run subprocesses in parallel with limited count of running processes.
+
+    Each job runs as separated process started by `run_subprocess` and is
+    waited for in one of worker threads, so host's python process is not
+    duplicated. Output of each job is logged line by line while job is
+    running with job's label as prefix, so outputs of parallel jobs can be
+    recognized.
+
+    Args:
+        workers (int): Count of parallel subprocesses. Based on cpu count
+            when not set (see `get_subprocess_workers`).
+        cpus_per_job (int): Cpus expected to be used by one subprocess.
+        logger (logging.Logger): Logger used for jobs output.
+    """
+    # ffmpeg encoders use multiple threads
+    cpus_per_job = 4
+
+    def __init__(self, workers=None, cpus_per_job=None, logger=None):
+        self.log = logger or log
+        self.workers = get_subprocess_workers(
+            workers, cpus_per_job or self.cpus_per_job
+        )
+
+    def run(self, jobs, raise_error=True):
+        """Execute jobs and wait until all of them finish.
+
+        Jobs are started in order in which were passed. When a job fails,
+        jobs which did not start yet are skipped, running jobs are finished.
+
+        Args:
+            jobs (list): `SubprocessJob` objects.
+            raise_error (bool): Raise error of first failed job.
+
+        Returns:
+            list: Passed jobs in same order with filled results.
+
+        Raises:
+            RuntimeError: Error of first failed job in order of jobs.
+        """
+        jobs = list(jobs)
+        jobs_queue = queue.Queue()
+        for job in jobs:
+            jobs_queue.put(job)
+
+        stop_event = threading.Event()
+
+        def _worker():
+            while not stop_event.is_set():
+                try:
+                    job = jobs_queue.get_nowait()
+                except queue.Empty:
+                    return
+
+                self._run_job(job)
+                if job.failed and raise_error:
+                    stop_event.set()
+
+        workers_count = min(self.workers, len(jobs))
+        if workers_count > 1:
+            self.log.debug("Running {} jobs in {} parallel processes".format(
+                len(jobs), workers_count
+            ))
+            threads = []
+            for _ in range(workers_count):
+                thread = threading.Thread(target=_worker)
+                thread.daemon = True
+                thread.start()
+                threads.append(thread)
+
+            for thread in threads:
+                thread.join()
+
+        elif workers_count == 1:
+            _worker()
+
+        if raise_error:
+            for job in jobs:
+                if job.failed:
+                    raise RuntimeError(job.error)
+        return jobs
+
+    def _run_job(self, job):
+        label = job.label or str(job.args[0] if job.args else "")
+        job_log = _JobLoggerAdapter(self.log, {"label": label})
+
+        start = time.time()
+        try:
+            job.output = self._execute_job(job, job_log)
+
+        except Exception as exc:
+            job.error = str(exc)
+
+        job.duration = time.time() - start
+        job.finished = True
+        if job.failed:
+            job_log.debug("Failed after {:.2f}s".format(job.duration))
+        else:
+            job_log.debug("Finished in {:.2f}s".format(job.duration))
+
+    def _execute_job(self, job, job_log):
+        """Run job's process and log its output lines as they come.
+
+        Stdout lines are logged as debug and stderr lines as warnings same
+        as `run_subprocess` does, stderr is read in separated thread so
+        process is not blocked by full pipe.
+
+        Returns:
+            str: Full output of subprocess concatenated stdout and stderr.
+
+        Raises:
+            RuntimeError: Exception is raised if process finished with
+                nonzero return code.
+        """
+        kwargs = dict(job.kwargs)
+        env = kwargs.get("env") or os.environ
+        kwargs["env"] = {str(k): str(v) for k, v in env.items()}
+        kwargs["stdout"] = kwargs.get("stdout", subprocess.PIPE)
+        kwargs["stderr"] = kwargs.get("stderr", subprocess.PIPE)
+        kwargs["stdin"] = kwargs.get("stdin", subprocess.PIPE)
+
+        proc = subprocess.Popen(*job.args, **kwargs)
+        if proc.stdin:
+            proc.stdin.close()
+
+        stdout_lines = []
+        stderr_lines = []
+        stderr_thread = None
+        if proc.stderr:
+            stderr_thread = threading.Thread(
+                target=_read_output_lines,
+                args=(proc.stderr, stderr_lines, job_log.warning)
+            )
+            stderr_thread.daemon = True
+            stderr_thread.start()
+
+        if proc.stdout:
+            _read_output_lines(proc.stdout, stdout_lines, job_log.debug)
+
+        if stderr_thread is not None:
+            stderr_thread.join()
+        proc.wait()
+
+        _stdout = "".join(stdout_lines)
+        _stderr = "".join(stderr_lines)
+        full_output = _stdout
+        if _stderr:
+            # Add additional line break if output already containt stdout
+            if full_output:
+                full_output += "\n"
+            full_output += _stderr
+
+        if proc.returncode != 0:
+            exc_msg = "Executing arguments was not successful: \"{}\"".format(
+                job.args
+            )
+            if _stdout:
+                exc_msg += "\n\nOutput:\n{}".format(_stdout)
+
+            if _stderr:
+                exc_msg += "Error:\n{}".format(_stderr)
+
+            raise RuntimeError(exc_msg)
+
+        return full_output
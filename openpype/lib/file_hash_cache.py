@@ -0,0 +1,232 @@
+"""Persistent cache of file content hashes.
+
+Hash of file content is stored in SQLite database in OpenPype's user data
+directory. Cached hash is identified by device, inode, modification time and
+size of the file so unchanged files are not read again. Renamed or moved
+files on the same device keep their cached hash.
+"""
+import os
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+
+import appdirs
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HASH_ALGORITHM = "sha256"
+
+
+def file_content_hash(filepath, algorithm=None, chunk_size=None):
+    """Hash of file content.
+
+    Args:
+        filepath (str): Path to file.
+        algorithm (str): Name of hashlib algorithm.
+        chunk_size (int): Size of chunks read from file.
+
+    Returns:
+        str: Hex digest of file content.
+    """
+    chunk_size = chunk_size or 4 * 1024 * 1024
+    hash_obj = hashlib.new(algorithm or DEFAULT_HASH_ALGORITHM)
+    with open(filepath, "rb") as stream:
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            hash_obj.update(chunk)
+    return hash_obj.hexdigest()
+
+
+def _stat_key(stat):
+    mtime_ns = getattr(stat, "st_mtime_ns", None)
+    if mtime_ns is None:
+        mtime_ns = int(stat.st_mtime * 1000000000)
+    return stat.st_dev, stat.st_ino, mtime_ns, stat.st_size
+
+
+class FileHashCache(object):
+    """Thread safe persistent cache of file content hashes.
+
+    Each thread uses its own database connection.
+
+    Args:
+        db_path (str): Path to database file. Database in OpenPype user data
+            directory is used by default.
+    """
+    db_filename = "file_hashes.db"
+    # Access time of cached hash is updated at most once per this interval
+    touch_interval = 24 * 60 * 60
+
+    def __init__(self, db_path=None):
+        if db_path is None:
+            db_path = os.path.join(
+                appdirs.user_data_dir("openpype", "pypeclub"),
+                self.db_filename
+            )
+        self.db_path = db_path
+        self._thread_data = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _get_connection(self):
+        connection = getattr(self._thread_data, "connection", None)
+        if connection is not None:
+            return connection
+
+        with self._init_lock:
+            if not self._initialized:
+                db_dir = os.path.dirname(self.db_path)
+                if db_dir and not os.path.exists(db_dir):
+                    os.makedirs(db_dir)
+
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            if not self._initialized:
+                with connection:
+                    connection.execute(
+                        "CREATE TABLE IF NOT EXISTS file_hashes ("
+                        " device INTEGER NOT NULL,"
+                        " inode INTEGER NOT NULL,"
+                        " algorithm TEXT NOT NULL,"
+                        " mtime_ns INTEGER NOT NULL,"
+                        " size INTEGER NOT NULL,"
+                        " hash TEXT NOT NULL,"
+                        " path TEXT NOT NULL,"
+                        " accessed REAL NOT NULL,"
+                        " PRIMARY KEY (device, inode, algorithm)"
+                        ")"
+                    )
+                self._initialized = True
+
+        self._thread_data.connection = connection
+        return connection
+
+    def get_file_hash(self, filepath, algorithm=None):
+        """Content hash of file.
+
+        Hash is calculated only if file changed since last calculation.
+
+        Args:
+            filepath (str): Path to file.
+            algorithm (str): Name of hashlib algorithm.
+
+        Returns:
+            str: Hex digest of file content.
+        """
+        algorithm = algorithm or DEFAULT_HASH_ALGORITHM
+        stat = os.stat(filepath)
+        device, inode, mtime_ns, size = _stat_key(stat)
+        # Inode is not available (e.g. Python 2 on Windows)
+        if not inode:
+            return file_content_hash(filepath, algorithm)
+
+        connection = self._get_connection()
+        row = connection.execute(
+            "SELECT hash, accessed FROM file_hashes"
+            " WHERE device=? AND inode=? AND algorithm=?"
+            " AND mtime_ns=? AND size=?",
+            (device, inode, algorithm, mtime_ns, size)
+        ).fetchone()
+        now = time.time()
+        if row is not None:
+            content_hash, accessed = row
+            if now - accessed > self.touch_interval:
+                with connection:
+                    connection.execute(
+                        "UPDATE file_hashes SET accessed=?, path=?"
+                        " WHERE device=? AND inode=? AND algorithm=?",
+                        (now, filepath, device, inode, algorithm)
+                    )
+            return content_hash
+
+        content_hash = file_content_hash(filepath, algorithm)
+        # File changed during hash calculation
+        if _stat_key(os.stat(filepath)) != (device, inode, mtime_ns, size):
+            return content_hash
+
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO file_hashes"
+                " (device, inode, algorithm, mtime_ns, size, hash, path,"
+                " accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    device, inode, algorithm, mtime_ns, size,
+                    content_hash, filepath, now
+                )
+            )
+        return content_hash
+
+    def prune(self, max_age_days=None):
+        """Remove invalid cached hashes.
+
+        Hash is invalid when last known path of the file does not exist or
+        the file changed.
+
+        Args:
+            max_age_days (float): Remove also hashes which were not used
+                for this count of days.
+
+        Returns:
+            int: Count of removed hashes.
+        """
+        connection = self._get_connection()
+        to_remove = []
+        min_accessed = None
+        if max_age_days is not None:
+            min_accessed = time.time() - (max_age_days * 24 * 60 * 60)
+
+        rows = connection.execute(
+            "SELECT device, inode, algorithm, mtime_ns, size, path, accessed"
+            " FROM file_hashes"
+        ).fetchall()
+        for row in rows:
+            device, inode, algorithm, mtime_ns, size, path, accessed = row
+            key = (device, inode, algorithm)
+            if min_accessed is not None and accessed < min_accessed:
+                to_remove.append(key)
+                continue
+
+            try:
+                stat = os.stat(path)
+            except OSError:
+                to_remove.append(key)
+                continue
+
+            if _stat_key(stat) != (device, inode, mtime_ns, size):
+                to_remove.append(key)
+
+        if to_remove:
+            with connection:
+                connection.executemany(
+                    "DELETE FROM file_hashes"
+                    " WHERE device=? AND inode=? AND algorithm=?",
+                    to_remove
+                )
+            connection.execute("VACUUM")
+        log.debug("Removed {} cached file hashes".format(len(to_remove)))
+        return len(to_remove)
+
+    def clear(self):
+        """Remove all cached hashes."""
+        connection = self._get_connection()
+        with connection:
+            connection.execute("DELETE FROM file_hashes")
+
+
+_FILE_HASH_CACHE = None
+_FILE_HASH_CACHE_LOCK = threading.Lock()
+
+
+def get_file_hash_cache():
+    """Shared file hash cache in OpenPype user data directory."""
+    global _FILE_HASH_CACHE
+    if _FILE_HASH_CACHE is None:
+        with _FILE_HASH_CACHE_LOCK:
+            if _FILE_HASH_CACHE is None:
+                _FILE_HASH_CACHE = FileHashCache()
+    return _FILE_HASH_CACHE
+
+
+def get_file_hash(filepath, algorithm=None):
+    """Content hash of file using shared file hash cache."""
+    return get_file_hash_cache().get_file_hash(filepath, algorithm)
@@ -0,0 +1,417 @@
+"""Transfer of files using bounded pool of threads.
+
+Used by integrators to copy published files into publish destination.
+"""
+import os
+import sys
+import time
+import errno
+import shutil
+import hashlib
+import logging
+import threading
+
+from six.moves import queue
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# this is needed until speedcopy for linux is fixed
+if sys.platform == "win32":
+    from speedcopy import copyfile
+else:
+    from shutil import copyfile
+
+log = logging.getLogger(__name__)
+
+# Available verifications of transferred files
+VERIFICATION_SIZE = "size"
+VERIFICATION_XXHASH = "xxhash"
+VERIFICATION_BLAKE2 = "blake2"
+
+
+def get_hash_function(algorithm):
+    """Hash object constructor for passed algorithm name.
+
+    Args:
+        algorithm (str): One of `VERIFICATION_XXHASH` or `VERIFICATION_BLAKE2`.
+
+    Returns:
+        callable: Constructor of hash object or None if algorithm is not
+            available in current python environment.
+    """
+    if algorithm == VERIFICATION_XXHASH:
+        if xxhash is not None:
+            return xxhash.xxh64
+        return None
+
+    if algorithm == VERIFICATION_BLAKE2:
+        return getattr(hashlib, "blake2b", None)
+    return None
+
+
+def create_file_dirs(filepath):
+    """Create parent directories of file path if they don't exist."""
+    dirname = os.path.dirname(filepath)
+    if not dirname:
+        return
+
+    try:
+        os.makedirs(dirname)
+    except OSError as exc:
+        if exc.errno != errno.EEXIST:
+            raise
+
+
+def replace_file(src, dst):
+    """Move file to destination path, replacing existing file.
+
+    Destination is replaced atomically where 'os.replace' is available
+    (Python 3), otherwise existing destination is removed before rename.
+    """
+    if hasattr(os, "replace"):
+        os.replace(src, dst)
+        return
+
+    if os.path.exists(dst):
+        os.remove(dst)
+    os.rename(src, dst)
+
+
+class FileTransferError(Exception):
+    """Transfer of some files failed.
+
+    Args:
+        failed (list): Tuples of item and exception message for each
+            failed item.
+        transferred (dict): Destination paths with sizes of files which
+            were transferred before failure.
+    """
+
+    def __init__(self, failed, transferred=None):
+        self.failed = failed
+        self.transferred = transferred or {}
+        lines = [
+            "{}: {}".format(item, message)
+            for item, message in failed
+        ]
+        super(FileTransferError, self).__init__(
+            "Transfer of {} file/s failed.\n{}".format(
+                len(failed), "\n".join(lines)
+            )
+        )
+
+
+class FileTransfers(object):
+    """Transfer files using bounded pool of threads.
+
+    Each file transfer is retried on failure. Transferred files are
+    verified by size or by content hash when `verification` is set to
+    hash algorithm. Source hash is calculated during copy and destination
+    file is read back and compared.
+
+    Args:
+        workers (int): Maximum number of files processed at the same time.
+        retries (int): How many times is failed file transfer retried.
+        verification (str): Verification of copied files. One of
+            `VERIFICATION_SIZE`, `VERIFICATION_XXHASH`, `VERIFICATION_BLAKE2`.
+        progress_callback (callable): Called after each processed file with
+            count of processed files, count of all files, processed bytes
+            and all bytes.
+        logger (logging.Logger): Logger used for progress reports.
+    """
+    chunk_size = 4 * 1024 * 1024
+    # Seconds to wait before first retry (multiplied by attempt)
+    retry_delay = 1
+    # Progress is logged after each part of files is processed
+    log_progress_parts = 10
+
+    def __init__(
+        self, workers=4, retries=2, verification=None,
+        progress_callback=None, logger=None
+    ):
+        self.log = logger or log
+        self.workers = max(1, int(workers or 1))
+        self.retries = max(0, int(retries or 0))
+
+        hash_function = None
+        if verification and verification != VERIFICATION_SIZE:
+            hash_function = get_hash_function(verification)
+            if hash_function is None:
+                self.log.warning((
+                    "Hash algorithm \"{}\" is not available."
+                    " Using size verification."
+                ).format(verification))
+                verification = None
+        self.verification = verification or VERIFICATION_SIZE
+        self._hash_function = hash_function
+        self.progress_callback = progress_callback
+
+        self._lock = threading.Lock()
+        self._reset_progress(0, 0)
+
+    def _reset_progress(self, files_count, bytes_count):
+        self._files_total = files_count
+        self._bytes_total = bytes_count
+        self._files_done = 0
+        self._bytes_done = 0
+        self._logged_part = 0
+
+    def _add_progress(self, bytes_count):
+        with self._lock:
+            self._files_done += 1
+            self._bytes_done += bytes_count
+            files_done = self._files_done
+            bytes_done = self._bytes_done
+            log_part = 0
+            if self._files_total:
+                log_part = int(
+                    files_done * self.log_progress_parts / self._files_total
+                )
+            should_log = log_part > self._logged_part
+            if should_log:
+                self._logged_part = log_part
+
+        if should_log:
+            self.log.debug(
+                "Processed {}/{} files ({:.1f}/{:.1f} MB)".format(
+                    files_done, self._files_total,
+                    bytes_done / (1024.0 ** 2),
+                    self._bytes_total / (1024.0 ** 2)
+                )
+            )
+
+        if self.progress_callback is not None:
+            self.progress_callback(
+                files_done, self._files_total,
+                bytes_done, self._bytes_total
+            )
+
+    def copy_files(self, transfers):
+        """Copy files to destinations.
+
+        Args:
+            transfers (list): Pairs of source and destination paths.
+
+        Returns:
+            dict: Destination paths with size of copied files.
+
+        Raises:
+            FileTransferError: Some of files could not be copied. Files
+                which were copied are available in exception.
+        """
+        transfers = [
+            (os.path.normpath(src), os.path.normpath(dst))
+            for src, dst in transfers
+        ]
+        bytes_count = 0
+        for src, _ in transfers:
+            if os.path.exists(src):
+                bytes_count += os.path.getsize(src)
+        self._reset_progress(len(transfers), bytes_count)
+
+        results, failed = self._process(self._copy_with_retries, transfers)
+        output = {}
+        for (_src, dst), size in results:
+            output[dst] = size
+
+        if failed:
+            raise FileTransferError(failed, output)
+        return output
+
+    def process_files(self, callback, items):
+        """Process items with callback in pool of threads.
+
+        Can be used for any file operation (rename, remove...) which should
+        run in parallel.
+
+        Args:
+            callback (callable): Callback processing one item.
+            items (list): Items to process.
+
+        Returns:
+            list: Pairs of item and callback result in order of items.
+
+        Raises:
+            FileTransferError: Callback raised an exception for some items.
+        """
+        items = list(items)
+        self._reset_progress(len(items), 0)
+
+        def _callback(item):
+            result = callback(item)
+            self._add_progress(0)
+            return result
+
+        results, failed = self._process(_callback, items)
+        if failed:
+            raise FileTransferError(failed)
+        return results
+
+    def _process(self, callback, items):
+        """Process items in pool of threads.
+
+        Returns:
+            tuple: Results (item, result) in order of items and failed items
+                with exception messages.
+        """
+        results = [None] * len(items)
+        failed = []
+        if not items:
+            return [], failed
+
+        items_queue = queue.Queue()
+        for idx, item in enumerate(items):
+            items_queue.put((idx, item))
+
+        lock = threading.Lock()
+
+        def _worker():
+            while True:
+                try:
+                    idx, item = items_queue.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    results[idx] = (item, callback(item))
+
+                except Exception as exc:
+                    self.log.debug(
+                        "Processing of {} failed".format(str(item)),
+                        exc_info=True
+                    )
+                    with lock:
+                        failed.append((item, str(exc)))
+
+        workers_count = min(self.workers, len(items))
+        if workers_count == 1:
+            _worker()
+        else:
+            threads = []
+            for _ in range(workers_count):
+                thread = threading.Thread(target=_worker)
+                thread.daemon = True
+                thread.start()
+                threads.append(thread)
+
+            for thread in threads:
+                thread.join()
+
+        return [result for result in results if result is not None], failed
+
+    def _copy_with_retries(self, transfer):
+        src, dst = transfer
+        attempt = 0
+        while True:
+            try:
+                size = self.copy_file(src, dst)
+                break
+
+            except (IOError, OSError):
+                # Remove partially copied file
+                if os.path.exists(dst) and not _samefile(src, dst):
+                    try:
+                        os.remove(dst)
+                    except OSError:
+                        pass
+
+                if attempt >= self.retries:
+                    raise
+
+                attempt += 1
+                self.log.warning(
+                    "Copy {} -> {} failed. Retrying ({}/{})".format(
+                        src, dst, attempt, self.retries
+                    ),
+                    exc_info=True
+                )
+                time.sleep(self.retry_delay * attempt)
+
+        self._add_progress(size)
+        return size
+
+    def copy_file(self, src, dst):
+        """Copy and verify one file.
+
+        Args:
+            src (str): Source file path.
+            dst (str): Destination file path.
+
+        Returns:
+            int: Size of copied file.
+
+        Raises:
+            IOError: Copied file does not match source file.
+        """
+        create_file_dirs(dst)
+
+        if _samefile(src, dst):
+            self.log.warning(
+                "Source and destination are the same file {}".format(src)
+            )
+            return os.path.getsize(dst)
+
+        if self._hash_function is None:
+            copyfile(src, dst)
+        else:
+            src_hash = self._stream_copy(src, dst)
+            dst_hash = self.file_hash(dst)
+            if src_hash != dst_hash:
+                raise IOError((
+                    "Content of copied file {} does not match source {}"
+                ).format(dst, src))
+
+        src_size = os.path.getsize(src)
+        dst_size = os.path.getsize(dst)
+        if src_size != dst_size:
+            raise IOError((
+                "Size of copied file {} ({}) does not match source {} ({})"
+            ).format(dst, dst_size, src, src_size))
+        return dst_size
+
+    def file_hash(self, filepath):
+        """Content hash of file with verification hash algorithm."""
+        hash_obj = self._hash_function()
+        with open(filepath, "rb") as stream:
+            for chunk in iter(lambda: stream.read(self.chunk_size), b""):
+                hash_obj.update(chunk)
+        return hash_obj.hexdigest()
+
+    def _stream_copy(self, src, dst):
+        """Copy file content and calculate hash of the content."""
+        hash_obj = self._hash_function()
+        with open(src, "rb") as src_stream:
+            with open(dst, "wb") as dst_stream:
+                for chunk in iter(
+                    lambda: src_stream.read(self.chunk_size), b""
+                ):
+                    hash_obj.update(chunk)
+                    dst_stream.write(chunk)
+        shutil.copymode(src, dst)
+        return hash_obj.hexdigest()
+
+
+def _samefile(src, dst):
+    try:
+        return os.path.samefile(src, dst)
+    except (AttributeError, OSError):
+        # Python 2 on windows does not have 'samefile'
+        return (
+            os.path.normcase(os.path.abspath(src))
+            == os.path.normcase(os.path.abspath(dst))
+        )
+
+
+__all__ = (
+    "VERIFICATION_SIZE",
+    "VERIFICATION_XXHASH",
+    "VERIFICATION_BLAKE2",
+    "get_hash_function",
+    "create_file_dirs",
+    "replace_file",
+    "FileTransferError",
+    "FileTransfers"
+)
@@ -2,8 +2,12 @@ import os
 import logging
 import json
 import platform
+import tempfile
+import threading
 import subprocess
 
+from .file_transfers import replace_file
+
 log = logging.getLogger("FFmpeg utils")
 
 
@@ -57,32 +61,187 @@ def get_ffmpeg_tool_path(tool="ffmpeg"):
     return os.path.join(ffmpeg_dir, tool)
 
 
-def ffprobe_streams(path_to_file, logger=None):
-    """Load streams from entered filepath via ffprobe.
+class FFprobeCache(object):
+    """Cache of parsed ffprobe output.
+
+    Result is identified by path, modification time and size of the file.
+    Results are shared in process. Results of files in temp directory
+    (staging directories of extractors) are also persisted into json file
+    next to the probed file so other processes (burnin script) can reuse
+    them. Directories of source or published files are never written to.
+    Persisted results are stored by filename, so they are valid even when
+    the directory is mounted to different path.
+
+    Additional persist root can be passed to `get` and `set`, e.g. staging
+    directory of instance which is not in temp directory on farm.
+
+    Args:
+        persist_roots (Iterable[str]): Directories under which results are
+            persisted. Temp directory is used when not passed.
+    """
+    filename = ".ffprobe_cache.json"
+
+    def __init__(self, persist_roots=None):
+        if persist_roots is None:
+            persist_roots = [tempfile.gettempdir()]
+        self._persist_roots = [
+            self._normalize_root(root)
+            for root in persist_roots
+        ]
+        self._results = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize_root(root):
+        return os.path.join(os.path.normcase(os.path.abspath(root)), "")
+
+    def _is_persisted(self, path_to_file, persist_root=None):
+        roots = list(self._persist_roots)
+        if persist_root:
+            roots.append(self._normalize_root(persist_root))
+
+        path_to_file = os.path.normcase(path_to_file)
+        for root in roots:
+            if path_to_file.startswith(root):
+                return True
+        return False
+
+    @staticmethod
+    def _get_stat_key(path_to_file):
+        try:
+            stat = os.stat(path_to_file)
+        except OSError:
+            return None
+        # milliseconds are precise enough and match across platforms
+        return [round(stat.st_mtime, 3), stat.st_size]
+
+    def _get_cache_path(self, path_to_file):
+        return os.path.join(os.path.dirname(path_to_file), self.filename)
+
+    def _load_persisted(self, cache_path):
+        if not os.path.exists(cache_path):
+            return {}
+        try:
+            with open(cache_path, "r") as stream:
+                return json.load(stream)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def get(self, path_to_file, persist_root=None):
+        """Cached ffprobe result of file or None if file was changed.
+
+        Args:
+            path_to_file (str): Path to probed file.
+            persist_root (str): Additional directory under which results
+                are persisted.
+        """
+        path_to_file = os.path.normpath(os.path.abspath(path_to_file))
+        stat_key = self._get_stat_key(path_to_file)
+        if stat_key is None:
+            return None
+
+        with self._lock:
+            item = self._results.get(path_to_file)
+            if item is not None and item["stat"] == stat_key:
+                return item["data"]
+
+            if not self._is_persisted(path_to_file, persist_root):
+                return None
+
+            persisted = self._load_persisted(
+                self._get_cache_path(path_to_file)
+            )
+            item = persisted.get(os.path.basename(path_to_file))
+            if item is not None and item.get("stat") == stat_key:
+                self._results[path_to_file] = item
+                return item["data"]
+        return None
+
+    def set(self, path_to_file, data, persist_root=None):
+        """Store ffprobe result of file in process and into temp directory.
+
+        Args:
+            path_to_file (str): Path to probed file.
+            data (dict): Parsed ffprobe output.
+            persist_root (str): Additional directory under which results
+                are persisted.
+        """
+        path_to_file = os.path.normpath(os.path.abspath(path_to_file))
+        stat_key = self._get_stat_key(path_to_file)
+        if stat_key is None:
+            return
+
+        item = {"stat": stat_key, "data": data}
+        cache_path = self._get_cache_path(path_to_file)
+        with self._lock:
+            self._results[path_to_file] = item
+            if not self._is_persisted(path_to_file, persist_root):
+                return
+
+            persisted = self._load_persisted(cache_path)
+            persisted[os.path.basename(path_to_file)] = item
+            tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+            try:
+                with open(tmp_path, "w") as stream:
+                    json.dump(persisted, stream)
+                replace_file(tmp_path, cache_path)
+            except (IOError, OSError):
+                # Directory may be read only, in process cache is enough
+                log.debug(
+                    "FFprobe cache \"{}\" was not stored".format(cache_path),
+                    exc_info=True
+                )
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+
+_FFPROBE_CACHE = FFprobeCache()
+
+
+def ffprobe_data(path_to_file, logger=None, persist_root=None):
+    """Load format and streams of file via ffprobe.
+
+    Result is cached by path, modification time and size of the file,
+    see 'FFprobeCache'.
 
     Args:
         path_to_file (str): absolute path
         logger (logging.getLogger): injected logger, if empty new is created
+        persist_root (str): Directory under which cached result is persisted
+            for other processes additionally to temp directory (e.g. staging
+            directory of instance).
 
+    Returns:
+        dict: Parsed ffprobe output with "format" and "streams" keys.
     """
     if not logger:
         logger = log
+
+    data = _FFPROBE_CACHE.get(path_to_file, persist_root)
+    if data is not None:
+        logger.debug(
+            "Using cached information about input \"{}\".".format(
+                path_to_file
+            )
+        )
+        return data
+
     logger.info(
         "Getting information about input \"{}\".".format(path_to_file)
     )
     args = [
-        "\"{}\"".format(get_ffmpeg_tool_path("ffprobe")),
-        "-v quiet",
-        "-print_format json",
+        get_ffmpeg_tool_path("ffprobe"),
+        "-v", "quiet",
+        "-print_format", "json",
         "-show_format",
         "-show_streams",
-        "\"{}\"".format(path_to_file)
+        path_to_file
     ]
-    command = " ".join(args)
-    logger.debug("FFprobe command: \"{}\"".format(command))
+    logger.debug("FFprobe command: {}".format(
+        subprocess.list2cmdline(args)
+    ))
     popen = subprocess.Popen(
-        command,
-        shell=True,
+        args,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE
     )
@@ -93,4 +252,25 @@ def ffprobe_streams(path_to_file, logger=None):
 
     if popen_stderr:
         logger.debug("ffprobe stderr: {}".format(popen_stderr))
-    return json.loads(popen_stdout)["streams"]
+
+    if popen.returncode != 0:
+        raise RuntimeError(
+            "FFprobe failed on \"{}\"".format(path_to_file)
+        )
+
+    data = json.loads(popen_stdout)
+    _FFPROBE_CACHE.set(path_to_file, data, persist_root)
+    return data
+
+
+def ffprobe_streams(path_to_file, logger=None, persist_root=None):
+    """Load streams from entered filepath via ffprobe.
+
+    Args:
+        path_to_file (str): absolute path
+        logger (logging.getLogger): injected logger, if empty new is created
+        persist_root (str): Directory under which cached result is persisted
+            (see 'ffprobe_data').
+
+    """
+    return ffprobe_data(path_to_file, logger, persist_root)["streams"]
@@ -114,7 +114,7 @@ class NextTaskUpdate(BaseEvent):
             ))
             return
 
-        statuses = session.query("Status").all()
+        statuses = self.metadata_cache.get_statuses()
 
         entities_info = self.filter_by_status_state(_entities_info, statuses)
         if not entities_info:
@@ -388,10 +388,11 @@ class NextTaskUpdate(BaseEvent):
         return next_tasks
 
     def statuses_for_tasks(self, task_type_ids, project_entity):
-        project_schema = project_entity["project_schema"]
         output = {}
         for task_type_id in task_type_ids:
-            statuses = project_schema.get_statuses("Task", task_type_id)
+            statuses = self.metadata_cache.get_task_statuses(
+                project_entity["id"], task_type_id
+            )
             output[task_type_id] = {
                 status["name"].lower(): status
                 for status in statuses
@@ -401,7 +402,7 @@ class NextTaskUpdate(BaseEvent):
 
     def get_sorted_task_type_ids(self, session):
         types_by_order = collections.defaultdict(list)
-        for _type in session.query("Type").all():
+        for _type in self.metadata_cache.get_types():
             sort_oder = _type.get("sort")
             if sort_oder is not None:
                 types_by_order[sort_oder].append(_type["id"])
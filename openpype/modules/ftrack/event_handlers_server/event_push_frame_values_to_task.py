@@ -7,13 +7,6 @@ from openpype.modules.ftrack.lib import BaseEvent
 
 class PushFrameValuesToTaskEvent(BaseEvent):
     # Ignore event handler by default
-    cust_attrs_query = (
-        "select id, key, object_type_id, is_hierarchical, default"
-        " from CustomAttributeConfiguration"
-        " where key in ({}) and"
-        " (object_type_id in ({}) or is_hierarchical is true)"
-    )
-
     cust_attr_query = (
         "select value, entity_id from ContextCustomAttributeValue "
         "where entity_id in ({}) and configuration_id in ({})"
@@ -125,7 +118,7 @@ class PushFrameValuesToTaskEvent(BaseEvent):
             return
 
         # Prepare object types
-        object_types = session.query("select id, name from ObjectType").all()
+        object_types = self.metadata_cache.get_object_types()
         object_types_by_name = {}
         for object_type in object_types:
             name_low = object_type["name"].lower()
@@ -412,14 +405,20 @@ class PushFrameValuesToTaskEvent(BaseEvent):
         ).all()
 
     def attrs_configurations(self, session, object_ids, interest_attributes):
-        attrs = session.query(self.cust_attrs_query.format(
-            self.join_query_keys(interest_attributes),
-            self.join_query_keys(object_ids)
-        )).all()
+        attrs = self.metadata_cache.get_custom_attribute_configurations()
 
         output = {}
         hiearchical = {}
         for attr in attrs:
+            if attr["key"] not in interest_attributes:
+                continue
+
+            if (
+                not attr["is_hierarchical"]
+                and attr["object_type_id"] not in object_ids
+            ):
+                continue
+
             if attr["is_hierarchical"]:
                 hiearchical[attr["key"]] = attr["id"]
                 continue
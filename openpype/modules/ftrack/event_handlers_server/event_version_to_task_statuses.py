@@ -138,11 +138,11 @@ class VersionToTaskStatus(BaseEvent):
                 continue
             status_ids.add(entity_info["changes"]["statusid"]["new"])
 
-        version_status_entities = session.query(
-            "select id, name from Status where id in ({})".format(
-                self.join_query_keys(status_ids)
-            )
-        ).all()
+        version_status_entities = [
+            status_entity
+            for status_entity in self.metadata_cache.get_statuses()
+            if status_entity["id"] in status_ids
+        ]
 
         # Qeury statuses
         statusese_by_obj_id = self.statuses_for_tasks(
@@ -228,11 +228,11 @@ class VersionToTaskStatus(BaseEvent):
         for task_entity in task_entities:
             task_type_ids.add(task_entity["type_id"])
 
-        project_entity = session.get("Project", project_id)
-        project_schema = project_entity["project_schema"]
         output = {}
         for task_type_id in task_type_ids:
-            statuses = project_schema.get_statuses("Task", task_type_id)
+            statuses = self.metadata_cache.get_task_statuses(
+                project_id, task_type_id
+            )
             output[task_type_id] = {
                 status["name"].lower(): status
                 for status in statuses
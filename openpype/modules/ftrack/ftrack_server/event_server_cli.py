@@ -168,7 +168,7 @@ def legacy_server(ftrack_url):
         time.sleep(1)
 
 
-def main_loop(ftrack_url):
+def main_loop(ftrack_url, processor_workers=1, coalesce_window=0):
     """ This is main loop of event handling.
 
     Loop is handling threads which handles subprocesses of event storer and
@@ -177,9 +177,19 @@ def main_loop(ftrack_url):
     server is not accessible. When threads are started it is checked for socket
     signals as heartbeat. Heartbeat must become at least once per 30sec
     otherwise thread will be killed.
+
+    Processor handles events of different projects in parallel when
+    `processor_workers` is higher than 1. Bursts of update events stored
+    within `coalesce_window` seconds are merged into one event.
     """
 
     os.environ["FTRACK_EVENT_SUB_ID"] = str(uuid.uuid1())
+    os.environ["FTRACK_EVENT_PROCESSOR_WORKERS"] = str(
+        max(int(processor_workers or 1), 1)
+    )
+    os.environ["FTRACK_EVENT_COALESCE_WINDOW"] = str(
+        max(float(coalesce_window or 0), 0)
+    )
 
     mongo_uri = OpenPypeMongoConnection.get_default_mongo_url()
 
@@ -427,7 +437,9 @@ def run_event_server(
     store_credentials,
     legacy,
     clockify_api_key,
-    clockify_workspace
+    clockify_workspace,
+    processor_workers=1,
+    coalesce_window=0
 ):
     if not no_stored_credentials:
         cred = credentials.get_credentials(ftrack_url)
@@ -465,7 +477,7 @@ def run_event_server(
     if legacy:
         return legacy_server(ftrack_url)
 
-    return main_loop(ftrack_url)
+    return main_loop(ftrack_url, processor_workers, coalesce_window)
 
 
 def main(argv):
@@ -576,12 +588,36 @@ def main(argv):
             "environment: $CLOCKIFY_WORKSPACE)"
         )
     )
+    parser.add_argument(
+        "-processorworkers", type=int,
+        help=(
+            "Count of projects which events are processed in parallel."
+            " (default from environment: $FTRACK_EVENT_PROCESSOR_WORKERS"
+            " or 1)"
+        )
+    )
+    parser.add_argument(
+        "-coalescewindow", type=float,
+        help=(
+            "Seconds in which update events of the same entities are merged"
+            " into one event, 0 disables merging. (default from environment:"
+            " $FTRACK_EVENT_COALESCE_WINDOW or 0)"
+        )
+    )
     ftrack_url = os.environ.get("FTRACK_SERVER")
     username = os.environ.get("FTRACK_API_USER")
     api_key = os.environ.get("FTRACK_API_KEY")
+    processor_workers = os.environ.get("FTRACK_EVENT_PROCESSOR_WORKERS")
+    coalesce_window = os.environ.get("FTRACK_EVENT_COALESCE_WINDOW")
 
     kwargs, args = parser.parse_known_args(argv)
 
+    if kwargs.processorworkers:
+        processor_workers = kwargs.processorworkers
+
+    if kwargs.coalescewindow is not None:
+        coalesce_window = kwargs.coalescewindow
+
     if kwargs.ftrackurl:
         ftrack_url = kwargs.ftrackurl
 
@@ -638,7 +674,7 @@ def main(argv):
     if legacy:
         return legacy_server(ftrack_url)
 
-    return main_loop(ftrack_url)
+    return main_loop(ftrack_url, processor_workers, coalesce_window)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import os
 import sys
+import copy
 import logging
 import getpass
 import atexit
@@ -22,7 +23,10 @@ try:
     from weakref import WeakMethod
 except ImportError:
     from ftrack_api._weakref import WeakMethod
-from openpype.modules.ftrack.lib import get_ftrack_event_mongo_info
+from openpype.modules.ftrack.lib import (
+    get_ftrack_event_mongo_info,
+    invalidate_metadata_caches
+)
 
 from openpype.lib import OpenPypeMongoConnection
 from openpype.api import Logger
@@ -129,24 +133,564 @@ class StorerEventHub(SocketBaseEventHub):
         )
 
 
+def get_event_project_id(event):
+    """Id of ftrack project which event is related to.
+
+    Project is found in parents of event entities or in action's selection.
+
+    Args:
+        event (ftrack_api.event.base.Event): Processed event.
+
+    Returns:
+        str/None: Id of project or None if event is not related to project.
+    """
+    event_data = event.get("data") or {}
+    for entity_info in event_data.get("entities") or []:
+        if entity_info.get("entityType") == "show":
+            return entity_info.get("entityId")
+
+        for parent_info in entity_info.get("parents") or []:
+            if parent_info.get("entityType") == "show":
+                return parent_info.get("entityId")
+
+    for selection_item in event_data.get("selection") or []:
+        if selection_item.get("entityType") == "show":
+            return selection_item.get("entityId")
+    return None
+
+
+def get_event_mongo_ids(event):
+    """Mongo ids of stored events which event was created from.
+
+    Event created by `EventCoalescer` has ids of all merged events.
+    """
+    event_data = event["data"]
+    mongo_ids = event_data.get("_event_mongo_ids")
+    if mongo_ids:
+        return list(mongo_ids)
+
+    mongo_id = event_data.get("_event_mongo_id")
+    if mongo_id is None:
+        return []
+    return [mongo_id]
+
+
+class EventCoalescer(object):
+    """Merge bursts of stored update events into one event.
+
+    Editing in ftrack often triggers many `ftrack.update` events for the
+    same entities in short time (e.g. attribute and status change in the
+    same moment). Consecutive update events of the same project and user,
+    stored within `window` seconds since the first of them, are merged
+    into one event so handlers process the burst in one pass.
+
+    Entity infos with "update" action are merged by entity id - keys are
+    united, the first "old" and the last "new" value of each change is
+    kept. Other entity infos are appended. Any other event of the project
+    ends the burst so order of project's events is not changed.
+
+    Args:
+        window (float): Seconds of burst. Events are passed through without
+            change when is 0.
+    """
+    topics = ("ftrack.update",)
+
+    def __init__(self, window=0):
+        self.window = max(float(window or 0), 0)
+
+    @property
+    def enabled(self):
+        return self.window > 0
+
+    def get_key(self, event_data):
+        if event_data.get("topic") not in self.topics:
+            return None
+
+        source = event_data.get("source") or {}
+        user = source.get("user") or {}
+        return (
+            event_data["topic"],
+            user.get("id") or user.get("username"),
+            get_event_project_id(event_data)
+        )
+
+    def coalesce(self, events_data):
+        """Merge bursts of events.
+
+        Args:
+            events_data (list): Stored event documents sorted by stored date.
+
+        Returns:
+            list: Tuples of event document and list of mongo ids of stored
+                events merged into the document.
+        """
+        if not self.enabled:
+            return [
+                (event_data, [event_data["_id"]])
+                for event_data in events_data
+            ]
+
+        window = datetime.timedelta(seconds=self.window)
+        output = []
+        # Index of burst in output by key
+        bursts = {}
+        for event_data in events_data:
+            key = self.get_key(event_data)
+            stored = (event_data.get("pype_data") or {}).get("stored")
+            burst_idx = bursts.get(key)
+            if key is not None and burst_idx is not None:
+                burst_data, mongo_ids, burst_stored = output[burst_idx]
+                if (
+                    stored is not None
+                    and burst_stored is not None
+                    and stored - burst_stored <= window
+                ):
+                    self.merge_entities(
+                        burst_data["data"],
+                        (event_data.get("data") or {}).get("entities")
+                    )
+                    mongo_ids.append(event_data["_id"])
+                    continue
+
+            # End bursts of the same project
+            project_id = get_event_project_id(event_data)
+            for _key in tuple(bursts.keys()):
+                if _key[-1] == project_id:
+                    bursts.pop(_key)
+
+            if key is not None:
+                event_data = copy.deepcopy(event_data)
+                bursts[key] = len(output)
+            output.append((event_data, [event_data["_id"]], stored))
+
+        return [
+            (event_data, mongo_ids)
+            for event_data, mongo_ids, _ in output
+        ]
+
+    @staticmethod
+    def merge_entities(event_data, entities):
+        """Merge entity infos of burst into `event_data`."""
+        merged_entities = event_data.setdefault("entities", [])
+        updated_by_id = {}
+        for entity_info in merged_entities:
+            if entity_info.get("action") == "update":
+                updated_by_id[str(entity_info.get("entityId"))] = entity_info
+
+        for entity_info in entities or []:
+            entity_info = copy.deepcopy(entity_info)
+            if entity_info.get("action") != "update":
+                merged_entities.append(entity_info)
+                continue
+
+            entity_id = str(entity_info.get("entityId"))
+            merged_info = updated_by_id.get(entity_id)
+            if merged_info is None:
+                merged_entities.append(entity_info)
+                updated_by_id[entity_id] = entity_info
+                continue
+
+            keys = merged_info.setdefault("keys", [])
+            for key in entity_info.get("keys") or []:
+                if key not in keys:
+                    keys.append(key)
+
+            changes = merged_info.get("changes")
+            if changes is None:
+                changes = {}
+                merged_info["changes"] = changes
+
+            for key, change in (entity_info.get("changes") or {}).items():
+                merged_change = changes.get(key)
+                if merged_change is None or not isinstance(change, dict):
+                    changes[key] = change
+                else:
+                    merged_change["new"] = change.get("new")
+
+
+class EventPartition(threading.Thread):
+    """Thread processing events of assigned projects in order.
+
+    Partition has own session with registered event handlers, created by
+    `session_factory` in the thread, so events of different partitions can
+    be processed concurrently.
+
+    Args:
+        index (int): Index of partition.
+        session_factory (callable): Creates session with registered
+            handlers.
+        on_processed (callable): Called with mongo ids of processed event.
+    """
+    def __init__(self, index, session_factory, on_processed):
+        super(EventPartition, self).__init__()
+        self.name = "EventPartition{}".format(index)
+        self.daemon = True
+        self.session_factory = session_factory
+        self.on_processed = on_processed
+        self.session = None
+        self.failed = False
+
+        self._queue = queue.Queue()
+        self.log = Logger().get_logger(self.name)
+
+    @property
+    def queue_size(self):
+        return self._queue.qsize()
+
+    def put(self, event):
+        self._queue.put(event)
+
+    def take_events(self):
+        """Remove and return events waiting in queue."""
+        events = []
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is not None:
+                events.append(event)
+        return events
+
+    def stop(self):
+        self._queue.put(None)
+
+    def run(self):
+        try:
+            self.session = self.session_factory()
+        except Exception:
+            self.failed = True
+            self.log.error(
+                "Session of partition could not be created", exc_info=True
+            )
+            return
+
+        while True:
+            event = self._queue.get()
+            if event is None:
+                break
+
+            try:
+                self.session.event_hub._handle(event)
+            except Exception:
+                self.log.error(
+                    "Handling of event {} failed".format(event["id"]),
+                    exc_info=True
+                )
+            self.on_processed(get_event_mongo_ids(event))
+
+        self.session.close()
+
+
+# Processed events are removed from database after 3 days
+PROCESSED_EVENTS_EXPIRATION = 3 * 24 * 60 * 60
+
+
+def ensure_event_indexes(collection):
+    """Create indexes of collection with stored events.
+
+    Compound index is used to claim not processed events in stored order
+    and TTL index removes processed events. Processed events stored before
+    TTL index was used don't have processed date and are removed here.
+    """
+    collection.create_index([
+        ("pype_data.is_processed", pymongo.ASCENDING),
+        ("pype_data.stored", pymongo.ASCENDING)
+    ])
+    collection.create_index(
+        [("pype_data.processed", pymongo.ASCENDING)],
+        expireAfterSeconds=PROCESSED_EVENTS_EXPIRATION
+    )
+
+    ago_date = datetime.datetime.utcnow() - datetime.timedelta(
+        seconds=PROCESSED_EVENTS_EXPIRATION
+    )
+    collection.delete_many({
+        "pype_data.stored": {"$lte": ago_date},
+        "pype_data.is_processed": True,
+        "pype_data.processed": {"$exists": False}
+    })
+
+
+class StoredEventsWatcher(threading.Thread):
+    """Set `wake_event` when new event is stored.
+
+    Change stream of collection is used which is available only on replica
+    set. Processor polls for stored events in intervals when the watcher is
+    not available.
+
+    Args:
+        collection (pymongo.collection.Collection): Collection with stored
+            events.
+        wake_event (threading.Event): Event set when event is stored.
+    """
+    pipeline = [
+        {"$match": {"operationType": {"$in": ["insert", "replace"]}}}
+    ]
+
+    def __init__(self, collection, wake_event):
+        super(StoredEventsWatcher, self).__init__()
+        self.name = "StoredEventsWatcher"
+        self.daemon = True
+        self.collection = collection
+        self.wake_event = wake_event
+
+        self._stopped = threading.Event()
+        self.log = Logger().get_logger(self.name)
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        try:
+            with self.collection.watch(
+                self.pipeline, max_await_time_ms=500
+            ) as stream:
+                while not self._stopped.is_set() and stream.alive:
+                    if stream.try_next() is not None:
+                        self.wake_event.set()
+
+        except pymongo.errors.PyMongoError:
+            self.log.info((
+                "Change streams are not available, stored events are polled."
+            ), exc_info=True)
+
+
+class EventsLeaseKeeper(threading.Thread):
+    """Renew lease of events claimed by processor until are processed.
+
+    Args:
+        collection (pymongo.collection.Collection): Collection with stored
+            events.
+        owner (str): Identifier of processor which claimed events.
+        lease (float): Seconds of lease.
+    """
+    def __init__(self, collection, owner, lease):
+        super(EventsLeaseKeeper, self).__init__()
+        self.name = "EventsLeaseKeeper"
+        self.daemon = True
+        self.collection = collection
+        self.owner = owner
+        self.lease = lease
+
+        self._stopped = threading.Event()
+        self.log = Logger().get_logger(self.name)
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.wait(self.lease / 3.0):
+            try:
+                self.collection.update_many(
+                    {
+                        "pype_data.is_processed": False,
+                        "pype_data.claimed_by": self.owner
+                    },
+                    {"$set": {
+                        "pype_data.lease_until": (
+                            datetime.datetime.utcnow()
+                            + datetime.timedelta(seconds=self.lease)
+                        )
+                    }}
+                )
+            except pymongo.errors.PyMongoError:
+                self.log.warning(
+                    "Lease of claimed events was not renewed", exc_info=True
+                )
+
+
 class ProcessEventHub(SocketBaseEventHub):
     hearbeat_msg = b"processor"
 
     is_collection_created = False
     pypelog = Logger().get_logger("Session Processor")
 
+    # Seconds for which claimed event can't be claimed by other processor,
+    # lease is renewed until the event is processed
+    claim_lease = 60
+    # Maximum count of events claimed at once
+    claim_batch_size = 100
+    # Seconds between loading of events when change streams are not
+    # available
+    poll_interval = 0.5
+
     def __init__(self, *args, **kwargs):
         self.mongo_url = None
         self.dbcon = None
 
+        self._partitions = []
+        self._partitions_count = 1
+        self._partition_session_factory = None
+        self._partition_by_project_id = {}
+        self._processed_ids = []
+        self._processed_lock = threading.Lock()
+        self._coalescer = EventCoalescer()
+
+        self._wake_event = threading.Event()
+        self._watcher = None
+        self._lease_keeper = None
+
         super(ProcessEventHub, self).__init__(*args, **kwargs)
 
+    def set_partitions(self, partitions_count, session_factory):
+        """Process stored events in partitions by project.
+
+        Events of one project keep their order, events of different projects
+        are processed concurrently by up to `partitions_count` threads, each
+        with own session created by `session_factory`. Events are processed
+        by this hub's session when `partitions_count` is lower than 2.
+
+        Args:
+            partitions_count (int): Count of partitions.
+            session_factory (callable): Creates session with registered
+                handlers for partition.
+        """
+        self._partitions_count = max(int(partitions_count or 1), 1)
+        self._partition_session_factory = session_factory
+
+    def set_coalescing(self, window):
+        """Merge bursts of update events before they're handled.
+
+        Stored events are claimed when the oldest of them is older than
+        `window` seconds, together with events stored within `window` after
+        it, and bursts of update events are merged (see `EventCoalescer`).
+
+        Args:
+            window (float): Seconds of burst, events are passed through
+                when is 0.
+        """
+        self._coalescer = EventCoalescer(window)
+
+    def start_partitions(self):
+        if (
+            self._partitions_count < 2
+            or self._partition_session_factory is None
+        ):
+            return
+
+        self.pypelog.info("Starting {} event partitions".format(
+            self._partitions_count
+        ))
+        for index in range(self._partitions_count):
+            partition = EventPartition(
+                index,
+                self._partition_session_factory,
+                self._on_partition_processed
+            )
+            partition.start()
+            self._partitions.append(partition)
+
+    def stop_partitions(self):
+        for partition in self._partitions:
+            partition.stop()
+
+        for partition in self._partitions:
+            partition.join()
+        self._partitions = []
+        self._partition_by_project_id = {}
+
+    def _on_partition_processed(self, mongo_ids):
+        with self._processed_lock:
+            self._processed_ids.extend(mongo_ids)
+
+    def get_partition(self, event):
+        """Partition processing events of event's project.
+
+        Project is assigned to partition with least queued events when its
+        first event is processed and stays in the partition, so order of
+        project's events is kept. Projects of partition which failed to
+        create session are reassigned to other partitions.
+
+        Returns:
+            EventPartition: Partition or None when all partitions failed.
+        """
+        project_id = get_event_project_id(event)
+        partition = self._partition_by_project_id.get(project_id)
+        if partition is not None and partition.failed:
+            self._release_failed_partition(partition)
+            partition = None
+
+        if partition is None:
+            partitions = [
+                _partition
+                for _partition in self._partitions
+                if not _partition.failed
+            ]
+            if not partitions:
+                return None
+
+            partition = min(
+                partitions,
+                key=lambda _partition: _partition.queue_size
+            )
+            self._partition_by_project_id[project_id] = partition
+        return partition
+
+    def _release_failed_partition(self, partition):
+        for project_id, _partition in tuple(
+            self._partition_by_project_id.items()
+        ):
+            if _partition is partition:
+                self._partition_by_project_id.pop(project_id)
+
+        if all(_partition.failed for _partition in self._partitions):
+            self.pypelog.warning((
+                "{} failed to start and no other partition is running,"
+                " events are handled by processor session."
+            ).format(partition.name))
+        else:
+            self.pypelog.warning((
+                "{} failed to start, its projects are reassigned."
+            ).format(partition.name))
+
+        # Events waiting in failed partition precede the current event
+        for event in partition.take_events():
+            self.dispatch_event(event)
+
+    def dispatch_event(self, event):
+        """Pass stored event to partition or handle it with own session."""
+        # Changes of schema entities are not related to a project but all
+        #   partitions use them
+        if event["topic"] == "ftrack.update":
+            invalidate_metadata_caches(event)
+
+        partition = self.get_partition(event)
+        if partition is not None:
+            partition.put(event)
+            return
+
+        self._handle(event)
+        self.set_processed(get_event_mongo_ids(event))
+
+    def mark_processed(self):
+        """Mark events processed by partitions as processed in database."""
+        with self._processed_lock:
+            processed_ids = self._processed_ids
+            self._processed_ids = []
+
+        self.set_processed(processed_ids)
+
+    def set_processed(self, mongo_ids):
+        """Set stored events as processed in database."""
+        if not mongo_ids:
+            return
+
+        self.dbcon.update_many(
+            {"_id": {"$in": mongo_ids}},
+            {"$set": {
+                "pype_data.is_processed": True,
+                "pype_data.processed": datetime.datetime.utcnow()
+            }}
+        )
+
     def prepare_dbcon(self):
         try:
             database_name, collection_name = get_ftrack_event_mongo_info()
             mongo_client = OpenPypeMongoConnection.get_mongo_client()
             self.dbcon = mongo_client[database_name][collection_name]
             self.mongo_client = mongo_client
+            ensure_event_indexes(self.dbcon)
 
         except pymongo.errors.AutoReconnect:
             self.pypelog.error((
@@ -165,29 +709,83 @@ class ProcessEventHub(SocketBaseEventHub):
 
     def wait(self, duration=None):
         """Overriden wait
-        Event are loaded from Mongo DB when queue is empty. Handled event is
-        set as processed in Mongo DB.
+        Event are claimed from Mongo DB when queue is empty. Handled event is
+        set as processed in Mongo DB. Stored events are handled by partitions
+        when are set (see `set_partitions`).
         """
         started = time.time()
         self.prepare_dbcon()
+        self.start_partitions()
+        self.start_watchers()
+        try:
+            self._wait(started, duration)
+        finally:
+            if self._partitions:
+                self.stop_partitions()
+                self.mark_processed()
+            self.stop_watchers()
+            self.release_events()
+
+    def start_watchers(self):
+        self._watcher = StoredEventsWatcher(self.dbcon, self._wake_event)
+        self._watcher.start()
+        self._lease_keeper = EventsLeaseKeeper(
+            self.dbcon, self.id, self.claim_lease
+        )
+        self._lease_keeper.start()
+
+    def stop_watchers(self):
+        for thread in (self._watcher, self._lease_keeper):
+            if thread is not None:
+                thread.stop()
+        self._watcher = None
+        self._lease_keeper = None
+
+    def release_events(self):
+        """Release claimed events which were not processed."""
+        try:
+            self.dbcon.update_many(
+                {
+                    "pype_data.is_processed": False,
+                    "pype_data.claimed_by": self.id
+                },
+                {"$unset": {
+                    "pype_data.claimed_by": "",
+                    "pype_data.lease_until": ""
+                }}
+            )
+        except pymongo.errors.PyMongoError:
+            self.pypelog.warning(
+                "Claimed events were not released", exc_info=True
+            )
+
+    def _wait(self, started, duration):
         while True:
+            try:
+                self.mark_processed()
+            except pymongo.errors.AutoReconnect:
+                self.pypelog.error((
+                    "Mongo server \"{}\" is not responding, exiting."
+                ).format(os.environ["AVALON_MONGO"]))
+                sys.exit(0)
+
             try:
                 event = self._event_queue.get(timeout=0.1)
             except queue.Empty:
                 if not self.load_events():
-                    time.sleep(0.5)
+                    # Wait for new stored event
+                    self._wake_event.wait(self.poll_interval)
+                    self._wake_event.clear()
             else:
                 try:
-                    self._handle(event)
-
-                    mongo_id = event["data"].get("_event_mongo_id")
-                    if mongo_id is None:
+                    mongo_ids = get_event_mongo_ids(event)
+                    if mongo_ids and self._partitions:
+                        self.dispatch_event(event)
                         continue
 
-                    self.dbcon.update_one(
-                        {"_id": mongo_id},
-                        {"$set": {"pype_data.is_processed": True}}
-                    )
+                    self._handle(event)
+
+                    self.set_processed(mongo_ids)
 
                 except pymongo.errors.AutoReconnect:
                     self.pypelog.error((
@@ -202,22 +800,66 @@ class ProcessEventHub(SocketBaseEventHub):
                 if (time.time() - started) > duration:
                     break
 
-    def load_events(self):
-        """Load not processed events sorted by stored date"""
-        ago_date = datetime.datetime.now() - datetime.timedelta(days=3)
-        self.dbcon.delete_many({
-            "pype_data.stored": {"$lte": ago_date},
-            "pype_data.is_processed": True
-        })
-
-        not_processed_events = self.dbcon.find(
-            {"pype_data.is_processed": False}
-        ).sort(
-            [("pype_data.stored", pymongo.ASCENDING)]
-        )
+    def claim_events(self):
+        """Claim not processed events sorted by stored date.
+
+        Each event is claimed atomically, so event is processed by one
+        processor when more processors are running. Event claimed by other
+        processor can be claimed when its lease expires.
+
+        Returns:
+            list: Claimed event documents.
+        """
+        now = datetime.datetime.utcnow()
+        query = {
+            "pype_data.is_processed": False,
+            "$or": [
+                {"pype_data.lease_until": None},
+                {"pype_data.lease_until": {"$lt": now}}
+            ]
+        }
+        if self._coalescer.enabled:
+            # Wait until burst started by the oldest event is complete, then
+            # claim all events of the burst so they can be merged
+            oldest_event = self.dbcon.find_one(
+                query,
+                projection={"pype_data.stored": True},
+                sort=[("pype_data.stored", pymongo.ASCENDING)]
+            )
+            if oldest_event is None:
+                return []
+
+            window = datetime.timedelta(seconds=self._coalescer.window)
+            oldest_stored = oldest_event["pype_data"]["stored"]
+            if oldest_stored > now - window:
+                return []
+            query["pype_data.stored"] = {"$lte": oldest_stored + window}
+
+        update = {"$set": {
+            "pype_data.claimed_by": self.id,
+            "pype_data.lease_until": now + datetime.timedelta(
+                seconds=self.claim_lease
+            )
+        }}
+        claimed_events = []
+        while len(claimed_events) < self.claim_batch_size:
+            event_data = self.dbcon.find_one_and_update(
+                query,
+                update,
+                sort=[("pype_data.stored", pymongo.ASCENDING)],
+                return_document=pymongo.ReturnDocument.AFTER
+            )
+            if event_data is None:
+                break
+            claimed_events.append(event_data)
+        return claimed_events
 
+    def load_events(self):
+        """Load claimed events to queue"""
         found = False
-        for event_data in not_processed_events:
+        for event_data, mongo_ids in self._coalescer.coalesce(
+            self.claim_events()
+        ):
             new_event_data = {
                 k: v for k, v in event_data.items()
                 if k not in ["_id", "pype_data"]
@@ -225,6 +867,8 @@ class ProcessEventHub(SocketBaseEventHub):
             try:
                 event = ftrack_api.event.base.Event(**new_event_data)
                 event["data"]["_event_mongo_id"] = event_data["_id"]
+                if len(mongo_ids) > 1:
+                    event["data"]["_event_mongo_ids"] = mongo_ids
             except Exception:
                 self.logger.exception(L(
                     'Failed to convert payload into event: {0}',
@@ -401,6 +1045,34 @@ class CustomEventHubSession(ftrack_api.session.Session):
         )
 
 
+class PartitionEventHub(ftrack_api.event.hub.EventHub):
+    """Event hub of partition session which is not connected to server.
+
+    Events are passed to the hub by `ProcessEventHub` and events published by
+    handlers are sent through connection of `parent_hub`.
+    """
+    def __init__(self, *args, **kwargs):
+        self.parent_hub = kwargs.pop("parent_hub")
+        super(PartitionEventHub, self).__init__(*args, **kwargs)
+
+    def publish(self, event, synchronous=False, **kwargs):
+        if synchronous:
+            return super(PartitionEventHub, self).publish(
+                event, synchronous=True, **kwargs
+            )
+        return self.parent_hub.publish(event, **kwargs)
+
+
+class PartitionSession(CustomEventHubSession):
+    def _create_event_hub(self):
+        return PartitionEventHub(
+            self._server_url,
+            self._api_user,
+            self._api_key,
+            parent_hub=self.kwargs["parent_hub"]
+        )
+
+
 class SocketSession(CustomEventHubSession):
     def _create_event_hub(self):
         self.sock = self.kwargs["sock"]
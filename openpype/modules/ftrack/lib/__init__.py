@@ -18,6 +18,11 @@ from .custom_attributes import (
 
 from . import avalon_sync
 from . import credentials
+from .metadata_cache import (
+    FtrackMetadataCache,
+    get_metadata_cache,
+    invalidate_metadata_caches
+)
 from .ftrack_base_handler import BaseHandler
 from .ftrack_event_handler import BaseEvent
 from .ftrack_action_handler import BaseAction, ServerAction, statics_icon
@@ -42,6 +47,10 @@ __all__ = (
 
     "credentials",
 
+    "FtrackMetadataCache",
+    "get_metadata_cache",
+    "invalidate_metadata_caches",
+
     "BaseHandler",
 
     "BaseEvent",
@@ -5,6 +5,7 @@ from openpype.settings import get_project_settings
 
 import ftrack_api
 from openpype.modules.ftrack import ftrack_server
+from .metadata_cache import get_metadata_cache
 
 
 class MissingPermision(Exception):
@@ -138,6 +139,11 @@ class BaseHandler(object):
         '''Return current session.'''
         return self._session
 
+    @property
+    def metadata_cache(self):
+        '''Cache of ftrack schema entities shared by handlers of session.'''
+        return get_metadata_cache(self._session)
+
     def reset_session(self):
         self.session.reset()
 
@@ -0,0 +1,171 @@
+"""Cache of ftrack schema entities shared by handlers of one session.
+
+Statuses, task types, object types, custom attribute configurations and
+statuses of project schemas are changed rarely but event handlers need them
+on most of events. Cache is created per session (entities are bound to
+session) and is cleared when ftrack update event of schema entity or
+project schema change is handled, or when cache expires.
+"""
+import time
+import weakref
+import threading
+
+
+class FtrackMetadataCache(object):
+    """Cache of ftrack schema entities of one session.
+
+    Cache subscribes to 'ftrack.update' topic with priority lower than
+    event handlers, so it is invalidated before handlers process the event.
+
+    Args:
+        session (ftrack_api.Session): Session used for queries.
+        expiration (float): Seconds after which cached values are queried
+            again.
+    """
+    # Lowered entity types from update events which change cached data
+    schema_entity_types = {
+        "status",
+        "type",
+        "objecttype",
+        "customattributeconfiguration",
+        "customattributegroup",
+        "projectschema",
+        "schema",
+        "schemastatus",
+        "schematype",
+        "taskstatus",
+        "tasktypeschema",
+        "tasktypeschematype",
+        "taskworkflowschema",
+        "taskworkflowschemastatus",
+        "projectschemaoverride"
+    }
+    # Keys of project in update event which change project schema
+    project_schema_keys = {"projectschemaid", "project_schema_id"}
+    # Priority of invalidation (handlers have 100 by default)
+    priority = 10
+
+    def __init__(self, session, expiration=300):
+        self._session = weakref.ref(session)
+        self.expiration = expiration
+
+        self._values = {}
+        self._task_statuses = {}
+        self._expire_time = None
+
+        session.event_hub.subscribe(
+            "topic=ftrack.update",
+            self.invalidate,
+            priority=self.priority
+        )
+
+    @property
+    def session(self):
+        return self._session()
+
+    def clear(self):
+        self._values = {}
+        self._task_statuses = {}
+        self._expire_time = None
+
+    def clear_project(self, project_id):
+        for key in tuple(self._task_statuses.keys()):
+            if key[0] == project_id:
+                self._task_statuses.pop(key)
+
+    def _check_expiration(self):
+        now = time.time()
+        if self._expire_time is not None and now > self._expire_time:
+            self.clear()
+
+        if self._expire_time is None:
+            self._expire_time = now + self.expiration
+
+    def invalidate(self, event):
+        """Clear cached values changed by ftrack update event."""
+        for entity_info in event["data"].get("entities") or []:
+            entity_type = (entity_info.get("entityType") or "").lower()
+            if entity_type in self.schema_entity_types:
+                self.clear()
+                return
+
+            if entity_type != "show":
+                continue
+
+            keys = set(entity_info.get("keys") or [])
+            if keys & self.project_schema_keys:
+                self.clear_project(entity_info.get("entityId"))
+
+    def _query_all(self, query):
+        self._check_expiration()
+        entities = self._values.get(query)
+        if entities is None:
+            entities = self.session.query(query).all()
+            self._values[query] = entities
+        return list(entities)
+
+    def get_statuses(self):
+        """All statuses."""
+        return self._query_all("Status")
+
+    def get_types(self):
+        """All task types."""
+        return self._query_all("Type")
+
+    def get_object_types(self):
+        """All object types."""
+        return self._query_all("select id, name from ObjectType")
+
+    def get_custom_attribute_configurations(self):
+        """All custom attribute configurations."""
+        return self._query_all((
+            "select id, key, object_type_id, is_hierarchical, default"
+            " from CustomAttributeConfiguration"
+        ))
+
+    def get_task_statuses(self, project_id, task_type_id):
+        """Statuses available for task type in project's schema.
+
+        Args:
+            project_id (str): Id of ftrack project.
+            task_type_id (str): Id of task type.
+
+        Returns:
+            list: Status entities.
+        """
+        self._check_expiration()
+        key = (project_id, task_type_id)
+        statuses = self._task_statuses.get(key)
+        if statuses is None:
+            project_entity = self.session.get("Project", project_id)
+            project_schema = project_entity["project_schema"]
+            statuses = list(project_schema.get_statuses("Task", task_type_id))
+            self._task_statuses[key] = statuses
+        return list(statuses)
+
+
+_caches_by_session = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def get_metadata_cache(session):
+    """Metadata cache of session, created on first call."""
+    with _caches_lock:
+        cache = _caches_by_session.get(session)
+        if cache is None:
+            cache = FtrackMetadataCache(session)
+            _caches_by_session[session] = cache
+    return cache
+
+
+def invalidate_metadata_caches(event):
+    """Invalidate caches of all sessions by ftrack update event.
+
+    Processor with multiple sessions (see 'EventPartition') passes event
+    only to one session, caches of other sessions would be outdated.
+    """
+    with _caches_lock:
+        caches = list(_caches_by_session.values())
+
+    for cache in caches:
+        cache.invalidate(event)
@@ -7,10 +7,12 @@ import datetime
 from openpype.modules.ftrack.ftrack_server.ftrack_server import FtrackServer
 from openpype.modules.ftrack.ftrack_server.lib import (
     SocketSession,
+    PartitionSession,
     ProcessEventHub,
     TOPIC_STATUS_SERVER
 )
 from openpype.modules import ModulesManager
+from openpype.settings.lib import start_settings_watcher
 
 from openpype.api import Logger
 
@@ -60,6 +62,21 @@ def register(session):
     )
 
 
+def partition_session_factory(session, handler_paths):
+    """Create function creating sessions for event partitions.
+
+    Partition sessions have registered all server event handlers and send
+    published events through event hub of processor's session.
+    """
+    def create_session():
+        partition_session = PartitionSession(parent_hub=session.event_hub)
+        server = FtrackServer(handler_paths)
+        server.session = partition_session
+        server.set_files(handler_paths)
+        return partition_session
+    return create_session
+
+
 def main(args):
     port = int(args[-1])
     # Create a TCP/IP socket
@@ -80,11 +97,24 @@ def main(args):
         register(session)
         SessionFactory.session = session
 
+        # Processor is long running process and handlers use settings
+        start_settings_watcher()
+
         manager = ModulesManager()
         ftrack_module = manager.modules_by_name["ftrack"]
-        server = FtrackServer(
-            ftrack_module.server_event_handlers_paths
+        handler_paths = ftrack_module.server_event_handlers_paths
+
+        # Events of different projects are processed in parallel
+        workers = int(os.environ.get("FTRACK_EVENT_PROCESSOR_WORKERS") or 1)
+        session.event_hub.set_partitions(
+            workers, partition_session_factory(session, handler_paths)
+        )
+        # Bursts of update events are merged into one event
+        session.event_hub.set_coalescing(
+            float(os.environ.get("FTRACK_EVENT_COALESCE_WINDOW") or 0)
         )
+
+        server = FtrackServer(handler_paths)
         log.debug("Launched Ftrack Event processor")
         server.run_server(session)
 
@@ -1,8 +1,11 @@
 import os
 import sys
+import time
+import queue
 import datetime
 import signal
 import socket
+import threading
 import pymongo
 
 import ftrack_api
@@ -27,52 +30,181 @@ class SessionFactory:
 
 database_name, collection_name = get_ftrack_event_mongo_info()
 dbcon = None
+events_writer = None
 
 # ignore_topics = ["ftrack.meta.connected"]
 ignore_topics = []
 
 
+class EventsWriter(threading.Thread):
+    """Store events to database in batches.
+
+    Events are collected in queue and written with one ordered bulk write
+    when `batch_size` events are collected or `flush_interval` seconds
+    passed since the first of them. Putting of event blocks when queue is
+    full so event hub is slowed down instead of growing memory.
+
+    Args:
+        collection (pymongo.collection.Collection): Collection where events
+            are stored.
+        batch_size (int): Maximum count of events in one write.
+        flush_interval (float): Seconds for which events are collected.
+        max_queue_size (int): Maximum count of events waiting for write.
+    """
+    def __init__(
+        self, collection, batch_size=100, flush_interval=0.1,
+        max_queue_size=10000
+    ):
+        super(EventsWriter, self).__init__()
+        self.name = "EventsWriter"
+        self.daemon = True
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Mongo server was not responding
+        self.failed = False
+
+        self._queue = queue.Queue(max_queue_size)
+        self._stopped = False
+
+    def put(self, event_data):
+        """Add event to queue, blocks while the queue is full.
+
+        Returns:
+            bool: Event was added, writer failed otherwise.
+        """
+        if self._queue.full():
+            log.warning("Events are stored slower than they come.")
+
+        while not self.failed:
+            try:
+                self._queue.put(event_data, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def wait_written(self):
+        """Wait until all events in queue are written."""
+        while (
+            self._queue.unfinished_tasks
+            and not self.failed
+            and self.is_alive()
+        ):
+            time.sleep(0.01)
+
+    def stop(self, timeout=None):
+        """Write events in queue and stop the thread."""
+        if not self._stopped:
+            self._stopped = True
+            self.put(None)
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        stop = False
+        while not stop:
+            event_data = self._queue.get()
+            if event_data is None:
+                self._queue.task_done()
+                break
+
+            batch = [event_data]
+            flush_time = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = flush_time - time.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event_data = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                if event_data is None:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batch.append(event_data)
+
+            try:
+                self.write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if self.failed:
+                break
+
+    def write(self, batch):
+        requests = [
+            pymongo.ReplaceOne(
+                {"id": event_data["id"]}, event_data, upsert=True
+            )
+            for event_data in batch
+        ]
+        try:
+            self.collection.bulk_write(requests, ordered=True)
+            log.debug("Events: {} stored".format(", ".join(
+                event_data["id"] for event_data in batch
+            )))
+
+        except pymongo.errors.AutoReconnect:
+            log.error(
+                "Mongo server \"{}\" is not responding, exiting.".format(
+                    os.environ["AVALON_MONGO"]
+                )
+            )
+            self.failed = True
+
+        except pymongo.errors.BulkWriteError as exc:
+            write_errors = exc.details.get("writeErrors") or []
+            for write_error in write_errors:
+                log.error("Event: {} failed to store. {}".format(
+                    batch[write_error["index"]]["id"],
+                    write_error.get("errmsg")
+                ))
+            # Ordered bulk write stops on first error
+            if write_errors:
+                self.write(batch[write_errors[-1]["index"] + 1:])
+
+        except Exception:
+            log.error("Events failed to store", exc_info=True)
+
+
 def install_db():
     global dbcon
+    global events_writer
     try:
         mongo_client = OpenPypeMongoConnection.get_mongo_client()
         dbcon = mongo_client[database_name][collection_name]
+        dbcon.create_index("id")
     except pymongo.errors.AutoReconnect:
         log.error("Mongo server \"{}\" is not responding, exiting.".format(
             OpenPypeMongoConnection.get_default_mongo_url()
         ))
         sys.exit(0)
 
+    events_writer = EventsWriter(dbcon)
+    events_writer.start()
+
+
+def stop_events_writer():
+    if events_writer is not None:
+        events_writer.stop(timeout=30)
+
 
 def launch(event):
     if event.get("topic") in ignore_topics:
         return
 
-    event_data = event._data
-    event_id = event["id"]
-
+    event_data = dict(event._data)
     event_data["pype_data"] = {
         "stored": datetime.datetime.utcnow(),
         "is_processed": False
     }
-
-    try:
-        # dbcon.insert_one(event_data)
-        dbcon.replace_one({"id": event_id}, event_data, upsert=True)
-        log.debug("Event: {} stored".format(event_id))
-
-    except pymongo.errors.AutoReconnect:
-        log.error("Mongo server \"{}\" is not responding, exiting.".format(
-            os.environ["AVALON_MONGO"]
-        ))
+    if not events_writer.put(event_data):
         sys.exit(0)
 
-    except Exception as exc:
-        log.error(
-            "Event: {} failed to store".format(event_id),
-            exc_info=True
-        )
-
 
 def trigger_sync(event):
     session = SessionFactory.session
@@ -88,13 +220,18 @@ def trigger_sync(event):
     if not projects:
         return True
 
+    # Stored sync actions are marked as processed below
+    events_writer.wait_written()
     query = {
         "pype_data.is_processed": False,
         "topic": "ftrack.action.launch",
         "data.actionIdentifier": "sync.to.avalon.server"
     }
     set_dict = {
-        "$set": {"pype_data.is_processed": True}
+        "$set": {
+            "pype_data.is_processed": True,
+            "pype_data.processed": datetime.datetime.utcnow()
+        }
     }
     dbcon.update_many(query, set_dict)
 
@@ -207,6 +344,7 @@ def main(args):
         sock.sendall(b"MongoError")
 
     finally:
+        stop_events_writer()
         log.debug("First closing socket")
         sock.close()
         return 1
@@ -216,6 +354,7 @@ if __name__ == "__main__":
     # Register interupt signal
     def signal_handler(sig, frame):
         print("You pressed Ctrl+C. Process ended.")
+        stop_events_writer()
         sys.exit(0)
 
     signal.signal(signal.SIGINT, signal_handler)
@@ -0,0 +1,168 @@
+"""Write-behind buffer of site updates of representation files."""
+import time
+import threading
+
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from openpype.lib import PypeLogger
+
+
+log = PypeLogger().get_logger("SyncServer")
+
+
+class SiteUpdatesBuffer(object):
+    """Coalesce updates of file sites and write them with bulk writes.
+
+    Updates are stored per project, representation, file and site. Later
+    update of the same site replaces previous progress update, so only last
+    state is written. All updates of one representation are combined into
+    single update operation and all operations of a project are written
+    with one bulk write.
+
+    Updates are written when `flush` is called or when oldest buffered
+    update is older than `max_latency`, so tray UI shows progress with
+    bounded delay.
+
+    Args:
+        database (pymongo.database.Database): Database with project
+            collections.
+        max_latency (float): Maximum age of buffered update in seconds.
+    """
+    # Site key prefix used by update dictionaries of SyncServerModule
+    site_key_prefix = "files.$[f].sites.$[s]."
+
+    def __init__(self, database, max_latency=2):
+        self.database = database
+        self.max_latency = max_latency
+        self._lock = threading.Lock()
+        self._updates = {}
+        self._oldest_update = None
+
+    def add(self, collection, representation_id, file_id, site_name,
+            update, is_progress=False):
+        """Buffer update of site of a representation file.
+
+        Args:
+            collection (string): project name
+            representation_id (ObjectId): representation id
+            file_id (ObjectId): id of file in representation
+            site_name (string): name of site
+            update (dict): update operators with site keys prefixed with
+                `site_key_prefix`
+            is_progress (bool): update contains only progress
+        """
+        key = (collection, representation_id, ObjectId(file_id), site_name)
+        with self._lock:
+            current = self._updates.get(key)
+            # Progress should not replace result of transfer
+            if not (is_progress and current and not current[1]):
+                self._updates[key] = (update, is_progress)
+
+            if self._oldest_update is None:
+                self._oldest_update = time.time()
+            is_due = time.time() - self._oldest_update >= self.max_latency
+
+        if is_due:
+            self.flush()
+
+    def is_due(self):
+        with self._lock:
+            if self._oldest_update is None:
+                return False
+            return time.time() - self._oldest_update >= self.max_latency
+
+    def flush(self):
+        """Write all buffered updates.
+
+        Returns:
+            int: Count of written update operations.
+        """
+        with self._lock:
+            updates = self._updates
+            self._updates = {}
+            self._oldest_update = None
+
+        if not updates:
+            return 0
+
+        updates_by_repre = {}
+        for key, value in updates.items():
+            collection, representation_id, file_id, site_name = key
+            repre_key = (collection, representation_id)
+            updates_by_repre.setdefault(repre_key, []).append(
+                (file_id, site_name, value[0])
+            )
+
+        operations_by_collection = {}
+        for repre_key, site_updates in updates_by_repre.items():
+            collection, representation_id = repre_key
+            operations_by_collection.setdefault(collection, []).append(
+                self._create_operation(representation_id, site_updates)
+            )
+
+        count = 0
+        for collection, operations in operations_by_collection.items():
+            try:
+                self.database[collection].bulk_write(
+                    operations, ordered=False
+                )
+                count += len(operations)
+            except PyMongoError:
+                log.warning((
+                    "Writing of site updates to {} failed,"
+                    " updates are written with next flush"
+                ).format(collection), exc_info=True)
+                self._restore_updates({
+                    key: value
+                    for key, value in updates.items()
+                    if key[0] == collection
+                })
+        log.debug("Written {} site updates of {} representations".format(
+            len(updates), count
+        ))
+        return count
+
+    def _restore_updates(self, updates):
+        """Return updates which were not written back to buffer.
+
+        Updates buffered meanwhile are newer and are kept, only result of
+        transfer is not replaced by progress.
+        """
+        with self._lock:
+            for key, value in updates.items():
+                current = self._updates.get(key)
+                if current is None or (current[1] and not value[1]):
+                    self._updates[key] = value
+
+            if self._oldest_update is None:
+                self._oldest_update = time.time()
+
+    def _create_operation(self, representation_id, site_updates):
+        """Combine updates of sites of one representation.
+
+        Each file and site gets unique array filter identifiers.
+        """
+        combined_update = {}
+        array_filters = []
+        for idx, (file_id, site_name, update) in enumerate(site_updates):
+            file_ident = "f{}".format(idx)
+            site_ident = "s{}".format(idx)
+            prefix = "files.$[{}].sites.$[{}].".format(file_ident, site_ident)
+            for operator, values in update.items():
+                operator_values = combined_update.setdefault(operator, {})
+                for key, value in values.items():
+                    if key.startswith(self.site_key_prefix):
+                        key = prefix + key[len(self.site_key_prefix):]
+                    operator_values[key] = value
+
+            array_filters.append({"{}._id".format(file_ident): file_id})
+            array_filters.append({"{}.name".format(site_ident): site_name})
+
+        return UpdateOne(
+            {"_id": representation_id},
+            combined_update,
+            upsert=True,
+            array_filters=array_filters
+        )
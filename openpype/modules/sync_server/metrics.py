@@ -0,0 +1,288 @@
+"""Metrics of synchronization.
+
+Counters and histograms are recorded by sync loop per project, site and
+provider. They are exposed in Prometheus text format on webserver route
+'/sync_server/metrics' and sampled into rolling history charted in tray.
+"""
+import time
+import threading
+import collections
+
+
+# upper bounds of histogram buckets in seconds
+DEFAULT_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+# name: (type, help)
+METRICS = {
+    "transferred_bytes_total": (
+        "counter", "Bytes of successfully transferred files."
+    ),
+    "transferred_files_total": (
+        "counter", "Count of successfully transferred files."
+    ),
+    "failed_files_total": (
+        "counter", "Count of failed file transfers."
+    ),
+    "throttled_files_total": (
+        "counter", "Count of transfers postponed because of provider quota."
+    ),
+    "queue_depth": (
+        "gauge", "Representations waiting for synchronization."
+    ),
+    "in_flight_transfers": (
+        "gauge", "Transfers running at the moment."
+    ),
+    "concurrency_limit": (
+        "gauge", "Current limit of parallel transfers."
+    ),
+    "transfer_duration_seconds": (
+        "histogram", "Duration of transfer tasks."
+    ),
+    "loop_duration_seconds": (
+        "histogram", "Duration of sync loop of single project."
+    )
+}
+
+
+class Histogram(object):
+    """
+        Cumulative histogram of observed values.
+
+    Args:
+        buckets (tuple): sorted upper bounds of buckets
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _format_labels(labels, extra=None):
+    labels = list(labels)
+    if extra:
+        labels.append(extra)
+    if not labels:
+        return ""
+
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\")
+        value = value.replace("\n", "\\n").replace('"', '\\"')
+        parts.append('{}="{}"'.format(key, value))
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+class SyncMetrics(object):
+    """
+        Thread safe storage of sync metrics.
+
+        Totals of all labels are sampled into history at most once per
+        'history_interval' seconds, history keeps last 'history_length'
+        samples (one hour by default).
+
+    Args:
+        namespace (string): prefix of metric names
+    """
+    history_interval = 10
+    history_length = 360
+
+    def __init__(self, namespace="openpype_sync"):
+        self.namespace = namespace
+        self._values = {}
+        self._histograms = {}
+        self._history = collections.deque(maxlen=self.history_length)
+        self._last_sample = None
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels, value=1):
+        """Increase counter 'name' with 'labels' (dict) by 'value'."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, labels, value):
+        """Set gauge 'name' with 'labels' (dict) to 'value'."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = value
+
+    def observe(self, name, labels, value):
+        """Add 'value' to histogram 'name' with 'labels' (dict)."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = Histogram()
+                self._histograms[key] = histogram
+            histogram.observe(value)
+
+    def record_transfer(self, project, site, provider, direction,
+                        size=0, error=None, throttled=False):
+        """
+            Record result of single file transfer.
+
+        Args:
+            project (string): project name
+            site (string): site where file was transferred to
+            provider (string): provider of site
+            direction (string): "upload" or "download"
+            size (int): size of file in bytes
+            error (string): error message if transfer failed
+            throttled (bool): transfer was postponed because of quota
+        """
+        labels = {
+            "project": project,
+            "site": site,
+            "provider": provider,
+            "direction": direction
+        }
+        if throttled:
+            self.inc("throttled_files_total", labels)
+        elif error:
+            self.inc("failed_files_total", labels)
+        else:
+            self.inc("transferred_files_total", labels)
+            self.inc("transferred_bytes_total", labels, size or 0)
+
+    def get_total(self, name):
+        """Sum of values of 'name' for all labels."""
+        with self._lock:
+            return sum(
+                value
+                for (metric_name, _), value in self._values.items()
+                if metric_name == name
+            )
+
+    def sample(self, force=False):
+        """
+            Append totals to history if 'history_interval' passed.
+
+        Returns:
+            (dict) new history sample or None
+        """
+        now = time.time()
+        with self._lock:
+            if (
+                not force
+                and self._last_sample is not None
+                and now - self._last_sample["time"] < self.history_interval
+            ):
+                return None
+
+        totals = {
+            "bytes": self.get_total("transferred_bytes_total"),
+            "files": self.get_total("transferred_files_total"),
+            "failures": self.get_total("failed_files_total"),
+            "throttled": self.get_total("throttled_files_total")
+        }
+        sample = {
+            "time": now,
+            "queue_depth": self.get_total("queue_depth"),
+            "in_flight": self.get_total("in_flight_transfers"),
+            "totals": totals
+        }
+        with self._lock:
+            previous = self._last_sample
+            self._last_sample = sample
+            if previous is None:
+                return None
+
+            elapsed = max(now - previous["time"], 0.001)
+            previous_totals = previous["totals"]
+            item = {
+                "time": now,
+                "bytes_per_second": (
+                    (totals["bytes"] - previous_totals["bytes"]) / elapsed
+                ),
+                "files": totals["files"] - previous_totals["files"],
+                "failures": totals["failures"] - previous_totals["failures"],
+                "throttled": (
+                    totals["throttled"] - previous_totals["throttled"]
+                ),
+                "queue_depth": sample["queue_depth"],
+                "in_flight": sample["in_flight"]
+            }
+            self._history.append(item)
+        return item
+
+    def get_history(self):
+        """
+            Rolling history of sync throughput, oldest first.
+
+        Returns:
+            (list) of dictionaries with 'time', 'bytes_per_second', 'files',
+                'failures', 'throttled', 'queue_depth' and 'in_flight'
+        """
+        with self._lock:
+            return list(self._history)
+
+    def render(self):
+        """Metrics in Prometheus text exposition format."""
+        with self._lock:
+            values = dict(self._values)
+            histograms = {
+                key: (list(histogram.buckets), list(histogram.counts),
+                      histogram.sum, histogram.count)
+                for key, histogram in self._histograms.items()
+            }
+
+        lines = []
+        for name in sorted(METRICS):
+            metric_type, help_text = METRICS[name]
+            full_name = "{}_{}".format(self.namespace, name)
+            if metric_type == "histogram":
+                items = sorted(
+                    (labels, data)
+                    for (metric_name, labels), data in histograms.items()
+                    if metric_name == name
+                )
+            else:
+                items = sorted(
+                    (labels, value)
+                    for (metric_name, labels), value in values.items()
+                    if metric_name == name
+                )
+            if not items:
+                continue
+
+            lines.append("# HELP {} {}".format(full_name, help_text))
+            lines.append("# TYPE {} {}".format(full_name, metric_type))
+            for labels, data in items:
+                if metric_type != "histogram":
+                    lines.append("{}{} {}".format(
+                        full_name, _format_labels(labels), _format_value(data)
+                    ))
+                    continue
+
+                buckets, counts, total_sum, count = data
+                for upper_bound, bucket_count in zip(buckets, counts):
+                    lines.append("{}_bucket{} {}".format(
+                        full_name,
+                        _format_labels(labels, ("le", upper_bound)),
+                        bucket_count
+                    ))
+                lines.append("{}_bucket{} {}".format(
+                    full_name, _format_labels(labels, ("le", "+Inf")), count
+                ))
+                lines.append("{}_sum{} {}".format(
+                    full_name, _format_labels(labels), _format_value(total_sum)
+                ))
+                lines.append("{}_count{} {}".format(
+                    full_name, _format_labels(labels), count
+                ))
+
+        return "\n".join(lines) + "\n"
@@ -1,12 +1,31 @@
+import os
 import abc
 import six
 from openpype.api import Logger
+from .transfers import (
+    get_transfer_sessions,
+    AdaptiveChunkSize,
+    TransferProgress
+)
 
 log = Logger().get_logger("SyncServer")
 
 
 @six.add_metaclass(abc.ABCMeta)
 class AbstractProvider:
+    # chunk sizes of resumable transfers in bytes, see 'get_chunk_size'
+    CHUNK_SIZE = 8388608
+    MIN_CHUNK_SIZE = 1048576
+    MAX_CHUNK_SIZE = 67108864
+    CHUNK_MULTIPLE = 1
+    # how many times is failed chunk transfer retried
+    CHUNK_RETRIES = 5
+    # state of transfers of smaller files is not persisted
+    RESUMABLE_MIN_SIZE = 33554432
+    # default rate of API requests of a site, 0 is unlimited
+    REQUESTS_PER_SECOND = 0
+    # provider implements 'transfer_files' for multiple files at once
+    BATCH_TRANSFERS = False
 
     def __init__(self, project_name, site_name, tree=None, presets=None):
         self.presets = None
@@ -166,3 +185,104 @@ class AbstractProvider:
                 raise ValueError(msg)
 
         return path
+
+    def transfer_files(self, transfers, overwrite=False, direction="Upload"):
+        """
+            Transfer multiple files at once, implemented only by providers
+            with 'BATCH_TRANSFERS'.
+
+        Args:
+            transfers (list): of tuples (source_path, target_path, progress)
+                where progress is callback from 'get_progress_callback'
+            overwrite (boolean): replace existing files
+            direction (string): "Upload" or "Download"
+        Returns:
+            (list) result for each transfer - file id or exception
+        """
+        raise NotImplementedError(
+            "{} doesn't support batch transfers".format(
+                self.__class__.__name__))
+
+    def get_chunk_size(self):
+        """
+            Chunk size of single transfer adapted to connection speed.
+
+        Returns:
+            (AdaptiveChunkSize)
+        """
+        return AdaptiveChunkSize(
+            self.CHUNK_SIZE,
+            self.MIN_CHUNK_SIZE,
+            self.MAX_CHUNK_SIZE,
+            self.CHUNK_MULTIPLE
+        )
+
+    def get_progress_callback(self, server, collection, file, representation,
+                              site, direction="Upload"):
+        """
+            Callback reporting transferred bytes of file to DB.
+
+            Callback raises ValueError if representation was paused.
+
+            Args:
+                arguments of 'upload_file' used for saving progress
+                direction (string): "Upload" or "Download" for logging
+            Returns:
+                (TransferProgress) callable with transferred bytes and size
+        """
+        return TransferProgress(
+            server, collection, file, representation, site, direction
+        )
+
+    def get_file_stat(self, path):
+        """
+            Values identifying version of local file for resumed transfers.
+
+            Returns:
+                (list) size and modification time
+        """
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime]
+
+    def get_transfer_state(self, direction, source_path, target_path,
+                           source_stat):
+        """
+            Persisted state of previous unfinished transfer of a file.
+
+            Args:
+                direction (string): "Upload" or "Download"
+                source_path (string): path of transferred file
+                target_path (string): target path of transferred file
+                source_stat (list): values identifying version of source,
+                    state of different version is not returned
+            Returns:
+                (dict) or None if transfer wasn't started or can't be resumed
+        """
+        sessions = get_transfer_sessions()
+        key = sessions.get_key(
+            self.site_name, direction, source_path, target_path
+        )
+        return sessions.get(key, source_stat)
+
+    def set_transfer_state(self, direction, source_path, target_path,
+                           state, source_stat):
+        """
+            Persist state of transfer so it can be resumed after failure.
+
+            Args:
+                see 'get_transfer_state'
+                state (dict): json serializable data needed for resume
+        """
+        sessions = get_transfer_sessions()
+        key = sessions.get_key(
+            self.site_name, direction, source_path, target_path
+        )
+        sessions.set(key, state, source_stat)
+
+    def remove_transfer_state(self, direction, source_path, target_path):
+        """Remove persisted state of finished transfer."""
+        sessions = get_transfer_sessions()
+        key = sessions.get_key(
+            self.site_name, direction, source_path, target_path
+        )
+        sessions.remove(key)
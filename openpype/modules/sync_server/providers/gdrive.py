@@ -1,13 +1,21 @@
 from __future__ import print_function
 import os.path
+import json
 from googleapiclient.discovery import build
 import google.oauth2.service_account as service_account
 from googleapiclient import errors
+import httplib2
 from .abstract_provider import AbstractProvider
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
+from .gdrive_tree import (
+    get_folder_tree,
+    list_drive_folders,
+    build_folder_tree
+)
+from googleapiclient.http import MediaFileUpload
 from openpype.api import Logger
 from openpype.api import get_system_settings
 from ..utils import time_function
+from ..rate_limiter import get_site_rate_limiter, ProviderThrottled
 import time
 
 
@@ -18,6 +26,89 @@ SCOPES = ['https://www.googleapis.com/auth/drive.metadata.readonly',
 log = Logger().get_logger("SyncServer")
 
 
+def is_quota_error(exc):
+    """Returns True if HttpError was caused by exceeded quota."""
+    status = str(exc.resp.get('status'))
+    if status == '429':
+        return True
+    if status != '403':
+        return False
+    # storage quota is not temporary, only rate limits are
+    return "rate limit" in exc._get_reason().lower()
+
+
+class RateLimitedRequest(object):
+    """
+        Wraps HttpRequest of API, waits for token of site rate limiter
+        before each request and reports latency and quota errors.
+    """
+    def __init__(self, request, rate_limiter):
+        object.__setattr__(self, "_request", request)
+        object.__setattr__(self, "_rate_limiter", rate_limiter)
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._request, name, value)
+
+    def _call(self, method_name, *args, record_latency=True, **kwargs):
+        self._rate_limiter.acquire()
+        start = time.time()
+        try:
+            result = getattr(self._request, method_name)(*args, **kwargs)
+        except errors.HttpError as ex:
+            if is_quota_error(ex):
+                retry_after = self._rate_limiter.record_throttled()
+                raise ProviderThrottled(
+                    "Quota exceeded, requests paused for {}s".format(
+                        retry_after))
+            self._rate_limiter.record_error()
+            raise
+        latency = None
+        if record_latency:
+            latency = time.time() - start
+        self._rate_limiter.record_success(latency)
+        return result
+
+    def execute(self, *args, **kwargs):
+        return self._call("execute", *args, **kwargs)
+
+    def execute_chunk(self, *args, **kwargs):
+        """Execute request transferring chunk of file.
+
+        Duration of chunk transfer depends on chunk size, not on load, so
+        it is not recorded as latency.
+        """
+        return self._call("execute", *args, record_latency=False, **kwargs)
+
+    def next_chunk(self, *args, **kwargs):
+        return self._call("next_chunk", *args, record_latency=False,
+                          **kwargs)
+
+
+class RateLimitedResource(object):
+    """
+        Wraps API resource (service, 'files()'...), requests created from
+        it are wrapped by 'RateLimitedRequest'.
+    """
+    def __init__(self, resource, rate_limiter):
+        self._resource = resource
+        self._rate_limiter = rate_limiter
+
+    def __getattr__(self, name):
+        attr = getattr(self._resource, name)
+        if not callable(attr):
+            return attr
+
+        def _wrapped(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, "execute"):
+                return RateLimitedRequest(result, self._rate_limiter)
+            return RateLimitedResource(result, self._rate_limiter)
+        return _wrapped
+
+
 class GDriveHandler(AbstractProvider):
     """
         Implementation of Google Drive API.
@@ -26,6 +117,8 @@ class GDriveHandler(AbstractProvider):
         which are used in API. Building of this tree might be expensive and
         slow and should be run only when necessary. Currently is set to
         lazy creation, created only after first call when necessary.
+        Folders are persisted per site and updated from changes feed of
+        the drive (see 'gdrive_tree.GDriveFolderTree').
 
         Configuration for provider is in
             'settings/defaults/project_settings/global.json'
@@ -44,7 +137,12 @@ class GDriveHandler(AbstractProvider):
     """
     FOLDER_STR = 'application/vnd.google-apps.folder'
     MY_DRIVE_STR = 'My Drive'  # name of root folder of regular Google drive
-    CHUNK_SIZE = 2097152  # must be divisible by 256!
+    CHUNK_SIZE = 8388608
+    MIN_CHUNK_SIZE = 1048576
+    MAX_CHUNK_SIZE = 67108864
+    CHUNK_MULTIPLE = 262144  # chunks must be divisible by 256KB!
+    # Drive API quota is 1000 requests per 100 seconds per user
+    REQUESTS_PER_SECOND = 10
 
     def __init__(self, project_name, site_name, tree=None, presets=None):
         self.presets = None
@@ -62,7 +160,9 @@ class GDriveHandler(AbstractProvider):
             log.info("Sync Server: No credentials for Gdrive provider! ")
             return
 
-        self.service = self._get_gd_service()
+        self.rate_limiter = get_site_rate_limiter(site_name)
+        self.service = RateLimitedResource(self._get_gd_service(),
+                                           self.rate_limiter)
         self.root = self._prepare_root_info()
         self._tree = tree
         self.active = True
@@ -100,7 +200,9 @@ class GDriveHandler(AbstractProvider):
              (dictionary) - url to id mapping
         """
         if not self._tree:
-            self._tree = self._build_tree(self.list_folders())
+            self._tree = get_folder_tree(self.site_name).get_tree(
+                self.service, self.root
+            )
         return self._tree
 
     def create_folder(self, path):
@@ -141,6 +243,12 @@ class GDriveHandler(AbstractProvider):
 
                     new_path_key = path + '/' + new_folder_name
                     self.get_tree()[new_path_key] = {"id": folder_id}
+                    get_folder_tree(self.site_name).add_folder(
+                        folder_id,
+                        new_folder_name,
+                        folder_metadata["parents"][0],
+                        new_path_key
+                    )
 
                     path = new_path_key
                 return folder_id
@@ -191,11 +299,18 @@ class GDriveHandler(AbstractProvider):
         file_metadata = {
             'name': target_name
         }
-        media = MediaFileUpload(source_path,
-                                mimetype='application/octet-stream',
-                                chunksize=self.CHUNK_SIZE,
-                                resumable=True)
-
+        chunk_size = self.get_chunk_size()
+        media = self._create_upload_media(source_path, chunk_size.chunk_size)
+
+        target_path = path + "/" + target_name
+        target_id = None
+        if target_file:
+            target_id = target_file["id"]
+        source_stat = self.get_file_stat(source_path)
+        state = self.get_transfer_state("Upload", source_path, target_path,
+                                        source_stat)
+        progress = self.get_progress_callback(server, collection, file,
+                                              representation, site, "Upload")
         try:
             if not target_file:
                 # update doesnt like parent
@@ -212,46 +327,121 @@ class GDriveHandler(AbstractProvider):
                                                       media_body=media,
                                                       fields='id')
 
-            media.stream()
-            log.debug("Start Upload! {}".format(source_path))
-            last_tick = status = response = None
-            status_val = 0
+            response = None
+            if state and state.get("target_id") == target_id:
+                uploaded, response = self._get_uploaded_size(
+                    request.http, state["session_uri"], media.size()
+                )
+                if uploaded is None:
+                    log.debug("Upload session of {} expired".format(
+                        source_path))
+                    state = None
+                else:
+                    log.debug("Resume Upload! {} from {} bytes".format(
+                        source_path, uploaded))
+                    request.resumable_uri = state["session_uri"]
+                    request.resumable_progress = uploaded
+            else:
+                state = None
+
+            if state is None:
+                log.debug("Start Upload! {}".format(source_path))
+
+            failed_chunks = 0
             while response is None:
-                if server.is_representation_paused(representation['_id'],
-                                                   check_parents=True,
-                                                   project_name=collection):
-                    raise ValueError("Paused during process, please redo.")
-                if status:
-                    status_val = float(status.progress())
-                if not last_tick or \
-                        time.time() - last_tick >= server.LOG_PROGRESS_SEC:
-                    last_tick = time.time()
-                    log.debug("Uploaded %d%%." %
-                              int(status_val * 100))
-                    server.update_db(collection=collection,
-                                     new_file_id=None,
-                                     file=file,
-                                     representation=representation,
-                                     site=site,
-                                     progress=status_val
-                                     )
-                status, response = request.next_chunk()
+                progress(request.resumable_progress, media.size())
+                if media.chunksize() != chunk_size.chunk_size:
+                    media = self._create_upload_media(
+                        source_path, chunk_size.chunk_size
+                    )
+                    request.resumable = media
+                uploaded = request.resumable_progress
+                start = time.time()
+                try:
+                    _, response = request.next_chunk(
+                        num_retries=self.CHUNK_RETRIES
+                    )
+                except errors.HttpError:
+                    raise
+                except (IOError, OSError, httplib2.HttpLib2Error):
+                    failed_chunks += 1
+                    if failed_chunks > self.CHUNK_RETRIES:
+                        raise
+                    log.warning("Upload of chunk failed, retrying.",
+                                exc_info=True)
+                    chunk_size.failed()
+                    continue
+
+                chunk_size.record(request.resumable_progress - uploaded,
+                                  time.time() - start)
+                if state is None and request.resumable_uri:
+                    state = {
+                        "session_uri": request.resumable_uri,
+                        "target_id": target_id
+                    }
+                    self.set_transfer_state("Upload", source_path,
+                                            target_path, state, source_stat)
 
         except errors.HttpError as ex:
             if ex.resp['status'] == '404':
+                # upload session expired
+                self.remove_transfer_state("Upload", source_path,
+                                           target_path)
                 return False
             if ex.resp['status'] == '403':
                 # real permission issue
                 if 'has not granted' in ex._get_reason().strip():
                     raise PermissionError(ex._get_reason().strip())
-
-                log.warning("Forbidden received, hit quota. "
-                            "Injecting 60s delay.")
-                time.sleep(60)
-                return False
             raise
+        self.remove_transfer_state("Upload", source_path, target_path)
         return response['id']
 
+    def _create_upload_media(self, source_path, chunk_size):
+        return MediaFileUpload(source_path,
+                               mimetype='application/octet-stream',
+                               chunksize=chunk_size,
+                               resumable=True)
+
+    def _get_uploaded_size(self, http, session_uri, size):
+        """
+            Ask resumable upload session for count of uploaded bytes.
+
+        Args:
+            http (httplib2.Http): authorized http of service
+            session_uri (string): URI of upload session
+            size (int): size of uploaded file
+        Returns:
+            (tuple) count of uploaded bytes (None if session expired) and
+                response of finished upload (None if not finished)
+        """
+        self.rate_limiter.acquire()
+        resp, content = http.request(
+            session_uri,
+            method="PUT",
+            headers={
+                "Content-Length": "0",
+                "Content-Range": "bytes */{}".format(size)
+            }
+        )
+        status = int(resp.status)
+        if status in (200, 201):
+            self.rate_limiter.record_success()
+            return size, json.loads(content)
+
+        if status == 308:
+            self.rate_limiter.record_success()
+            # e.g. "bytes=0-1048575", missing if nothing was uploaded
+            range_header = resp.get("range")
+            if not range_header:
+                return 0, None
+            return int(range_header.rsplit("-", 1)[-1]) + 1, None
+
+        if status in (404, 410):
+            return None, None
+
+        self.rate_limiter.record_error()
+        raise errors.HttpError(resp, content, uri=session_uri)
+
     def download_file(self, source_path, local_path,
                       server, collection, file, representation, site,
                       overwrite=False):
@@ -295,34 +485,64 @@ class GDriveHandler(AbstractProvider):
             raise FileExistsError("File already exists, "
                                   "use 'overwrite' argument")
 
-        request = self.service.files().get_media(fileId=remote_file["id"],
-                                                 supportsAllDrives=True)
-
-        with open(local_path + "/" + target_name, "wb") as fh:
-            downloader = MediaIoBaseDownload(fh, request)
-            last_tick = status = response = None
-            status_val = 0
-            while response is None:
-                if server.is_representation_paused(representation['_id'],
-                                                   check_parents=True,
-                                                   project_name=collection):
-                    raise ValueError("Paused during process, please redo.")
-                if status:
-                    status_val = float(status.progress())
-                if not last_tick or \
-                        time.time() - last_tick >= server.LOG_PROGRESS_SEC:
-                    last_tick = time.time()
-                    log.debug("Downloaded %d%%." %
-                              int(status_val * 100))
-                    server.update_db(collection=collection,
-                                     new_file_id=None,
-                                     file=file,
-                                     representation=representation,
-                                     site=site,
-                                     progress=status_val
-                                     )
-                status, response = downloader.next_chunk()
-
+        target_path = local_path + "/" + target_name
+        # file is downloaded to temporary file which is kept on failure
+        part_path = target_path + ".part"
+        source_stat = [remote_file["id"],
+                       remote_file.get("md5Checksum"),
+                       remote_file.get("size")]
+        state = self.get_transfer_state("Download", source_path, target_path,
+                                        source_stat)
+        offset = 0
+        if state is not None and os.path.exists(part_path):
+            offset = os.path.getsize(part_path)
+            log.debug("Resume Download! {} from {} bytes".format(
+                source_path, offset))
+        else:
+            self.set_transfer_state("Download", source_path, target_path,
+                                    {}, source_stat)
+
+        progress = self.get_progress_callback(server, collection, file,
+                                              representation, site,
+                                              "Download")
+        total_size = int(remote_file.get("size") or 0)
+        chunk_size = self.get_chunk_size()
+        with open(part_path, "ab" if offset else "wb") as fh:
+            failed_chunks = 0
+            while offset < total_size:
+                progress(offset, total_size)
+                end = min(offset + chunk_size.chunk_size, total_size) - 1
+                request = self.service.files().get_media(
+                    fileId=remote_file["id"], supportsAllDrives=True
+                )
+                # continue after bytes of previous attempt
+                request.headers["range"] = "bytes={}-{}".format(offset, end)
+                start = time.time()
+                try:
+                    content = request.execute_chunk(
+                        num_retries=self.CHUNK_RETRIES
+                    )
+                except (IOError, OSError, httplib2.HttpLib2Error):
+                    failed_chunks += 1
+                    if failed_chunks > self.CHUNK_RETRIES:
+                        raise
+                    log.warning("Download of chunk failed, retrying.",
+                                exc_info=True)
+                    chunk_size.failed()
+                    continue
+
+                if not content or len(content) > end - offset + 1:
+                    raise IOError((
+                        "Downloaded {} bytes of {}, expected range {}-{}"
+                    ).format(len(content), source_path, offset, end))
+
+                fh.write(content)
+                fh.flush()
+                offset += len(content)
+                chunk_size.record(len(content), time.time() - start)
+
+        os.replace(part_path, target_path)
+        self.remove_transfer_state("Download", source_path, target_path)
         return target_name
 
     def delete_folder(self, path, force=False):
@@ -395,25 +615,7 @@ class GDriveHandler(AbstractProvider):
         Returns:
             (list) of dictionaries('id', 'name', [parents])
         """
-        folders = []
-        page_token = None
-        fields = 'nextPageToken, files(id, name, parents)'
-        while True:
-            q = self._handle_q("mimeType='application/vnd.google-apps.folder'")
-            response = self.service.files().list(
-                q=q,
-                pageSize=1000,
-                corpora="allDrives",
-                includeItemsFromAllDrives=True,
-                supportsAllDrives=True,
-                fields=fields,
-                pageToken=page_token).execute()
-            folders.extend(response.get('files', []))
-            page_token = response.get('nextPageToken', None)
-            if page_token is None:
-                break
-
-        return folders
+        return list_drive_folders(self.service)
 
     def list_files(self):
         """ Lists all files in GDrive
@@ -596,8 +798,8 @@ class GDriveHandler(AbstractProvider):
         """
             Create in-memory structure resolving paths to folder id as
             recursive querying might be slower.
-            Initialized in the time of class initialization.
-            Maybe should be persisted
+            Folders are persisted and updated incrementally, see
+            'get_tree'.
             Tree is structure of path to id:
                 '/ROOT': {'id': '1234567'}
                 '/ROOT/PROJECT_FOLDER': {'id':'222222'}
@@ -607,60 +809,7 @@ class GDriveHandler(AbstractProvider):
         Returns:
             (dictionary) path as a key, folder id as a value
         """
-        log.debug("build_tree len {}".format(len(folders)))
-        root_ids = []
-        default_root_id = None
-        tree = {}
-        ending_by = {}
-        for root_name, root in self.root.items():  # might be multiple roots
-            if root["id"] not in root_ids:
-                tree["/" + root_name] = {"id": root["id"]}
-                ending_by[root["id"]] = "/" + root_name
-                root_ids.append(root["id"])
-
-                if self.MY_DRIVE_STR == root_name:
-                    default_root_id = root["id"]
-
-        no_parents_yet = {}
-        while folders:
-            folder = folders.pop(0)
-            parents = folder.get("parents", [])
-            # weird cases, shared folders, etc, parent under root
-            if not parents:
-                parent = default_root_id
-            else:
-                parent = parents[0]
-
-            if folder["id"] in root_ids:  # do not process root
-                continue
-
-            if parent in ending_by:
-                path_key = ending_by[parent] + "/" + folder["name"]
-                ending_by[folder["id"]] = path_key
-                tree[path_key] = {"id": folder["id"]}
-            else:
-                no_parents_yet.setdefault(parent, []).append((folder["id"],
-                                                              folder["name"]))
-        loop_cnt = 0
-        # break if looped more then X times - safety against infinite loop
-        while no_parents_yet and loop_cnt < 20:
-
-            keys = list(no_parents_yet.keys())
-            for parent in keys:
-                if parent in ending_by.keys():
-                    subfolders = no_parents_yet.pop(parent)
-                    for folder_id, folder_name in subfolders:
-                        path_key = ending_by[parent] + "/" + folder_name
-                        ending_by[folder_id] = path_key
-                        tree[path_key] = {"id": folder_id}
-            loop_cnt += 1
-
-        if len(no_parents_yet) > 0:
-            log.debug("Some folders path are not resolved {}".
-                      format(no_parents_yet))
-            log.debug("Remove deleted folders from trash.")
-
-        return tree
+        return build_folder_tree(self.root, folders)
 
     def _get_folder_metadata(self, path):
         """
@@ -0,0 +1,431 @@
+"""Persistent tree of Google Drive folders.
+
+Listing of all folders on large drives takes long time and uses API quota.
+Folders are stored in SQLite database per site in OpenPype's user data
+directory and only changes since last run are queried with Drive changes
+feed ('changes().list' with page token).
+"""
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+
+import appdirs
+
+from openpype.lib import PypeLogger
+
+log = PypeLogger().get_logger("SyncServer")
+
+FOLDER_STR = 'application/vnd.google-apps.folder'
+MY_DRIVE_STR = 'My Drive'  # name of root folder of regular Google drive
+
+
+def list_drive_folders(service):
+    """Lists all not trashed folders in GDrive.
+
+    Args:
+        service: Drive API v3 service.
+
+    Returns:
+        (list) of dictionaries('id', 'name', [parents])
+    """
+    folders = []
+    page_token = None
+    fields = 'nextPageToken, files(id, name, parents)'
+    while True:
+        response = service.files().list(
+            q="mimeType='{}' and trashed = false".format(FOLDER_STR),
+            pageSize=1000,
+            corpora="allDrives",
+            includeItemsFromAllDrives=True,
+            supportsAllDrives=True,
+            fields=fields,
+            pageToken=page_token).execute()
+        folders.extend(response.get('files', []))
+        page_token = response.get('nextPageToken', None)
+        if page_token is None:
+            break
+
+    return folders
+
+
+def build_folder_tree(roots, folders):
+    """
+        Create structure resolving paths to folder id.
+
+        Tree is structure of path to id:
+            '/ROOT': {'id': '1234567'}
+            '/ROOT/PROJECT_FOLDER': {'id':'222222'}
+            '/ROOT/PROJECT_FOLDER/Assets': {'id': '3434545'}
+    Args:
+        roots (dict): root name to root metadata with 'id'
+        folders (list): list of dictionaries with folder metadata
+    Returns:
+        (dictionary) path as a key, folder id as a value
+    """
+    log.debug("build_tree len {}".format(len(folders)))
+    root_ids = []
+    default_root_id = None
+    tree = {}
+    ending_by = {}
+    for root_name, root in roots.items():  # might be multiple roots
+        if root["id"] not in root_ids:
+            tree["/" + root_name] = {"id": root["id"]}
+            ending_by[root["id"]] = "/" + root_name
+            root_ids.append(root["id"])
+
+            if MY_DRIVE_STR == root_name:
+                default_root_id = root["id"]
+
+    no_parents_yet = {}
+    for folder in folders:
+        parents = folder.get("parents", [])
+        # weird cases, shared folders, etc, parent under root
+        if not parents:
+            parent = default_root_id
+        else:
+            parent = parents[0]
+
+        if folder["id"] in root_ids:  # do not process root
+            continue
+
+        if parent in ending_by:
+            path_key = ending_by[parent] + "/" + folder["name"]
+            ending_by[folder["id"]] = path_key
+            tree[path_key] = {"id": folder["id"]}
+        else:
+            no_parents_yet.setdefault(parent, []).append((folder["id"],
+                                                          folder["name"]))
+
+    # resolve folders listed before their parents
+    parents_to_process = [
+        parent for parent in no_parents_yet if parent in ending_by
+    ]
+    while parents_to_process:
+        parent = parents_to_process.pop()
+        for folder_id, folder_name in no_parents_yet.pop(parent, []):
+            path_key = ending_by[parent] + "/" + folder_name
+            ending_by[folder_id] = path_key
+            tree[path_key] = {"id": folder_id}
+            if folder_id in no_parents_yet:
+                parents_to_process.append(folder_id)
+
+    if len(no_parents_yet) > 0:
+        log.debug("Some folders path are not resolved {}".
+                  format(no_parents_yet))
+        log.debug("Remove deleted folders from trash.")
+
+    return tree
+
+
+class GDriveFolderTree(object):
+    """
+        Folders of one GDrive site persisted in SQLite database.
+
+        First use lists all folders and stores start page token of changes
+        feed, next uses only apply changes since stored token. Changes are
+        queried at most once per 'changes_interval' seconds.
+
+        Thread safe, single instance per site should be used, see
+        'get_folder_tree'.
+
+    Args:
+        site_name (string): name of site, used for database file name
+        db_path (string): path to database, user data directory by default
+    """
+    # how often query changes feed (seconds)
+    changes_interval = 30
+    changes_fields = (
+        "nextPageToken, newStartPageToken, changes(fileId, removed,"
+        " file(id, name, parents, mimeType, trashed))"
+    )
+
+    def __init__(self, site_name, db_path=None):
+        if db_path is None:
+            db_path = os.path.join(
+                appdirs.user_data_dir("openpype", "pypeclub"),
+                "sync_server",
+                "gdrive_{}.db".format(re.sub(r"[^\w\-]", "_", site_name))
+            )
+        self.site_name = site_name
+        self.db_path = db_path
+
+        self._lock = threading.RLock()
+        self._connection = None
+        self._folders = None
+        self._roots = None
+        self._tree = None
+        self._last_changes_check = None
+
+    def get_tree(self, service, roots):
+        """
+            Path to folder id mapping, updated with changes on drive.
+
+        Args:
+            service: Drive API v3 service.
+            roots (dict): root name to root metadata with 'id'
+        Returns:
+             (dictionary) - url to id mapping
+        """
+        with self._lock:
+            if self._folders is None:
+                self._load()
+
+            roots_value = json.dumps(
+                {name: root["id"] for name, root in roots.items()},
+                sort_keys=True
+            )
+            page_token = self._get_meta("page_token")
+            if page_token is None or self._get_meta("roots") != roots_value:
+                self._full_sync(service, roots_value)
+
+            elif self._should_check_changes():
+                if not self._apply_changes(service, page_token):
+                    self._full_sync(service, roots_value)
+
+            if self._tree is None or self._roots != roots:
+                self._roots = roots
+                self._tree = build_folder_tree(
+                    roots, list(self._iter_folder_items())
+                )
+            return self._tree
+
+    def add_folder(self, folder_id, name, parent_id, path=None):
+        """
+            Store folder created by this process.
+
+            Changes feed would report the folder later, storing it right
+            away makes it available immediately.
+
+        Args:
+            folder_id (string): id of created folder
+            name (string): name of folder
+            parent_id (string): id of parent folder
+            path (string): path of folder in tree
+        """
+        with self._lock:
+            if self._folders is None:
+                self._load()
+            self._set_folders([(folder_id, name, parent_id)])
+            if self._tree is not None and path:
+                self._tree[path] = {"id": folder_id}
+
+    def reset(self):
+        """Remove stored folders, next 'get_tree' lists all folders."""
+        with self._lock:
+            if self._folders is None:
+                self._load()
+            connection = self._get_connection()
+            with connection:
+                connection.execute("DELETE FROM folders")
+                connection.execute("DELETE FROM meta")
+            self._folders = {}
+            self._tree = None
+            self._last_changes_check = None
+
+    def _get_connection(self):
+        if self._connection is None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+
+            # access is guarded by lock, connection is shared by threads
+            connection = sqlite3.connect(
+                self.db_path, timeout=30, check_same_thread=False
+            )
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS folders ("
+                    " id TEXT PRIMARY KEY,"
+                    " name TEXT NOT NULL,"
+                    " parent TEXT"
+                    ")"
+                )
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS meta ("
+                    " key TEXT PRIMARY KEY,"
+                    " value TEXT NOT NULL"
+                    ")"
+                )
+            self._connection = connection
+        return self._connection
+
+    def _load(self):
+        connection = self._get_connection()
+        self._folders = {
+            folder_id: (name, parent)
+            for folder_id, name, parent in connection.execute(
+                "SELECT id, name, parent FROM folders"
+            )
+        }
+        log.debug("Loaded {} stored folders of {}".format(
+            len(self._folders), self.site_name
+        ))
+
+    def _get_meta(self, key):
+        row = self._get_connection().execute(
+            "SELECT value FROM meta WHERE key=?", (key, )
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def _set_meta(self, connection, key, value):
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (key, value)
+        )
+
+    def _set_folders(self, items):
+        connection = self._get_connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO folders (id, name, parent)"
+                " VALUES (?, ?, ?)",
+                items
+            )
+        for folder_id, name, parent in items:
+            self._folders[folder_id] = (name, parent)
+
+    def _iter_folder_items(self):
+        for folder_id, (name, parent) in self._folders.items():
+            folder = {"id": folder_id, "name": name}
+            if parent:
+                folder["parents"] = [parent]
+            yield folder
+
+    def _should_check_changes(self):
+        if self._last_changes_check is None:
+            return True
+        return time.time() - self._last_changes_check > self.changes_interval
+
+    def _full_sync(self, service, roots_value):
+        """List all folders and store page token of changes feed."""
+        log.debug("Listing all folders of {}".format(self.site_name))
+        # token is queried before listing so no change is missed
+        page_token = service.changes().getStartPageToken(
+            supportsAllDrives=True).execute()["startPageToken"]
+        folders = list_drive_folders(service)
+
+        items = []
+        for folder in folders:
+            parents = folder.get("parents") or [None]
+            items.append((folder["id"], folder["name"], parents[0]))
+
+        connection = self._get_connection()
+        with connection:
+            connection.execute("DELETE FROM folders")
+            connection.executemany(
+                "INSERT OR REPLACE INTO folders (id, name, parent)"
+                " VALUES (?, ?, ?)",
+                items
+            )
+            self._set_meta(connection, "page_token", page_token)
+            self._set_meta(connection, "roots", roots_value)
+
+        self._folders = {
+            folder_id: (name, parent)
+            for folder_id, name, parent in items
+        }
+        self._tree = None
+        self._last_changes_check = time.time()
+
+    def _apply_changes(self, service, page_token):
+        """
+            Apply changes of folders since 'page_token'.
+
+        Returns:
+            (boolean) False if changes couldn't be applied (e.g. expired
+                token) and all folders must be listed again
+        """
+        to_set = []
+        to_remove = set()
+        new_token = None
+        try:
+            while page_token:
+                response = service.changes().list(
+                    pageToken=page_token,
+                    pageSize=1000,
+                    includeItemsFromAllDrives=True,
+                    supportsAllDrives=True,
+                    fields=self.changes_fields).execute()
+                for change in response.get("changes", []):
+                    file_id = change.get("fileId")
+                    # changes of shared drives itself
+                    if not file_id:
+                        continue
+
+                    file = change.get("file")
+                    if (
+                        change.get("removed")
+                        or not file
+                        or file.get("trashed")
+                    ):
+                        to_remove.add(file_id)
+
+                    elif file.get("mimeType") == FOLDER_STR:
+                        to_remove.discard(file_id)
+                        to_set.append((
+                            file_id,
+                            file["name"],
+                            (file.get("parents") or [None])[0]
+                        ))
+
+                new_token = response.get("newStartPageToken")
+                page_token = response.get("nextPageToken")
+
+        except Exception:
+            log.warning(
+                "Changes of {} couldn't be queried".format(self.site_name),
+                exc_info=True
+            )
+            return False
+
+        self._last_changes_check = time.time()
+        if new_token is None:
+            return False
+
+        to_set = [item for item in to_set if item[0] not in to_remove]
+        to_remove = [
+            folder_id for folder_id in to_remove if folder_id in self._folders
+        ]
+        connection = self._get_connection()
+        with connection:
+            connection.executemany(
+                "DELETE FROM folders WHERE id=?",
+                [(folder_id, ) for folder_id in to_remove]
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO folders (id, name, parent)"
+                " VALUES (?, ?, ?)",
+                to_set
+            )
+            self._set_meta(connection, "page_token", new_token)
+
+        for folder_id in to_remove:
+            self._folders.pop(folder_id, None)
+        for folder_id, name, parent in to_set:
+            self._folders[folder_id] = (name, parent)
+
+        if to_set or to_remove:
+            log.debug("Applied {} changed and {} removed folders of {}".format(
+                len(to_set), len(to_remove), self.site_name
+            ))
+            self._tree = None
+        return True
+
+
+_FOLDER_TREES = {}
+_FOLDER_TREES_LOCK = threading.Lock()
+
+
+def get_folder_tree(site_name):
+    """Shared persistent folder tree of site."""
+    with _FOLDER_TREES_LOCK:
+        folder_tree = _FOLDER_TREES.get(site_name)
+        if folder_tree is None:
+            folder_tree = GDriveFolderTree(site_name)
+            _FOLDER_TREES[site_name] = folder_tree
+    return folder_tree
@@ -1,49 +1,137 @@
 from __future__ import print_function
 import os.path
+import sys
+import errno
 import shutil
-import threading
 import time
 
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+
 from openpype.api import Logger, Anatomy
+from openpype.lib import FileTransfers
 from .abstract_provider import AbstractProvider
 
 log = Logger().get_logger("SyncServer")
 
+# ioctl request cloning content of file (reflink) on Linux (btrfs, xfs...)
+FICLONE = 0x40049409
+# errors of zero-copy calls which are not supported by file system
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    getattr(errno, "ENOTSUP", errno.EOPNOTSUPP)
+}
+
+
+def clone_file(src_fd, dst_fd):
+    """
+        Clone content of source file to destination file (reflink).
+
+        Cloned file shares data blocks with source until one of them is
+        modified (copy on write), so copy is instant.
+
+    Returns:
+        (boolean) file was cloned, False if file system doesn't support it
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    except (IOError, OSError) as exc:
+        if exc.errno in UNSUPPORTED_ERRNOS:
+            return False
+        raise
+    return True
+
+
+def _copy_file_range(src_fd, dst_fd, offset, count):
+    # copy is done in kernel (or by server on NFS 4.2 and SMB)
+    return os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+
+
+def _sendfile(src_fd, dst_fd, offset, count):
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    return os.sendfile(dst_fd, src_fd, offset, count)
+
+
+def _read_write(src_fd, dst_fd, offset, count):
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    data = os.read(src_fd, count)
+    view = memoryview(data)
+    written = 0
+    while written < len(data):
+        written += os.write(dst_fd, view[written:])
+    return len(data)
+
+
+def get_copy_functions():
+    """
+        Functions copying chunk of file available on current platform.
+
+        Functions are sorted from fastest, each of them is called with
+        source and destination file descriptors, offset and count of bytes
+        and returns count of copied bytes.
+    Returns:
+        (list)
+    """
+    functions = []
+    if hasattr(os, "copy_file_range"):
+        functions.append(_copy_file_range)
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        functions.append(_sendfile)
+    functions.append(_read_write)
+    return functions
+
 
 class LocalDriveHandler(AbstractProvider):
     """ Handles required operations on mounted disks with OS """
+    # all files of representation are copied at once on pool of threads
+    BATCH_TRANSFERS = True
+    # used when 'copy_workers' is not set in site settings
+    DEFAULT_COPY_WORKERS = 8
+
     def __init__(self, project_name, site_name, tree=None, presets=None):
         self.presets = None
         self.active = False
         self.project_name = project_name
         self.site_name = site_name
+        self.presets = presets or {}
 
         self.active = self.is_active()
 
     def is_active(self):
         return True
 
+    def get_copy_workers(self):
+        """
+            Return count of threads copying files of single representation.
+
+            Value is taken from 'copy_workers' of site settings.
+        Returns:
+            (int)
+        """
+        return max(int(self.presets.get("copy_workers") or
+                       self.DEFAULT_COPY_WORKERS), 1)
+
     def upload_file(self, source_path, target_path,
                     server, collection, file, representation, site,
                     overwrite=False, direction="Upload"):
         """
             Copies file from 'source_path' to 'target_path'
         """
-        if not os.path.isfile(source_path):
-            raise FileNotFoundError("Source file {} doesn't exist."
-                                    .format(source_path))
-        if overwrite:
-            thread = threading.Thread(target=self._copy,
-                                      args=(source_path, target_path))
-            thread.start()
-            self._mark_progress(collection, file, representation, server,
-                                site, source_path, target_path, direction)
-        else:
-            if os.path.exists(target_path):
-                raise ValueError("File {} exists, set overwrite".
-                                 format(target_path))
-
-        return os.path.basename(target_path)
+        progress = self.get_progress_callback(server, collection, file,
+                                              representation, site,
+                                              direction)
+        return self._copy_file(source_path, target_path, progress,
+                               overwrite, direction)
 
     def download_file(self, source_path, local_path,
                       server, collection, file, representation, site,
@@ -55,6 +143,36 @@ class LocalDriveHandler(AbstractProvider):
                                 server, collection, file, representation, site,
                                 overwrite, direction="Download")
 
+    def transfer_files(self, transfers, overwrite=False, direction="Upload"):
+        """
+            Copies multiple files (e.g. image sequence of representation)
+            on bounded pool of threads (see 'get_copy_workers').
+
+        Args:
+            transfers (list): of tuples (source_path, target_path, progress)
+            overwrite (boolean): replace existing files
+            direction (string): "Upload" or "Download"
+        Returns:
+            (list) name of copied file or exception for each transfer
+        """
+        def _transfer(transfer):
+            source_path, target_path, progress = transfer
+            try:
+                return self._copy_file(source_path, target_path, progress,
+                                       overwrite, direction)
+            except Exception as exc:
+                log.debug("Copy of {} failed".format(source_path),
+                          exc_info=True)
+                return exc
+
+        file_transfers = FileTransfers(workers=self.get_copy_workers(),
+                                       logger=log)
+        start = time.time()
+        results = file_transfers.process_files(_transfer, transfers)
+        log.debug("{}ed {} files in {:.2f}s".format(
+            direction, len(transfers), time.time() - start))
+        return [result for _transfer, result in results]
+
     def delete_file(self, path):
         """
             Deletes a file at 'path'
@@ -122,35 +240,93 @@ class LocalDriveHandler(AbstractProvider):
         """
         pass
 
-    def _copy(self, source_path, target_path):
-        print("copying {}->{}".format(source_path, target_path))
-        shutil.copy(source_path, target_path)
-
-    def _mark_progress(self, collection, file, representation, server, site,
-                       source_path, target_path, direction):
-        """
-            Updates progress field in DB by values 0-1.
-
-            Compares file sizes of source and target.
-        """
-        source_file_size = os.path.getsize(source_path)
-        target_file_size = 0
-        last_tick = status_val = None
-        while source_file_size != target_file_size:
-            if not last_tick or \
-                    time.time() - last_tick >= server.LOG_PROGRESS_SEC:
-                status_val = target_file_size / source_file_size
-                last_tick = time.time()
-                log.debug(direction + "ed %d%%." % int(status_val * 100))
-                server.update_db(collection=collection,
-                                 new_file_id=None,
-                                 file=file,
-                                 representation=representation,
-                                 site=site,
-                                 progress=status_val
-                                 )
-            target_file_size = os.path.getsize(target_path)
-            time.sleep(0.5)
+    def _copy_file(self, source_path, target_path, progress=None,
+                   overwrite=False, direction="Upload"):
+        if not os.path.isfile(source_path):
+            raise FileNotFoundError("Source file {} doesn't exist."
+                                    .format(source_path))
+        if not overwrite and os.path.exists(target_path):
+            raise ValueError("File {} exists, set overwrite".
+                             format(target_path))
+
+        self._copy(source_path, target_path, progress, direction)
+        return os.path.basename(target_path)
+
+    def _copy(self, source_path, target_path, progress=None,
+              direction="Upload"):
+        """
+            Copies file in chunks, reports copied bytes to 'progress'.
+
+            File is cloned (reflink) when file system supports it, otherwise
+            copied with fastest available zero-copy call (copy_file_range,
+            sendfile) with fallback to read/write. Modification time of
+            source is preserved for later verification.
+
+            File is copied to temporary file first, copying of the file which
+            failed previously continues from already copied bytes.
+        """
+        log.debug("copying {}->{}".format(source_path, target_path))
+        part_path = target_path + ".part"
+        source_stat = self.get_file_stat(source_path)
+        total_size = source_stat[0]
+        resumable = total_size >= self.RESUMABLE_MIN_SIZE
+        state = None
+        if resumable:
+            state = self.get_transfer_state(direction, source_path,
+                                            target_path, source_stat)
+        offset = 0
+        if state is not None and os.path.exists(part_path):
+            offset = min(os.path.getsize(part_path), total_size)
+        elif resumable:
+            self.set_transfer_state(direction, source_path, target_path,
+                                    {}, source_stat)
+
+        chunk_size = self.get_chunk_size()
+        copy_functions = get_copy_functions()
+        with open(source_path, "rb") as src_stream:
+            with open(part_path, "r+b" if offset else "wb") as dst_stream:
+                dst_stream.truncate(offset)
+                src_fd = src_stream.fileno()
+                dst_fd = dst_stream.fileno()
+                if not offset and total_size and clone_file(src_fd, dst_fd):
+                    offset = total_size
+
+                while offset < total_size:
+                    if progress is not None:
+                        progress(offset, total_size)
+                    start = time.time()
+                    try:
+                        copied = copy_functions[0](
+                            src_fd, dst_fd, offset, chunk_size.chunk_size
+                        )
+                    except (IOError, OSError) as exc:
+                        if (
+                            exc.errno not in UNSUPPORTED_ERRNOS
+                            or len(copy_functions) == 1
+                        ):
+                            raise
+                        copy_functions.pop(0)
+                        continue
+
+                    if not copied:
+                        # some file systems report 0 bytes instead of error
+                        if len(copy_functions) == 1:
+                            break
+                        copy_functions.pop(0)
+                        continue
+                    offset += copied
+                    chunk_size.record(copied, time.time() - start)
+
+        if offset != total_size:
+            raise IOError("Copied {} of {} bytes of {}".format(
+                offset, total_size, source_path))
+
+        stat = os.stat(source_path)
+        shutil.copymode(source_path, part_path)
+        os.utime(part_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(part_path, target_path)
+        if resumable:
+            self.remove_transfer_state(direction, source_path, target_path)
 
     def _normalize_site_name(self, site_name):
         """Transform user id to 'local' for Local settings"""
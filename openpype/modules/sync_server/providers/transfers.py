@@ -0,0 +1,271 @@
+"""Helpers for resumable chunked transfers of providers.
+
+State of unfinished transfers (e.g. upload session of GDrive or size of
+partially copied file) is persisted in SQLite database in OpenPype's user
+data directory, so failed transfer continues from last transferred chunk in
+next sync loop, even after restart of tray.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+
+import appdirs
+
+from openpype.lib import PypeLogger
+
+log = PypeLogger().get_logger("SyncServer")
+
+
+class TransferSessions(object):
+    """
+        Persisted state of unfinished transfers.
+
+        State is stored with size and modification time of source file and
+        is not returned when source file changed.
+
+    Args:
+        db_path (string): path to database, user data directory by default
+    """
+    db_filename = "transfers.db"
+    # sessions older than this are not resumed (GDrive session URI is valid
+    #   for one week)
+    max_age = 6 * 24 * 60 * 60
+
+    def __init__(self, db_path=None):
+        if db_path is None:
+            db_path = os.path.join(
+                appdirs.user_data_dir("openpype", "pypeclub"),
+                "sync_server",
+                self.db_filename
+            )
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _get_connection(self):
+        if self._connection is None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+
+            # access is guarded by lock, connection is shared by threads
+            connection = sqlite3.connect(
+                self.db_path, timeout=30, check_same_thread=False
+            )
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS sessions ("
+                    " key TEXT PRIMARY KEY,"
+                    " source_stat TEXT NOT NULL,"
+                    " state TEXT NOT NULL,"
+                    " updated REAL NOT NULL"
+                    ")"
+                )
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def get_key(site_name, direction, source_path, target_path):
+        return json.dumps([site_name, direction, source_path, target_path])
+
+    def get(self, key, source_stat=None):
+        """
+            Stored state of transfer.
+
+        Args:
+            key (string): key of transfer created by 'get_key'
+            source_stat (list): values identifying version of source file
+        Returns:
+            (dict) state or None if there is no valid state
+        """
+        with self._lock:
+            row = self._get_connection().execute(
+                "SELECT source_stat, state, updated FROM sessions"
+                " WHERE key=?",
+                (key, )
+            ).fetchone()
+        if row is None:
+            return None
+
+        stored_stat, state, updated = row
+        if (
+            json.loads(stored_stat) != source_stat
+            or time.time() - updated > self.max_age
+        ):
+            self.remove(key)
+            return None
+        return json.loads(state)
+
+    def set(self, key, state, source_stat=None):
+        """Store state of transfer."""
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO sessions"
+                    " (key, source_stat, state, updated) VALUES (?, ?, ?, ?)",
+                    (
+                        key,
+                        json.dumps(source_stat),
+                        json.dumps(state),
+                        time.time()
+                    )
+                )
+
+    def remove(self, key):
+        """Remove state of finished or invalid transfer."""
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute("DELETE FROM sessions WHERE key=?", (key, ))
+
+    def prune(self):
+        """Remove states of transfers which can't be resumed anymore.
+
+        Returns:
+            (int) count of removed states
+        """
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                cursor = connection.execute(
+                    "DELETE FROM sessions WHERE updated<?",
+                    (time.time() - self.max_age, )
+                )
+        return cursor.rowcount
+
+
+_TRANSFER_SESSIONS = None
+_TRANSFER_SESSIONS_LOCK = threading.Lock()
+
+
+def get_transfer_sessions():
+    """Shared persisted states of transfers."""
+    global _TRANSFER_SESSIONS
+    if _TRANSFER_SESSIONS is None:
+        with _TRANSFER_SESSIONS_LOCK:
+            if _TRANSFER_SESSIONS is None:
+                _TRANSFER_SESSIONS = TransferSessions()
+                _TRANSFER_SESSIONS.prune()
+    return _TRANSFER_SESSIONS
+
+
+class AdaptiveChunkSize(object):
+    """
+        Chunk size adapted to throughput of connection.
+
+        Chunk size is doubled when chunk was transferred faster than
+        'target_duration' and halved when it took more than twice longer or
+        when transfer of chunk failed. Fast connections use less requests,
+        slow or unstable connections (VPN) lose less data on failure.
+
+    Args:
+        initial (int): first chunk size in bytes
+        minimum (int): smallest chunk size
+        maximum (int): largest chunk size
+        multiple (int): chunk size is always multiple of this value (e.g.
+            GDrive requires multiples of 256KB)
+        target_duration (float): ideal duration of chunk transfer (seconds)
+    """
+    def __init__(self, initial, minimum=None, maximum=None, multiple=1,
+                 target_duration=5):
+        self.multiple = multiple
+        self.minimum = self._round(minimum or initial)
+        self.maximum = self._round(maximum or initial)
+        self.target_duration = target_duration
+        self.chunk_size = min(
+            max(self._round(initial), self.minimum), self.maximum
+        )
+
+    def _round(self, value):
+        return max(int(value) // self.multiple, 1) * self.multiple
+
+    def record(self, transferred, duration):
+        """
+            Update chunk size by duration of finished chunk transfer.
+
+        Args:
+            transferred (int): bytes transferred by chunk
+            duration (float): seconds
+        Returns:
+            (int) new chunk size
+        """
+        # last chunk of file might be smaller, don't use it
+        if transferred < self.chunk_size:
+            return self.chunk_size
+
+        if duration < self.target_duration:
+            self.chunk_size = min(self.chunk_size * 2, self.maximum)
+        elif duration > self.target_duration * 2:
+            self.chunk_size = max(
+                self._round(self.chunk_size // 2), self.minimum
+            )
+        return self.chunk_size
+
+    def failed(self):
+        """Decrease chunk size after failed chunk transfer."""
+        self.chunk_size = max(self._round(self.chunk_size // 2), self.minimum)
+        return self.chunk_size
+
+
+class TransferProgress(object):
+    """
+        Progress callback of transfer reporting transferred bytes.
+
+        Writes progress to DB at most once per 'server.LOG_PROGRESS_SEC' and
+        raises ValueError when representation was paused.
+
+    Args:
+        server (SyncServerModule): server instance to call update_db on
+        collection (str): name of collection
+        file (dict): info about transferred file
+        representation (dict): complete repre containing 'file'
+        site (str): site name
+        direction (str): "Upload" or "Download" for logging
+    """
+    def __init__(self, server, collection, file, representation, site,
+                 direction="Upload"):
+        self.server = server
+        self.collection = collection
+        self.file = file
+        self.representation = representation
+        self.site = site
+        self.direction = direction
+        self._last_tick = None
+
+    def __call__(self, transferred, total_size):
+        """
+            Report transferred bytes.
+
+        Args:
+            transferred (int): bytes transferred so far
+            total_size (int): size of file
+        """
+        if self.server.is_representation_paused(
+                self.representation['_id'],
+                check_parents=True,
+                project_name=self.collection):
+            raise ValueError("Paused during process, please redo.")
+
+        if (
+            self._last_tick is not None
+            and time.time() - self._last_tick < self.server.LOG_PROGRESS_SEC
+        ):
+            return
+
+        self._last_tick = time.time()
+        status_val = 0
+        if total_size:
+            status_val = float(transferred) / total_size
+        log.debug("{}ed {} of {} bytes ({}%).".format(
+            self.direction, transferred, total_size, int(status_val * 100)
+        ))
+        self.server.update_db(collection=self.collection,
+                              new_file_id=None,
+                              file=self.file,
+                              representation=self.representation,
+                              site=self.site,
+                              progress=status_val
+                              )
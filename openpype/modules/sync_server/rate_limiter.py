@@ -0,0 +1,306 @@
+"""Rate limiting and adaptive concurrency of transfers per site.
+
+Each remote site has single 'SiteRateLimiter' shared by all provider
+instances. Provider acquires token before each API request, so requests are
+spread evenly up to configured rate instead of bursts followed by long
+stalls after quota was hit. Count of files transferred in parallel is
+adjusted with AIMD (additive increase, multiplicative decrease) by observed
+errors and latency of requests.
+"""
+import time
+import threading
+
+from openpype.lib import PypeLogger
+
+
+log = PypeLogger().get_logger("SyncServer")
+
+
+class ProviderThrottled(Exception):
+    """Provider refused request because quota was exceeded.
+
+    Transfer should be retried later and not counted as failed attempt.
+    """
+
+
+class TokenBucket(object):
+    """
+        Thread safe token bucket.
+
+    Args:
+        rate (float): tokens added per second, 0 disables limiting
+        capacity (float): maximum tokens stored (allowed burst)
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(rate, 1))
+        self._tokens = self.capacity
+        self._last_refill = time.time()
+        self._blocked_until = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if now < self._blocked_until:
+            self._last_refill = now
+            return
+        elapsed = now - max(self._last_refill, self._blocked_until)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def get_wait_time(self, tokens=1):
+        """Seconds until 'tokens' could be acquired, consumes them if 0."""
+        if not self.rate:
+            return 0
+
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        """Block until 'tokens' are available and consume them.
+
+        Returns:
+            (float) seconds spent waiting
+        """
+        waited = 0
+        while True:
+            wait_time = self.get_wait_time(tokens)
+            if not wait_time:
+                return waited
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def block(self, seconds):
+        """No tokens are given for 'seconds' (e.g. after quota was hit)."""
+        with self._lock:
+            self._tokens = 0
+            self._blocked_until = max(
+                self._blocked_until, time.time() + seconds
+            )
+
+
+class AdaptiveConcurrency(object):
+    """
+        AIMD limit of transfers running in parallel.
+
+        Limit grows by 1 after each 'limit' successful requests with
+        acceptable latency and is halved on throttling or error (at most once
+        per 'decrease_interval'). Latency is acceptable when it is lower than
+        'latency_ratio' times the lowest observed latency.
+
+    Args:
+        maximum (int): upper limit of parallel transfers
+        minimum (int): lower limit of parallel transfers
+    """
+    decrease_factor = 0.5
+    decrease_interval = 5
+    latency_ratio = 3.0
+
+    def __init__(self, maximum, minimum=1):
+        self.maximum = max(int(maximum), 1)
+        self.minimum = min(max(int(minimum), 1), self.maximum)
+        self._limit = float(self.maximum)
+        self._in_flight = 0
+        self._base_latency = None
+        self._last_decrease = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def set_maximum(self, maximum):
+        with self._lock:
+            self.maximum = max(int(maximum), 1)
+            self.minimum = min(self.minimum, self.maximum)
+            self._limit = min(self._limit, self.maximum)
+
+    def on_success(self, latency=None):
+        with self._lock:
+            if latency is not None:
+                if self._base_latency is None or latency < self._base_latency:
+                    self._base_latency = latency
+                else:
+                    # let baseline follow slowly changed conditions
+                    self._base_latency += (
+                        (latency - self._base_latency) * 0.01
+                    )
+
+                if latency > self._base_latency * self.latency_ratio:
+                    self._decrease()
+                    return
+
+            self._limit = min(self._limit + 1.0 / self._limit, self.maximum)
+
+    def on_error(self):
+        with self._lock:
+            self._decrease()
+
+    def _decrease(self):
+        now = time.time()
+        if now - self._last_decrease < self.decrease_interval:
+            return
+        self._last_decrease = now
+        self._limit = max(self._limit * self.decrease_factor, self.minimum)
+
+    def try_acquire(self):
+        """Start transfer if count of running transfers is lower than limit.
+
+        Returns:
+            (bool) transfer can start, 'release' must be called after it
+        """
+        with self._lock:
+            if self._in_flight < self.limit:
+                self._in_flight += 1
+                return True
+            return False
+
+    def release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+
+class SiteRateLimiter(object):
+    """
+        Rate limiter and concurrency of single site.
+
+    Args:
+        site_name (string): name of site
+        requests_per_second (float): allowed rate of API requests, 0 means
+            unlimited
+        max_parallel_transfers (int): upper limit of parallel transfers
+    """
+    # longest delay after repeated throttling
+    max_backoff = 60
+
+    def __init__(self, site_name, requests_per_second=0,
+                 max_parallel_transfers=3):
+        self.site_name = site_name
+        self.bucket = TokenBucket(requests_per_second)
+        self.concurrency = AdaptiveConcurrency(max_parallel_transfers)
+        self._backoff = 0
+        self._throttled_count = 0
+        self._error_count = 0
+        self._last_throttled = None
+        self._waited = 0
+        self._lock = threading.Lock()
+
+    def configure(self, requests_per_second, max_parallel_transfers):
+        """Update limits from settings, keeps current state."""
+        if float(requests_per_second) != self.bucket.rate:
+            self.bucket = TokenBucket(requests_per_second)
+        self.concurrency.set_maximum(max_parallel_transfers)
+
+    def acquire(self):
+        """Block until request could be sent."""
+        waited = self.bucket.acquire()
+        if waited:
+            with self._lock:
+                self._waited += waited
+
+    def record_success(self, latency=None):
+        """Request finished successfully in 'latency' seconds."""
+        with self._lock:
+            self._backoff = 0
+        self.concurrency.on_success(latency)
+
+    def record_error(self):
+        """Request failed for other reason than throttling."""
+        with self._lock:
+            self._error_count += 1
+        self.concurrency.on_error()
+
+    def record_throttled(self, retry_after=None):
+        """
+            Provider refused request because of quota.
+
+            All requests to the site are paused with exponential backoff
+            (or for 'retry_after' seconds) and concurrency is decreased.
+
+        Returns:
+            (float) seconds of pause
+        """
+        with self._lock:
+            self._throttled_count += 1
+            self._last_throttled = time.time()
+            if retry_after is None:
+                self._backoff = min(
+                    max(self._backoff * 2, 1), self.max_backoff
+                )
+                retry_after = self._backoff
+
+        log.warning("Site {} hit quota, pausing requests for {}s".format(
+            self.site_name, retry_after
+        ))
+        self.bucket.block(retry_after)
+        self.concurrency.on_error()
+        return retry_after
+
+    def get_status(self):
+        """
+            Current state of limiter for reporting.
+
+        Returns:
+            (dict)
+        """
+        with self._lock:
+            return {
+                "site": self.site_name,
+                "requests_per_second": self.bucket.rate,
+                "concurrency_limit": self.concurrency.limit,
+                "max_parallel_transfers": self.concurrency.maximum,
+                "in_flight": self.concurrency.in_flight,
+                "throttled_count": self._throttled_count,
+                "error_count": self._error_count,
+                "last_throttled": self._last_throttled,
+                "waited_seconds": round(self._waited, 2)
+            }
+
+
+_RATE_LIMITERS = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def get_site_rate_limiter(site_name, requests_per_second=None,
+                          max_parallel_transfers=None):
+    """
+        Shared rate limiter of site.
+
+        Limits are updated when passed.
+    """
+    with _RATE_LIMITERS_LOCK:
+        limiter = _RATE_LIMITERS.get(site_name)
+        if limiter is None:
+            limiter = SiteRateLimiter(
+                site_name,
+                requests_per_second or 0,
+                max_parallel_transfers or 3
+            )
+            _RATE_LIMITERS[site_name] = limiter
+            return limiter
+
+    if requests_per_second is not None or max_parallel_transfers is not None:
+        limiter.configure(
+            requests_per_second
+            if requests_per_second is not None
+            else limiter.bucket.rate,
+            max_parallel_transfers or limiter.concurrency.maximum
+        )
+    return limiter
+
+
+def get_rate_limiters_status():
+    """Status of rate limiters of all sites."""
+    with _RATE_LIMITERS_LOCK:
+        limiters = list(_RATE_LIMITERS.values())
+    return [limiter.get_status() for limiter in limiters]
@@ -0,0 +1,43 @@
+import json
+
+from aiohttp.web_response import Response
+
+
+class SyncServerModuleRestApi:
+    """
+        REST API endpoints exposing metrics of synchronization, eg. for
+        scraping by Prometheus.
+    """
+    def __init__(self, user_module, server_manager):
+        self.module = user_module
+        self.server_manager = server_manager
+
+        self.prefix = "/sync_server"
+
+        self.register()
+
+    def register(self):
+        self.server_manager.add_route(
+            "GET",
+            self.prefix + "/metrics",
+            self.get_metrics
+        )
+        self.server_manager.add_route(
+            "GET",
+            self.prefix + "/history",
+            self.get_history
+        )
+
+    async def get_metrics(self, request):
+        return Response(
+            status=200,
+            text=self.module.get_metrics_text(),
+            headers={"Content-Type": "text/plain; version=0.0.4"}
+        )
+
+    async def get_history(self, request):
+        return Response(
+            status=200,
+            text=json.dumps(self.module.get_metrics_history()),
+            content_type="application/json"
+        )
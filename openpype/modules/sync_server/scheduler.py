@@ -0,0 +1,127 @@
+"""Ordering of representations waiting for synchronization.
+
+Sync loop processes only limited count of files in each loop, so order of
+representations decides what artists get first. Representations are ordered
+by priority stored on site records (see 'SyncServerModule.set_priority'),
+then by size (small representations first) and by time of waiting.
+
+Effective priority of representation grows with time it waits in queue, so
+bulk backlog with low priority gets processed eventually even when high
+priority representations are added continuously.
+"""
+import time
+
+
+def get_representation_priority(representation, site_names,
+                                default_priority):
+    """
+        Priority of representation for sync between 'site_names'.
+
+        Highest priority of all site records of all files is used, so
+        priority set for single site (eg. requested download to local site)
+        is applied on whole transfer.
+
+    Args:
+        representation (dict): representation document
+        site_names (list): names of sites synced (active and remote)
+        default_priority (int): used when no site has priority set
+    Returns:
+        (int)
+    """
+    priority = None
+    for file in representation.get("files") or []:
+        for site in file.get("sites") or []:
+            if site.get("name") not in site_names:
+                continue
+            site_priority = site.get("priority")
+            if site_priority is None:
+                continue
+            if priority is None or site_priority > priority:
+                priority = site_priority
+
+    if priority is None:
+        return default_priority
+    return priority
+
+
+def get_representation_size(representation):
+    """Size of all files of representation in bytes."""
+    return sum(
+        file.get("size") or 0
+        for file in representation.get("files") or []
+    )
+
+
+class SyncScheduler(object):
+    """
+        Orders representations to sync by priority, age and size.
+
+        Time when representation was first seen in queue is remembered per
+        project, representations which are not in queue anymore (synced or
+        removed) are forgotten. Waiting time restarts with new process.
+
+    Args:
+        default_priority (int): priority of site records without priority
+        aging_per_minute (float): effective priority added per minute of
+            waiting (starvation protection), 0 disables aging
+    """
+    def __init__(self, default_priority=50, aging_per_minute=1.0):
+        self.default_priority = default_priority
+        self.aging_per_minute = aging_per_minute
+        self._first_seen = {}
+
+    def get_effective_priority(self, priority, waiting):
+        """
+            Priority increased by time spent in queue.
+
+        Args:
+            priority (int): priority from site records
+            waiting (float): seconds spent in queue
+        Returns:
+            (int)
+        """
+        return int(priority + waiting / 60.0 * self.aging_per_minute)
+
+    def order(self, collection, representations, site_names):
+        """
+            Sorts representations, most urgent first.
+
+        Args:
+            collection (string): project name
+            representations (list): representation documents
+            site_names (list): names of sites synced (active and remote)
+        Returns:
+            (list) of representation documents
+        """
+        now = time.time()
+        previous_seen = self._first_seen.get(collection) or {}
+        first_seen = {}
+        items = []
+        for representation in representations:
+            repre_id = representation["_id"]
+            seen = previous_seen.get(repre_id, now)
+            first_seen[repre_id] = seen
+
+            priority = get_representation_priority(
+                representation, site_names, self.default_priority
+            )
+            effective_priority = self.get_effective_priority(
+                priority, now - seen
+            )
+            items.append((
+                -effective_priority,
+                get_representation_size(representation),
+                seen,
+                representation
+            ))
+        self._first_seen[collection] = first_seen
+
+        items.sort(key=lambda item: item[:3])
+        return [item[-1] for item in items]
+
+    def reset(self, collection=None):
+        """Forget waiting times of 'collection' or all projects."""
+        if collection is None:
+            self._first_seen = {}
+        else:
+            self._first_seen.pop(collection, None)
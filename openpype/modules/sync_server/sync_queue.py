@@ -0,0 +1,244 @@
+"""Incremental queue of representations which should be synchronized."""
+import time
+
+import pymongo
+from pymongo.errors import PyMongoError, OperationFailure
+
+from openpype.lib import PypeLogger
+
+
+log = PypeLogger().get_logger("SyncServer")
+
+
+class ProjectSyncQueue(object):
+    """Representations to sync of one project.
+
+    Full query of representations is done only on first use, when sites
+    or retries change, periodically as safety net or when change stream of
+    project collection is not available. Otherwise only representations
+    changed since last call are queried.
+
+    Args:
+        collection (pymongo.collection.Collection): Project collection.
+        queue_key (tuple): Key of query (sites and retries) to detect query
+            changes.
+    """
+    # Full query is done at least once per this interval (seconds)
+    full_scan_interval = 600
+    # Full query is done when there is more changed representations
+    max_changes = 5000
+    # Maximum time to wait for next change in change stream (ms)
+    max_await_time_ms = 50
+
+    def __init__(self, collection, queue_key):
+        self.collection = collection
+        self.queue_key = queue_key
+        self.representations = {}
+        self.last_full_scan = None
+
+        self._stream = None
+        self._change_stream_available = True
+
+    def get_representations(self, query):
+        """Representations matching query.
+
+        Args:
+            query (dict): Query of representations to sync.
+
+        Returns:
+            list: Representation documents.
+        """
+        if self._needs_full_scan():
+            self.full_scan(query)
+        else:
+            changed_ids = self._get_changed_ids()
+            if changed_ids is None:
+                self.full_scan(query)
+            elif changed_ids:
+                self._update_representations(query, changed_ids)
+
+        return list(self.representations.values())
+
+    def full_scan(self, query):
+        # Open stream before query so changes during query are not missed
+        self._open_stream()
+        self.representations = {
+            repre["_id"]: repre
+            for repre in self.collection.find(query)
+        }
+        self.last_full_scan = time.time()
+        log.debug("Full scan of {} found {} representations".format(
+            self.collection.name, len(self.representations)
+        ))
+
+    def close(self):
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except PyMongoError:
+                pass
+            self._stream = None
+
+    def _needs_full_scan(self):
+        if self.last_full_scan is None or self._stream is None:
+            return True
+        return time.time() - self.last_full_scan > self.full_scan_interval
+
+    def _open_stream(self):
+        self.close()
+        if not self._change_stream_available:
+            return
+
+        try:
+            if not hasattr(type(self.collection), "watch"):
+                raise NotImplementedError("Collection can't be watched")
+            self._stream = self.collection.watch(
+                [{"$match": {"operationType": {"$in": [
+                    "insert", "update", "replace", "delete"
+                ]}}}],
+                max_await_time_ms=self.max_await_time_ms
+            )
+        except (OperationFailure, NotImplementedError):
+            # Change streams require replica set
+            log.info((
+                "Change streams are not available for {}."
+                " Representations are fully queried in each loop."
+            ).format(self.collection.name))
+            self._change_stream_available = False
+            self._stream = None
+
+    def _get_changed_ids(self):
+        """Ids of representations changed since last call.
+
+        Returns:
+            set: Changed ids or None if full scan is needed.
+        """
+        changed_ids = set()
+        try:
+            while True:
+                change = self._stream.try_next()
+                if change is None:
+                    break
+
+                if change["operationType"] == "delete":
+                    self.representations.pop(
+                        change["documentKey"]["_id"], None
+                    )
+                    continue
+
+                changed_ids.add(change["documentKey"]["_id"])
+                if len(changed_ids) > self.max_changes:
+                    return None
+
+        except PyMongoError:
+            log.warning(
+                "Change stream of {} failed".format(self.collection.name),
+                exc_info=True
+            )
+            self.close()
+            return None
+        return changed_ids
+
+    def _update_representations(self, query, changed_ids):
+        changed_ids = list(changed_ids)
+        matching = {
+            repre["_id"]: repre
+            for repre in self.collection.find(
+                {"$and": [{"_id": {"$in": changed_ids}}, query]}
+            )
+        }
+        for repre_id in changed_ids:
+            repre = matching.get(repre_id)
+            if repre is None:
+                # Representation does not need sync anymore
+                self.representations.pop(repre_id, None)
+            else:
+                self.representations[repre_id] = repre
+
+        log.debug("{} changed representations in {}, {} to sync".format(
+            len(changed_ids), self.collection.name, len(self.representations)
+        ))
+
+
+class SyncQueue(object):
+    """Incremental queues of representations to sync for all projects.
+
+    Creates indexes used by queries of sync server in each project.
+
+    Args:
+        module (SyncServerModule): Module providing queries and connection.
+    """
+    indexes = (
+        [("files.sites.name", pymongo.ASCENDING)],
+        [
+            ("files.sites.name", pymongo.ASCENDING),
+            ("files.sites.created_dt", pymongo.ASCENDING)
+        ]
+    )
+
+    def __init__(self, module):
+        self.module = module
+        self._queues = {}
+        self._indexed_projects = set()
+
+    def get_representations(self, collection, active_site, remote_site):
+        """Representations which should be synced between sites.
+
+        Args:
+            collection (string): project name
+            active_site (string): identifier of current active site
+            remote_site (string): identifier of remote site
+
+        Returns:
+            (list) of dictionaries
+        """
+        project_collection = self.module.connection.database[collection]
+        self._ensure_indexes(collection, project_collection)
+
+        query = self.module.get_sync_representations_query(
+            collection, active_site, remote_site
+        )
+        queue_key = (
+            active_site,
+            remote_site,
+            tuple(self.module._get_retries_arr(collection))
+        )
+        queue = self._queues.get(collection)
+        if queue is None or queue.queue_key != queue_key:
+            if queue is not None:
+                queue.close()
+            queue = ProjectSyncQueue(project_collection, queue_key)
+            self._queues[collection] = queue
+
+        return queue.get_representations(query)
+
+    def reset(self, collection=None):
+        """Force full query of representations in next call."""
+        if collection is None:
+            collections = list(self._queues.keys())
+        else:
+            collections = [collection]
+
+        for _collection in collections:
+            queue = self._queues.pop(_collection, None)
+            if queue is not None:
+                queue.close()
+
+    def close(self):
+        self.reset()
+
+    def _ensure_indexes(self, collection, project_collection):
+        if collection in self._indexed_projects:
+            return
+
+        self._indexed_projects.add(collection)
+        for keys in self.indexes:
+            try:
+                project_collection.create_index(keys, background=True)
+            except PyMongoError:
+                log.warning(
+                    "Index {} couldn't be created in {}".format(
+                        keys, collection
+                    ),
+                    exc_info=True
+                )
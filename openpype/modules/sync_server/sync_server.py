@@ -1,5 +1,6 @@
 """Python 3 only implementation."""
 import os
+import time
 import asyncio
 import threading
 import concurrent.futures
@@ -9,6 +10,9 @@ from .providers import lib
 from openpype.lib import PypeLogger
 
 from .utils import SyncStatus
+from .sync_queue import SyncQueue
+from .scheduler import SyncScheduler
+from .rate_limiter import get_site_rate_limiter, ProviderThrottled
 
 
 log = PypeLogger().get_logger("SyncServer")
@@ -134,6 +138,63 @@ async def download(module, collection, file, representation, provider_name,
     return file_id
 
 
+async def transfer_files(module, collection, files, representation,
+                         provider_name, remote_site_name, direction,
+                         preset=None):
+    """
+        Transfers multiple files of a 'representation' with single call of
+        provider, used for providers with 'BATCH_TRANSFERS' (e.g. local
+        drive copying whole image sequences).
+
+    Args:
+        module(SyncServerModule): object to run SyncServerModule API
+        collection (str): source collection
+        files (list): of dictionaries of files from representation in Mongo
+        representation (dictionary): of representation
+        provider_name (string):  'local_drive' etc
+        remote_site_name (string): remote site
+        direction (string): "Upload" or "Download"
+        preset (dictionary): site config ('credentials_url', 'root'...)
+
+    Returns:
+        (list) result of each file - file id or exception
+    """
+    with module.lock:
+        remote_handler = lib.factory.get_provider(provider_name,
+                                                  collection,
+                                                  remote_site_name,
+                                                  presets=preset)
+        if direction == "Upload":
+            site = remote_site_name
+        else:
+            site = module.get_active_site(collection)
+
+        transfers = []
+        for file in files:
+            local_file_path, remote_file_path = resolve_paths(
+                module, file.get("path", ""), collection, remote_site_name,
+                remote_handler
+            )
+            if direction == "Upload":
+                source_path, target_path = local_file_path, remote_file_path
+                remote_handler.create_folder(os.path.dirname(target_path))
+            else:
+                source_path, target_path = remote_file_path, local_file_path
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+
+            progress = remote_handler.get_progress_callback(
+                module, collection, file, representation, site, direction
+            )
+            transfers.append((source_path, target_path, progress))
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None,
+                                      remote_handler.transfer_files,
+                                      transfers,
+                                      True,
+                                      direction)
+
+
 def resolve_paths(module, file_path, collection,
                   remote_site_name=None, remote_handler=None):
     """
@@ -231,7 +292,13 @@ class SyncServerThread(threading.Thread):
         self.module = module
         self.loop = None
         self.is_running = False
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=module.MAX_TRANSFER_WORKERS
+        )
+        self.sync_queue = SyncQueue(module)
+        self.scheduler = SyncScheduler(
+            module.DEFAULT_PRIORITY, module.PRIORITY_AGING_PER_MINUTE
+        )
 
     def run(self):
         self.is_running = True
@@ -244,6 +311,8 @@ class SyncServerThread(threading.Thread):
 
             asyncio.ensure_future(self.check_shutdown(), loop=self.loop)
             asyncio.ensure_future(self.sync_loop(), loop=self.loop)
+            asyncio.ensure_future(self.flush_db_updates(), loop=self.loop)
+            asyncio.ensure_future(self.sample_metrics(), loop=self.loop)
             self.loop.run_forever()
         except Exception:
             log.warning(
@@ -268,7 +337,6 @@ class SyncServerThread(threading.Thread):
         """
         try:
             while self.is_running and not self.module.is_paused():
-                import time
                 start_time = None
                 self.module.set_sync_project_settings()  # clean cache
                 for collection, preset in self.module.sync_project_settings.\
@@ -278,11 +346,24 @@ class SyncServerThread(threading.Thread):
                     if not all([local_site, remote_site]):
                         continue
 
-                    sync_repres = self.module.get_sync_representations(
+                    # only representations changed since last loop are
+                    # queried
+                    sync_repres = self.sync_queue.get_representations(
                         collection,
                         local_site,
                         remote_site
                     )
+                    # most urgent first, 'limit' below truncates the rest
+                    sync_repres = self.scheduler.order(
+                        collection,
+                        sync_repres,
+                        [local_site, remote_site]
+                    )
+                    self.module.metrics.set(
+                        "queue_depth",
+                        {"project": collection, "site": remote_site},
+                        len(sync_repres)
+                    )
 
                     task_files_to_process = []
                     files_processed_info = []
@@ -301,6 +382,12 @@ class SyncServerThread(threading.Thread):
                                                        presets=site_preset)
                     limit = lib.factory.get_provider_batch_limit(
                         site_preset['provider'])
+                    get_site_rate_limiter(
+                        remote_site,
+                        site_preset.get("requests_per_second") or
+                        handler.REQUESTS_PER_SECOND,
+                        self.module.get_max_parallel_transfers(collection)
+                    )
                     # first call to get_provider could be expensive, its
                     # building folder tree structure in memory
                     # call only if needed, eg. DO_UPLOAD or DO_DOWNLOAD
@@ -309,8 +396,12 @@ class SyncServerThread(threading.Thread):
                                 is_representation_paused(sync['_id']):
                             continue
                         if limit <= 0:
-                            continue
+                            break
                         files = sync.get("files") or []
+                        # providers with batch transfers get all files of
+                        # representation at once
+                        batch_uploads = []
+                        batch_downloads = []
                         if files:
                             for file in files:
                                 # skip already processed files
@@ -322,10 +413,21 @@ class SyncServerThread(threading.Thread):
                                     local_site,
                                     remote_site,
                                     preset.get('config'))
+                                if handler.BATCH_TRANSFERS:
+                                    if status == SyncStatus.DO_UPLOAD:
+                                        batch_uploads.append(file)
+                                        processed_file_path.add(file_path)
+                                    elif status == SyncStatus.DO_DOWNLOAD:
+                                        batch_downloads.append(file)
+                                        processed_file_path.add(file_path)
+                                    continue
+
                                 if status == SyncStatus.DO_UPLOAD:
                                     tree = handler.get_tree()
                                     limit -= 1
-                                    task = asyncio.create_task(
+                                    task = self.create_transfer_task(
+                                        collection,
+                                        remote_site,
                                         upload(self.module,
                                                collection,
                                                file,
@@ -345,7 +447,9 @@ class SyncServerThread(threading.Thread):
                                 if status == SyncStatus.DO_DOWNLOAD:
                                     tree = handler.get_tree()
                                     limit -= 1
-                                    task = asyncio.create_task(
+                                    task = self.create_transfer_task(
+                                        collection,
+                                        remote_site,
                                         download(self.module,
                                                  collection,
                                                  file,
@@ -363,24 +467,85 @@ class SyncServerThread(threading.Thread):
                                                                  ))
                                     processed_file_path.add(file_path)
 
+                        batches = (
+                            ("Upload", batch_uploads, remote_site),
+                            ("Download", batch_downloads, local_site)
+                        )
+                        for direction, batch_files, site in batches:
+                            if not batch_files:
+                                continue
+                            limit -= 1
+                            task = self.create_transfer_task(
+                                collection,
+                                remote_site,
+                                transfer_files(self.module,
+                                               collection,
+                                               batch_files,
+                                               sync,
+                                               remote_provider,
+                                               remote_site,
+                                               direction,
+                                               site_preset))
+                            task_files_to_process.append(task)
+                            files_processed_info.append([
+                                (file, sync, site, collection)
+                                for file in batch_files
+                            ])
+
                     log.debug("Sync tasks count {}".
                               format(len(task_files_to_process)))
                     files_created = await asyncio.gather(
                         *task_files_to_process,
                         return_exceptions=True)
-                    for file_id, info in zip(files_created,
-                                             files_processed_info):
+                    results = []
+                    for result, info in zip(files_created,
+                                            files_processed_info):
+                        if not isinstance(info, list):
+                            results.append((result, info))
+                            continue
+                        # batch task returns result for each file
+                        if isinstance(result, BaseException):
+                            result = [result] * len(info)
+                        results.extend(zip(result, info))
+
+                    site_providers = {
+                        local_site: self.module.get_provider_for_site(
+                            collection, local_site),
+                        remote_site: remote_provider
+                    }
+                    for file_id, info in results:
                         file, representation, site, collection = info
                         error = None
+                        if site == remote_site:
+                            direction = "upload"
+                        else:
+                            direction = "download"
+                        if isinstance(file_id, ProviderThrottled):
+                            # not a failure of file, retried in next loop
+                            log.debug("File {} postponed: {}".format(
+                                file.get("path"), file_id))
+                            self.module.metrics.record_transfer(
+                                collection, site, site_providers[site],
+                                direction, throttled=True)
+                            continue
                         if isinstance(file_id, BaseException):
                             error = str(file_id)
                             file_id = None
+                        self.module.metrics.record_transfer(
+                            collection, site, site_providers[site],
+                            direction, file.get("size"), error)
                         self.module.update_db(collection,
                                               file_id,
                                               file,
                                               representation,
                                               site,
                                               error)
+                    self.module.flush_db_updates()
+                    self.module.metrics.observe(
+                        "loop_duration_seconds",
+                        {"project": collection},
+                        time.time() - start_time
+                    )
 
                 duration = time.time() - start_time
                 log.debug("One loop took {:.2f}s".format(duration))
@@ -396,6 +561,64 @@ class SyncServerThread(threading.Thread):
             log.warning("Unhandled exception in sync loop, stopping server",
                         exc_info=True)
 
+    def create_transfer_task(self, collection, site_name, coro):
+        """
+            Create task transferring file which waits until less than
+            current concurrency limit of files is transferred from/to
+            'site_name'.
+
+            Limit is adjusted by rate limiter of the site (see
+            'rate_limiter.AdaptiveConcurrency').
+
+        Args:
+            collection (string): project name
+            site_name (string): remote site of transfer
+            coro (coroutine): upload or download
+        Returns:
+            (asyncio.Task)
+        """
+        concurrency = get_site_rate_limiter(site_name).concurrency
+        labels = {
+            "project": collection,
+            "site": site_name,
+            "provider": self.module.get_provider_for_site(collection,
+                                                          site_name)
+        }
+
+        async def _limited_transfer():
+            while not concurrency.try_acquire():
+                await asyncio.sleep(0.1)
+            start = time.time()
+            try:
+                return await coro
+            finally:
+                concurrency.release()
+                self.module.metrics.observe(
+                    "transfer_duration_seconds", labels, time.time() - start
+                )
+
+        return asyncio.create_task(_limited_transfer())
+
+    async def flush_db_updates(self):
+        """
+            Future that writes buffered DB updates (progress) periodically
+            so tray shows them even during long transfers.
+        """
+        while self.is_running:
+            await asyncio.sleep(self.module.DB_UPDATES_LATENCY_SEC)
+            if self.module.db_updates_buffer.is_due():
+                self.module.flush_db_updates()
+
+    async def sample_metrics(self):
+        """
+            Future that samples metrics into rolling history charted in
+            tray.
+        """
+        while self.is_running:
+            await asyncio.sleep(self.module.metrics.history_interval)
+            self.module.update_limits_metrics()
+            self.module.metrics.sample()
+
     def stop(self):
         """Sets is_running flag to false, 'check_shutdown' shuts server down"""
         self.is_running = False
@@ -411,9 +634,11 @@ class SyncServerThread(threading.Thread):
         list(map(lambda task: task.cancel(), tasks))  # cancel all the tasks
         results = await asyncio.gather(*tasks, return_exceptions=True)
         log.debug(f'Finished awaiting cancelled tasks, results: {results}...')
+        self.sync_queue.close()
         await self.loop.shutdown_asyncgens()
         # to really make sure everything else has time to stop
         self.executor.shutdown(wait=True)
+        self.module.flush_db_updates()
         await asyncio.sleep(0.07)
         self.loop.stop()
 
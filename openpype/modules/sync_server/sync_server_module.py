@@ -5,7 +5,7 @@ import threading
 
 from avalon.api import AvalonMongoDB
 
-from .. import PypeModule, ITrayModule
+from .. import PypeModule, ITrayModule, IWebServerRoutes
 from openpype.api import (
     Anatomy,
     get_project_settings,
@@ -15,12 +15,16 @@ from openpype.lib import PypeLogger
 from .providers.local_drive import LocalDriveHandler
 
 from .utils import time_function, SyncStatus
+from .db_buffer import SiteUpdatesBuffer
+from .rate_limiter import get_rate_limiters_status
+from .scheduler import get_representation_priority
+from .metrics import SyncMetrics
 
 
 log = PypeLogger().get_logger("SyncServer")
 
 
-class SyncServerModule(PypeModule, ITrayModule):
+class SyncServerModule(PypeModule, ITrayModule, IWebServerRoutes):
     """
        Synchronization server that is syncing published files from local to
        any of implemented providers (like GDrive, S3 etc.)
@@ -83,6 +87,15 @@ class SyncServerModule(PypeModule, ITrayModule):
     DEFAULT_SITE = 'studio'
     LOCAL_SITE = 'local'
     LOG_PROGRESS_SEC = 5  # how often log progress to DB
+    DB_UPDATES_LATENCY_SEC = 2  # max delay of buffered updates to DB
+    DEFAULT_PARALLEL_TRANSFERS = 3  # files in flight per site
+    MAX_TRANSFER_WORKERS = 16  # threads transferring files of all sites
+    # order of representations in sync queue, higher is synced sooner
+    MIN_PRIORITY = 0
+    DEFAULT_PRIORITY = 50
+    HIGH_PRIORITY = 80  # requested by artist (download from Loader)
+    MAX_PRIORITY = 100
+    PRIORITY_AGING_PER_MINUTE = 1  # waiting representations get priority
 
     name = "sync_server"
     label = "Sync Queue"
@@ -110,10 +123,13 @@ class SyncServerModule(PypeModule, ITrayModule):
         self._anatomies = {}
 
         self._connection = None
+        self._db_updates_buffer = None
+        self._metrics = SyncMetrics()
+        self.rest_api_obj = None
 
     """ Start of Public API """
     def add_site(self, collection, representation_id, site_name=None,
-                 force=False):
+                 force=False, priority=None):
         """
             Adds new site to representation to be synced.
 
@@ -127,6 +143,7 @@ class SyncServerModule(PypeModule, ITrayModule):
                 representation_id (string): MongoDB _id value
                 site_name (string): name of configured and active site
                 force (bool): reset site if exists
+                priority (int): priority in sync queue (see 'set_priority')
 
             Returns:
                 throws ValueError if any issue
@@ -137,9 +154,73 @@ class SyncServerModule(PypeModule, ITrayModule):
         if not site_name:
             site_name = self.DEFAULT_SITE
 
+        if priority is not None:
+            priority = self._validate_priority(priority)
+
         self.reset_provider_for_file(collection,
                                      representation_id,
-                                     site_name=site_name, force=force)
+                                     site_name=site_name, force=force,
+                                     priority=priority)
+
+    def set_priority(self, collection, representation_id, site_name,
+                     priority):
+        """
+            Sets priority of 'site_name' for 'representation_id' in sync
+            queue.
+
+            Representations with higher priority are synced first, waiting
+            representations gain priority over time so low priority ones are
+            not postponed forever.
+
+            Args:
+                collection (string): project name (must match DB)
+                representation_id (string): MongoDB _id value
+                site_name (string): name of configured and active site
+                priority (int): value between MIN_PRIORITY and MAX_PRIORITY,
+                    None resets to DEFAULT_PRIORITY
+
+            Returns:
+                throws ValueError if any issue
+        """
+        if not self.get_sync_project_setting(collection):
+            raise ValueError("Project not configured")
+
+        if priority is not None:
+            priority = self._validate_priority(priority)
+
+        query = {
+            "_id": ObjectId(representation_id)
+        }
+        representation = list(self.connection.database[collection].find(query))
+        if not representation:
+            raise ValueError("Representation {} not found in {}".
+                             format(representation_id, collection))
+
+        self._set_site_priority(collection, query, representation,
+                                site_name, priority)
+
+    def get_priority(self, representation, site_name=None):
+        """
+            Priority of 'representation' in sync queue.
+
+            Args:
+                representation (dict): representation document
+                site_name (string): only priority of this site, highest
+                    priority of all sites if not set
+
+            Returns:
+                (int)
+        """
+        if site_name:
+            site_names = [site_name]
+        else:
+            site_names = set()
+            for repre_file in representation.get("files") or []:
+                for site in repre_file.get("sites") or []:
+                    site_names.add(site.get("name"))
+
+        return get_representation_priority(representation, site_names,
+                                           self.DEFAULT_PRIORITY)
 
     # public facing API
     def remove_site(self, collection, representation_id, site_name,
@@ -432,6 +513,13 @@ class SyncServerModule(PypeModule, ITrayModule):
     def connect_with_modules(self, *_a, **kw):
         return
 
+    def webserver_initialization(self, server_manager):
+        """Implementation of IWebServerRoutes interface."""
+        if self.enabled:
+            from .rest_api import SyncServerModuleRestApi
+
+            self.rest_api_obj = SyncServerModuleRestApi(self, server_manager)
+
     def tray_init(self):
         """
             Actual initialization of Sync Server.
@@ -637,6 +725,33 @@ class SyncServerModule(PypeModule, ITrayModule):
         """
         log.debug("Check representations for : {}".format(collection))
         self.connection.Session["AVALON_PROJECT"] = collection
+        query = self.get_sync_representations_query(
+            collection, active_site, remote_site
+        )
+        log.debug("active_site:{} - remote_site:{}".format(active_site,
+                                                           remote_site))
+        log.debug("query: {}".format(query))
+        representations = self.connection.find(query)
+
+        return representations
+
+    def get_sync_representations_query(self, collection, active_site,
+                                       remote_site):
+        """
+            Query of representations that should be synced between
+            'active_site' and 'remote_site'.
+
+            Used by 'get_sync_representations' and by sync queue which
+            filters only changed representations with the query.
+
+        Args:
+            collection (string): name of collection (project name)
+            active_site (string): identifier of current active site
+            remote_site (string): identifier of remote site I want to sync to
+
+        Returns:
+            (dict)
+        """
         # retry_cnt - number of attempts to sync specific file before giving up
         retries_arr = self._get_retries_arr(collection)
         query = {
@@ -677,12 +792,7 @@ class SyncServerModule(PypeModule, ITrayModule):
                 ]}
             ]
         }
-        log.debug("active_site:{} - remote_site:{}".format(active_site,
-                                                           remote_site))
-        log.debug("query: {}".format(query))
-        representations = self.connection.find(query)
-
-        return representations
+        return query
 
     def check_status(self, file, local_site, remote_site, config_preset):
         """
@@ -725,12 +835,34 @@ class SyncServerModule(PypeModule, ITrayModule):
 
         return SyncStatus.DO_NOTHING
 
+    @property
+    def db_updates_buffer(self):
+        if self._db_updates_buffer is None:
+            self._db_updates_buffer = SiteUpdatesBuffer(
+                self.connection.database, self.DB_UPDATES_LATENCY_SEC
+            )
+        return self._db_updates_buffer
+
+    def flush_db_updates(self):
+        """
+            Write all buffered updates of sites to DB.
+
+            Called at the end of each sync loop and on server shutdown,
+            buffer writes updates also when oldest of them is older than
+            'DB_UPDATES_LATENCY_SEC'.
+        """
+        if self._db_updates_buffer is not None:
+            self._db_updates_buffer.flush()
+
     def update_db(self, collection, new_file_id, file, representation,
                   site, error=None, progress=None):
         """
             Update 'provider' portion of records in DB with success (file_id)
             or error (exception)
 
+            Updates are buffered and written in batches, see
+            'flush_db_updates'.
+
         Args:
             collection (string): name of project - force to db connection as
               each file might come from different collection
@@ -746,9 +878,6 @@ class SyncServerModule(PypeModule, ITrayModule):
         """
         representation_id = representation.get("_id")
         file_id = file.get("_id")
-        query = {
-            "_id": representation_id
-        }
 
         update = {}
         if new_file_id:
@@ -763,16 +892,14 @@ class SyncServerModule(PypeModule, ITrayModule):
 
             update["$set"] = self._get_error_dict(error, tries)
 
-        arr_filter = [
-            {'s.name': site},
-            {'f._id': ObjectId(file_id)}
-        ]
-
-        self.connection.database[collection].update_one(
-            query,
+        # updates are written in batches by 'flush_db_updates'
+        self.db_updates_buffer.add(
+            collection,
+            representation_id,
+            file_id,
+            site,
             update,
-            upsert=True,
-            array_filters=arr_filter
+            is_progress=progress is not None
         )
 
         if progress is not None:
@@ -833,7 +960,8 @@ class SyncServerModule(PypeModule, ITrayModule):
 
     def reset_provider_for_file(self, collection, representation_id,
                                 side=None, file_id=None, site_name=None,
-                                remove=False, pause=None, force=False):
+                                remove=False, pause=None, force=False,
+                                priority=None):
         """
             Reset information about synchronization for particular 'file_id'
             and provider.
@@ -856,6 +984,7 @@ class SyncServerModule(PypeModule, ITrayModule):
             remove (bool): if True remove site altogether
             pause (bool or None): if True - pause, False - unpause
             force (bool): hard reset - currently only for add_site
+            priority (int): priority of added site in sync queue
 
         Returns:
             throws ValueError
@@ -882,6 +1011,8 @@ class SyncServerModule(PypeModule, ITrayModule):
                 site_name = remote_site
 
         elem = {"name": site_name}
+        if priority is not None:
+            elem["priority"] = priority
 
         if file_id:  # reset site for particular file
             self._reset_site_for_file(collection, query,
@@ -999,6 +1130,51 @@ class SyncServerModule(PypeModule, ITrayModule):
 
         self._update_site(collection, query, update, arr_filter)
 
+    def _set_site_priority(self, collection, query, representation,
+                           site_name, priority):
+        """
+            Sets 'priority' of 'site_name' for all files of 'representation'
+
+            Throws ValueError if 'site_name' not found on 'representation'
+        """
+        found = False
+        for repre_file in representation.pop().get("files"):
+            for site in repre_file.get("sites"):
+                if site["name"] == site_name:
+                    found = True
+                    break
+        if not found:
+            msg = "Site {} not found".format(site_name)
+            log.info(msg)
+            raise ValueError(msg)
+
+        if priority is None:
+            update = {
+                "$unset": {"files.$[].sites.$[s].priority": ""}
+            }
+        else:
+            update = {
+                "$set": {"files.$[].sites.$[s].priority": priority}
+            }
+
+        arr_filter = [
+            {'s.name': site_name}
+        ]
+
+        self._update_site(collection, query, update, arr_filter)
+
+    def _validate_priority(self, priority):
+        """Returns 'priority' as int, raises ValueError if out of range."""
+        try:
+            priority = int(priority)
+        except (TypeError, ValueError):
+            raise ValueError("Priority must be integer, got {}".
+                             format(priority))
+        if not self.MIN_PRIORITY <= priority <= self.MAX_PRIORITY:
+            raise ValueError("Priority must be between {} and {}".
+                             format(self.MIN_PRIORITY, self.MAX_PRIORITY))
+        return priority
+
     def _add_site(self, collection, query, representation, elem, site_name,
                   force=False):
         """
@@ -1097,6 +1273,61 @@ class SyncServerModule(PypeModule, ITrayModule):
         ld = self.sync_project_settings[project_name]["config"]["loop_delay"]
         return int(ld)
 
+    def get_max_parallel_transfers(self, project_name):
+        """
+            Return count of files which could be transferred in parallel
+            to or from single site.
+        Returns:
+            (int)
+        """
+        config = self.sync_project_settings[project_name]["config"]
+        return max(int(config.get("max_parallel_transfers") or
+                       self.DEFAULT_PARALLEL_TRANSFERS), 1)
+
+    def get_rate_limits_status(self):
+        """
+            Status of rate limiters and concurrency of remote sites.
+
+        Returns:
+            (list) of dictionaries, see 'SiteRateLimiter.get_status'
+        """
+        return get_rate_limiters_status()
+
+    @property
+    def metrics(self):
+        """(SyncMetrics) counters and histograms recorded by sync loop"""
+        return self._metrics
+
+    def get_metrics_text(self):
+        """
+            Metrics of synchronization in Prometheus text format.
+
+            Served on '/sync_server/metrics' route of webserver.
+
+        Returns:
+            (string)
+        """
+        self.update_limits_metrics()
+        return self._metrics.render()
+
+    def update_limits_metrics(self):
+        """Copies current state of rate limiters to metrics gauges."""
+        for status in self.get_rate_limits_status():
+            labels = {"site": status["site"]}
+            self._metrics.set("in_flight_transfers", labels,
+                              status["in_flight"])
+            self._metrics.set("concurrency_limit", labels,
+                              status["concurrency_limit"])
+
+    def get_metrics_history(self):
+        """
+            Rolling history of throughput, queue depth and failures.
+
+        Returns:
+            (list) of dictionaries, see 'SyncMetrics.get_history'
+        """
+        return self._metrics.get_history()
+
     def show_widget(self):
         """Show dialog to enter credentials"""
         self.widget.show()
@@ -7,7 +7,8 @@ from openpype import resources
 
 from openpype.modules.sync_server.tray.widgets import (
     SyncProjectListWidget,
-    SyncRepresentationSummaryWidget
+    SyncRepresentationSummaryWidget,
+    SyncHistoryChart
 )
 
 log = PypeLogger().get_logger("SyncServer")
@@ -45,8 +46,20 @@ class SyncServerWindow(QtWidgets.QDialog):
         self.pause_btn = QtWidgets.QPushButton("Pause server")
 
         left_column_layout.addWidget(self.pause_btn)
+
+        self.limits_label = QtWidgets.QLabel(left_column)
+        self.limits_label.setWordWrap(True)
+        left_column_layout.addWidget(self.limits_label)
+
+        self.history_chart = SyncHistoryChart(left_column)
+        left_column_layout.addWidget(self.history_chart)
         left_column.setLayout(left_column_layout)
 
+        self.limits_timer = QtCore.QTimer()
+        self.limits_timer.timeout.connect(self._refresh_limits)
+        self.limits_timer.start(2000)
+        self._refresh_limits()
+
         repres = SyncRepresentationSummaryWidget(
             sync_server,
             project=self.projects.current_project,
@@ -96,6 +109,27 @@ class SyncServerWindow(QtWidgets.QDialog):
             self.pause_btn.setText("Unpause server")
         self.projects.refresh()
 
+    def _refresh_limits(self):
+        """
+            Show current rate limits and concurrency of remote sites and
+            history of sync throughput
+        """
+        lines = []
+        for status in self.sync_server.get_rate_limits_status():
+            line = "{}: {}/{} transfers".format(
+                status["site"],
+                status["in_flight"],
+                status["concurrency_limit"]
+            )
+            if status["requests_per_second"]:
+                line += ", {} req/s".format(status["requests_per_second"])
+            if status["throttled_count"]:
+                line += ", throttled {}x".format(status["throttled_count"])
+            lines.append(line)
+        self.limits_label.setText("\n".join(lines))
+        self.limits_label.setVisible(bool(lines))
+        self.history_chart.set_history(self.sync_server.get_metrics_history())
+
     def _update_message(self, value):
         """
             Update and show message in the footer
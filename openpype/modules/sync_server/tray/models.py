@@ -351,7 +351,7 @@ class SyncRepresentationSummaryModel(_SyncRepresentationModel):
         "updated_dt_remote",  # remote created_dt
         "files_count",  # count of files
         "files_size",  # file size of all files
-        "context.asset",  # priority TODO
+        "priority",  # priority
         "status"  # status
     ]
 
@@ -537,7 +537,7 @@ class SyncRepresentationSummaryModel(_SyncRepresentationModel):
                 avg_progress_remote,
                 repre.get("files_count", 1),
                 lib.pretty_size(repre.get("files_size", 0)),
-                1,
+                repre.get("priority"),
                 lib.STATUS[repre.get("status", -1)],
                 files[0].get('path')
             )
@@ -656,6 +656,10 @@ class SyncRepresentationSummaryModel(_SyncRepresentationModel):
                     '$cond': [{'$size': "$order_local.paused"},
                               1,
                               0]},
+                # highest priority set on any of both sites
+                'priority': {'$max': {
+                    '$concatArrays': ["$order_local.priority",
+                                      "$order_remote.priority"]}},
             }},
             {'$group': {
                 '_id': '$_id',
@@ -678,6 +682,7 @@ class SyncRepresentationSummaryModel(_SyncRepresentationModel):
                 'failed_local_tries': {'$sum': '$failed_local_tries'},
                 'paused_remote': {'$sum': '$paused_remote'},
                 'paused_local': {'$sum': '$paused_local'},
+                'priority': {'$max': '$priority'},
                 'updated_dt_local': {'$max': "$updated_dt_local"}
             }},
             {"$project": self.projection}
@@ -760,6 +765,8 @@ class SyncRepresentationSummaryModel(_SyncRepresentationModel):
             'updated_dt_local': 1,
             'paused_remote': 1,
             'paused_local': 1,
+            'priority': {
+                '$ifNull': ['$priority', self.sync_server.DEFAULT_PRIORITY]},
             'status': {
                 '$switch': {
                     'branches': [
@@ -840,7 +847,7 @@ class SyncRepresentationDetailModel(_SyncRepresentationModel):
         "updated_dt_local",  # local created_dt
         "updated_dt_remote",  # remote created_dt
         "size",  # remote progress
-        "size",  # priority TODO
+        "priority",  # priority
         "status"  # status
     ]
 
@@ -1014,7 +1021,7 @@ class SyncRepresentationDetailModel(_SyncRepresentationModel):
                     local_progress,
                     remote_progress,
                     lib.pretty_size(file.get('size', 0)),
-                    1,
+                    repre.get("priority"),
                     lib.STATUS[repre.get("status", -1)],
                     repre.get("tries"),
                     '\n'.join(errors),
@@ -1107,6 +1114,10 @@ class SyncRepresentationDetailModel(_SyncRepresentationModel):
                     '$cond': [{'$size': "$order_local.paused"},
                               1,
                               0]},
+                # highest priority set on any of both sites
+                'priority': {'$max': {
+                    '$concatArrays': ["$order_local.priority",
+                                      "$order_remote.priority"]}},
                 'failed_remote': {
                     '$cond': [{'$size': "$order_remote.last_failed_dt"},
                               1,
@@ -1195,6 +1206,8 @@ class SyncRepresentationDetailModel(_SyncRepresentationModel):
             'updated_dt_local': 1,
             'paused_remote': 1,
             'paused_local': 1,
+            'priority': {
+                '$ifNull': ['$priority', self.sync_server.DEFAULT_PRIORITY]},
             'failed_remote_error': 1,
             'failed_local_error': 1,
             'tries': 1,
@@ -522,8 +522,52 @@ class SyncRepresentationSummaryWidget(_SyncRepresentationWidget):
             action_kwarg_map[action] = {"selected_ids": self._selected_ids}
             menu.addAction(action)
 
+        if item.status in [lib.STATUS[0], lib.STATUS[1], lib.STATUS[3]] \
+                or is_multi:
+            priority_menu = menu.addMenu("Set priority")
+            for label, priority in (
+                ("High", self.sync_server.HIGH_PRIORITY),
+                ("Normal", self.sync_server.DEFAULT_PRIORITY),
+                ("Low", self.sync_server.MIN_PRIORITY)
+            ):
+                action = QtWidgets.QAction(label, priority_menu)
+                action.setCheckable(True)
+                action.setChecked(not is_multi and item.priority == priority)
+                actions_mapping[action] = self._set_priority
+                action_kwarg_map[action] = {
+                    "selected_ids": self._selected_ids,
+                    "priority": priority
+                }
+                priority_menu.addAction(action)
+
         return action_kwarg_map, actions_mapping, menu
 
+    def _set_priority(self, selected_ids=None, priority=None):
+        """
+            Sets priority in sync queue for both sites of representations.
+
+            Effective priority is the highest of both sites, so both are
+            set to allow decreasing it.
+        """
+        log.debug("Set priority {}:{}".format(selected_ids, priority))
+        for representation_id in selected_ids:
+            for site_name in [self.model.active_site, self.model.remote_site]:
+                try:
+                    self.sync_server.set_priority(self.model.project,
+                                                  representation_id,
+                                                  site_name,
+                                                  priority)
+                except ValueError as exp:
+                    self.message_generated.emit("Error {}".format(str(exp)))
+                    break
+            else:
+                self.message_generated.emit(
+                    "Priority of {} set to {}".format(representation_id,
+                                                      priority))
+
+        self.model.refresh(
+            load_records=self.model._rec_loaded)
+
 
 class SyncServerDetailWindow(QtWidgets.QDialog):
     """Wrapper window for SyncRepresentationDetailWidget
@@ -841,6 +885,79 @@ class TransparentWidget(QtWidgets.QWidget):
         super(TransparentWidget, self).mouseReleaseEvent(event)
 
 
+class SyncHistoryChart(QtWidgets.QWidget):
+    """
+        Chart of sync throughput (line) and queue depth (bars) history.
+
+        Data are items of 'SyncServerModule.get_metrics_history'.
+    """
+    line_color = QtGui.QColor(112, 196, 124)
+    bar_color = QtGui.QColor(80, 110, 150, 140)
+    failure_color = QtGui.QColor(220, 80, 80)
+    text_color = QtGui.QColor("gray")
+
+    def __init__(self, parent=None):
+        super(SyncHistoryChart, self).__init__(parent)
+        self.setMinimumHeight(80)
+        self._history = []
+
+    def set_history(self, history):
+        self._history = history
+        if history:
+            last = history[-1]
+            self.setToolTip(
+                "Throughput: {}/s\nQueued: {}\nFailed (last minute): {}".
+                format(lib.pretty_size(last["bytes_per_second"]),
+                       last["queue_depth"],
+                       sum(item["failures"] for item in history[-6:])))
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        rect = self.rect().adjusted(2, 14, -2, -2)
+        if len(self._history) < 2:
+            painter.setPen(self.text_color)
+            painter.drawText(self.rect(), Qt.AlignCenter, "No sync history")
+            return
+
+        count = len(self._history)
+        step = float(rect.width()) / (count - 1)
+        max_speed = max(item["bytes_per_second"] for item in self._history)
+        max_queue = max(item["queue_depth"] for item in self._history)
+
+        for index, item in enumerate(self._history):
+            x_pos = rect.left() + index * step
+            if max_queue:
+                height = rect.height() * item["queue_depth"] / max_queue
+                painter.fillRect(
+                    QtCore.QRectF(x_pos - step / 2, rect.bottom() - height,
+                                  max(step, 1), height),
+                    self.bar_color)
+            if item["failures"]:
+                painter.setPen(self.failure_color)
+                painter.drawLine(QtCore.QPointF(x_pos, rect.top()),
+                                 QtCore.QPointF(x_pos, rect.bottom()))
+
+        if max_speed:
+            points = [
+                QtCore.QPointF(
+                    rect.left() + index * step,
+                    rect.bottom() -
+                    rect.height() * item["bytes_per_second"] / max_speed)
+                for index, item in enumerate(self._history)
+            ]
+            painter.setPen(QtGui.QPen(self.line_color, 1.5))
+            painter.drawPolyline(QtGui.QPolygonF(points))
+
+        painter.setPen(self.text_color)
+        painter.drawText(
+            self.rect().adjusted(2, 0, -2, 0),
+            Qt.AlignTop | Qt.AlignLeft,
+            "{}/s".format(lib.pretty_size(
+                self._history[-1]["bytes_per_second"])))
+
+
 class HorizontalHeader(QtWidgets.QHeaderView):
     """Reiplemented QHeaderView to contain clickable changeable button"""
     def __init__(self, parent=None):
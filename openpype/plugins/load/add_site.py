@@ -22,11 +22,14 @@ class AddSyncSite(api.Loader):
 
     @staticmethod
     def add_site_to_representation(project_name, representation_id, site_name):
-        """Adds new site to representation_id, resets if exists"""
+        """Adds new site to representation_id, resets if exists.
+
+        Site is requested by artist, so it is synced before bulk queue.
+        """
         manager = ModulesManager()
         sync_server = manager.modules_by_name["sync_server"]
         sync_server.add_site(project_name, representation_id, site_name,
-                             force=True)
+                             force=True, priority=sync_server.HIGH_PRIORITY)
 
     def filepath_from_context(self, context):
         """No real file loading"""
@@ -1,18 +1,32 @@
 import os
 import re
 import copy
+import collections
 import json
+import tempfile
+import fractions
 
 import clique
 
 import pyblish.api
+import openpype
 import openpype.api
 from openpype.lib import (
     get_ffmpeg_tool_path,
+    get_pype_execute_args,
+    SubprocessJob,
+    SubprocessPool,
     ffprobe_streams,
     should_decompress,
     get_decompress_dir,
-    decompress
+    decompress,
+    find_burnin_profile,
+    filter_burnins_by_families,
+    filter_burnins_by_tags,
+    prepare_burnin_options,
+    prepare_burnin_values,
+    prepare_basic_burnin_data,
+    prepare_repre_burnin_data
 )
 
 
@@ -53,6 +67,15 @@ class ExtractReview(pyblish.api.InstancePlugin):
 
     # Preset attributes
     profiles = None
+    # Outputs of representation with same input arguments are encoded by
+    # single ffmpeg process so input is decoded only once
+    single_pass_outputs = False
+    # Burnins defined in ExtractBurnin settings are drawn during encoding of
+    # review instead of encoding review output again in ExtractBurnin
+    burnins_in_review = False
+    # Count of ffmpeg processes running in parallel, based on cpu count when
+    # set to 0
+    parallel_jobs = 0
 
     def process(self, instance):
         self.log.debug(instance.data["representations"])
@@ -119,6 +142,12 @@ class ExtractReview(pyblish.api.InstancePlugin):
             definition["filename_suffix"] = filename_suffix
             profile_outputs.append(definition)
 
+        burnin_defs = None
+        if self.burnins_in_review:
+            burnin_defs = self.burnin_definitions(
+                instance, host_name, task_name, family
+            )
+
         # Loop through representations
         for repre in tuple(instance.data["representations"]):
             repre_name = str(repre.get("name"))
@@ -163,6 +192,8 @@ class ExtractReview(pyblish.api.InstancePlugin):
                 ).format(str(tags)))
                 continue
 
+            output_jobs = []
+            unsupported_input = False
             for _output_def in outputs:
                 output_def = copy.deepcopy(_output_def)
                 # Make sure output definition has "tags" key
@@ -195,17 +226,30 @@ class ExtractReview(pyblish.api.InstancePlugin):
                     if 'exr' in temp_data["origin_repre"]["ext"]:
                         self.log.debug("Unsupported compression on input " +
                                        "files. Skipping!!!")
-                        return
+                        unsupported_input = True
+                        break
                     raise
 
-                subprcs_cmd = " ".join(ffmpeg_args)
+                if burnin_defs and self.add_burnin_filters(
+                    instance, new_repre, output_def, temp_data, burnin_defs
+                ):
+                    ffmpeg_args = self.ffmpeg_full_args(
+                        *temp_data["ffmpeg_args_parts"]
+                    )
+
+                output_jobs.append({
+                    "output_def": output_def,
+                    "new_repre": new_repre,
+                    "temp_data": temp_data,
+                    "ffmpeg_args": ffmpeg_args
+                })
 
-                # run subprocess
-                self.log.debug("Executing: {}".format(subprcs_cmd))
+            self.run_output_jobs(output_jobs)
 
-                openpype.api.run_subprocess(
-                    subprcs_cmd, shell=True, logger=self.log
-                )
+            for output_job in output_jobs:
+                output_def = output_job["output_def"]
+                new_repre = output_job["new_repre"]
+                temp_data = output_job["temp_data"]
 
                 output_name = output_def["filename_suffix"]
                 if temp_data["without_handles"]:
@@ -231,6 +275,160 @@ class ExtractReview(pyblish.api.InstancePlugin):
                 )
                 instance.data["representations"].append(new_repre)
 
+            if unsupported_input:
+                return
+
+    def run_output_jobs(self, output_jobs):
+        """Run ffmpeg for prepared outputs of one representation.
+
+        With `single_pass_outputs` are outputs with same input arguments
+        encoded by one ffmpeg process. Outputs are encoded one by one when
+        they can't share input or when single pass fails. Independent ffmpeg
+        processes run in parallel (see `parallel_jobs`).
+
+        Args:
+            output_jobs (list): Dictionaries with "ffmpeg_args" and
+                "temp_data" of each output.
+        """
+        if self.single_pass_outputs:
+            groups = self.group_output_jobs(output_jobs)
+        else:
+            groups = [[output_job] for output_job in output_jobs]
+
+        subprocess_pool = SubprocessPool(self.parallel_jobs, logger=self.log)
+        group_jobs = []
+        for group in groups:
+            if len(group) > 1:
+                ffmpeg_args = self.single_pass_ffmpeg_args(group)
+            else:
+                ffmpeg_args = group[0]["ffmpeg_args"]
+            group_jobs.append(self.ffmpeg_job(ffmpeg_args))
+
+        subprocess_pool.run(group_jobs, raise_error=False)
+
+        fallback_jobs = []
+        for group, group_job in zip(groups, group_jobs):
+            if not group_job.failed:
+                continue
+
+            if len(group) == 1:
+                raise RuntimeError(group_job.error)
+
+            self.log.warning((
+                "Single pass encoding of {} outputs failed."
+                " Encoding outputs one by one. {}"
+            ).format(len(group), group_job.error))
+            for output_job in group:
+                fallback_jobs.append(
+                    self.ffmpeg_job(output_job["ffmpeg_args"])
+                )
+
+        if fallback_jobs:
+            subprocess_pool.run(fallback_jobs)
+
+    def ffmpeg_job(self, ffmpeg_args):
+        """Subprocess job running ffmpeg with passed arguments."""
+        subprcs_cmd = " ".join(ffmpeg_args)
+        self.log.debug("Executing: {}".format(subprcs_cmd))
+
+        # Output path is last argument
+        label = os.path.basename(ffmpeg_args[-1].strip("\""))
+        return SubprocessJob(subprcs_cmd, shell=True, label=label)
+
+    def group_output_jobs(self, output_jobs):
+        """Group outputs which can be encoded by single ffmpeg process.
+
+        Outputs can share process when their input arguments are same and
+        their filters can be placed into filter graph.
+
+        Returns:
+            list: Lists of output jobs, order of outputs is kept.
+        """
+        groups = collections.OrderedDict()
+        for idx, output_job in enumerate(output_jobs):
+            input_args, video_filters, audio_filters, output_args = (
+                output_job["temp_data"]["ffmpeg_args_parts"]
+            )
+            key = tuple(input_args)
+            if not self.can_share_input(
+                input_args, video_filters, audio_filters, output_args
+            ):
+                key = idx
+            groups.setdefault(key, []).append(output_job)
+        return list(groups.values())
+
+    def inputs_count(self, input_args):
+        """Count of input files ("-i" arguments) in ffmpeg arguments."""
+        return len([arg for arg in input_args if arg.startswith("-i ")])
+
+    def can_share_input(
+        self, input_args, video_filters, audio_filters, output_args
+    ):
+        """Output's arguments allow to use it in filter graph with split."""
+        # Multiple audio inputs are merged by 'amerge' filter graph
+        inputs_count = self.inputs_count(input_args)
+        if inputs_count > 2:
+            return False
+
+        for arg in output_args:
+            for identifier in ("-filter_complex", "-lavfi", "-map"):
+                if arg.startswith(identifier):
+                    return False
+
+        for filter_str in video_filters + audio_filters:
+            # labels, filter chains or quotes of filter graph
+            for char in ("[", ";", "\""):
+                if char in filter_str:
+                    return False
+        return True
+
+    def single_pass_ffmpeg_args(self, output_jobs):
+        """FFmpeg arguments encoding all outputs from one decoded input.
+
+        Video input is split in filter graph into branch for each output,
+        video filters of output are applied on its branch. Audio of audio
+        input, or of the video input when there is no audio input, is mapped
+        to each output if it has any.
+
+        Args:
+            output_jobs (list): Outputs with same input arguments.
+
+        Returns:
+            list: Containing all arguments ready to run in subprocess.
+        """
+        input_args = output_jobs[0]["temp_data"]["ffmpeg_args_parts"][0]
+        inputs_count = self.inputs_count(input_args)
+
+        graph = ["[0:v]split={}{}".format(
+            len(output_jobs),
+            "".join("[s{}]".format(idx) for idx in range(len(output_jobs)))
+        )]
+        all_output_args = []
+        for idx, output_job in enumerate(output_jobs):
+            _, video_filters, audio_filters, output_args = (
+                output_job["temp_data"]["ffmpeg_args_parts"]
+            )
+            graph.append("[s{0}]{1}[v{0}]".format(
+                idx, ",".join(video_filters) or "null"
+            ))
+            all_output_args.append("-map \"[v{}]\"".format(idx))
+            # Streams are not selected automatically when any is mapped
+            if inputs_count > 1:
+                all_output_args.append("-map 1:a?")
+            else:
+                all_output_args.append("-map 0:a?")
+            if audio_filters:
+                all_output_args.append(
+                    "-filter:a {}".format(",".join(audio_filters))
+                )
+            all_output_args.extend(output_args)
+
+        all_args = ["\"{}\"".format(self.ffmpeg_path)]
+        all_args.extend(input_args)
+        all_args.append("-filter_complex \"{}\"".format(";".join(graph)))
+        all_args.extend(all_output_args)
+        return all_args
+
     def input_is_sequence(self, repre):
         """Deduce from representation data if input is sequence."""
         # TODO GLOBAL ISSUE - Find better way how to find out if input
@@ -313,7 +511,9 @@ class ExtractReview(pyblish.api.InstancePlugin):
             "input_is_sequence": self.input_is_sequence(repre),
             "with_audio": with_audio,
             "without_handles": without_handles,
-            "handles_are_set": handles_are_set
+            "handles_are_set": handles_are_set,
+            # Persist ffprobe results in staging dir which may not be in temp
+            "staging_dir": instance.data.get("stagingDir")
         }
 
     def _ffmpeg_arguments(self, output_def, instance, new_repre, temp_data):
@@ -464,12 +664,14 @@ class ExtractReview(pyblish.api.InstancePlugin):
             "\"{}\"".format(temp_data["full_output_path"])
         )
 
-        return self.ffmpeg_full_args(
+        # Keep arguments separated for single pass of multiple outputs
+        temp_data["ffmpeg_args_parts"] = self.ffmpeg_args_parts(
             ffmpeg_input_args,
             ffmpeg_video_filters,
             ffmpeg_audio_filters,
             ffmpeg_output_args
         )
+        return self.ffmpeg_full_args(*temp_data["ffmpeg_args_parts"])
 
     def split_ffmpeg_args(self, in_args):
         """Makes sure all entered arguments are separated in individual items.
@@ -512,6 +714,41 @@ class ExtractReview(pyblish.api.InstancePlugin):
         Returns:
             list: Containing all arguments ready to run in subprocess.
         """
+        input_args, video_filters, audio_filters, output_args = (
+            self.ffmpeg_args_parts(
+                input_args, video_filters, audio_filters, output_args
+            )
+        )
+
+        all_args = []
+        all_args.append("\"{}\"".format(self.ffmpeg_path))
+        all_args.extend(input_args)
+        if video_filters:
+            video_filters_str = ",".join(video_filters)
+            # Burnin filters are escaped for double quoted argument
+            if any(
+                filter_str.startswith("drawtext=")
+                for filter_str in video_filters
+            ):
+                video_filters_str = "\"{}\"".format(video_filters_str)
+            all_args.append("-filter:v {}".format(video_filters_str))
+
+        if audio_filters:
+            all_args.append("-filter:a {}".format(",".join(audio_filters)))
+
+        all_args.extend(output_args)
+
+        return all_args
+
+    def ffmpeg_args_parts(
+        self, input_args, video_filters, audio_filters, output_args
+    ):
+        """Move video and audio filters from output arguments to filters.
+
+        Returns:
+            tuple: Input arguments, video filters, audio filters and output
+                arguments.
+        """
         output_args = self.split_ffmpeg_args(output_args)
 
         video_args_dentifiers = ["-vf", "-filter:v"]
@@ -529,18 +766,7 @@ class ExtractReview(pyblish.api.InstancePlugin):
                     arg = arg.replace(identifier, "").strip()
                     audio_filters.append(arg)
 
-        all_args = []
-        all_args.append("\"{}\"".format(self.ffmpeg_path))
-        all_args.extend(input_args)
-        if video_filters:
-            all_args.append("-filter:v {}".format(",".join(video_filters)))
-
-        if audio_filters:
-            all_args.append("-filter:a {}".format(",".join(audio_filters)))
-
-        all_args.extend(output_args)
-
-        return all_args
+        return input_args, video_filters, audio_filters, output_args
 
     def input_output_paths(self, new_repre, output_def, temp_data):
         """Deduce input nad output file paths based on entered data.
@@ -823,7 +1049,7 @@ class ExtractReview(pyblish.api.InstancePlugin):
         # NOTE Skipped using instance's resolution
         full_input_path_single_file = temp_data["full_input_path_single_file"]
         input_data = ffprobe_streams(
-            full_input_path_single_file, self.log
+            full_input_path_single_file, self.log, temp_data["staging_dir"]
         )[0]
         input_width = int(input_data["width"])
         input_height = int(input_data["height"])
@@ -1018,6 +1244,170 @@ class ExtractReview(pyblish.api.InstancePlugin):
 
         return filters
 
+    def burnin_definitions(self, instance, host_name, task_name, family):
+        """Burnin definitions from ExtractBurnin settings for the instance.
+
+        Returns:
+            dict/None: Burnin "definitions" by filename suffix filtered by
+                instance families with global "options" and "fields" or None
+                when burnins are not set for the instance.
+        """
+        project_settings = instance.context.data.get("project_settings") or {}
+        burnin_settings = (
+            project_settings.get("global", {})
+            .get("publish", {})
+            .get("ExtractBurnin")
+        ) or {}
+        if not burnin_settings.get("enabled", True):
+            return None
+
+        profile = find_burnin_profile(
+            burnin_settings.get("profiles"),
+            host_name,
+            task_name,
+            family,
+            self.log
+        )
+        if not profile:
+            return None
+
+        definitions = filter_burnins_by_families(
+            profile, self.families_from_instance(instance)
+        )
+        if not definitions:
+            return None
+
+        return {
+            "definitions": definitions,
+            "options": burnin_settings.get("options") or {},
+            "fields": burnin_settings.get("fields") or {}
+        }
+
+    def add_burnin_filters(
+        self, instance, new_repre, output_def, temp_data, burnin_defs
+    ):
+        """Add burnin filters of ExtractBurnin to output's video filters.
+
+        Only outputs with "burnin" tag matching exactly one burnin definition
+        are processed, multiple burnin outputs are still created by
+        ExtractBurnin. Burnins are positioned by output resolution and
+        frame rate so result is same as when output is burned by
+        ExtractBurnin. "burnin" tag is removed from new representation so
+        ExtractBurnin skips it.
+
+        Returns:
+            bool: Burnin filters were added.
+        """
+        if "burnin" not in new_repre["tags"]:
+            return False
+
+        repre_burnin_defs = filter_burnins_by_tags(
+            burnin_defs["definitions"], new_repre["tags"]
+        )
+        if len(repre_burnin_defs) != 1:
+            return False
+        burnin_def = list(repre_burnin_defs.values())[0]
+
+        # Stream data of output, resolution and fps are same as would be
+        # probed by ExtractBurnin from encoded output
+        full_input_path = temp_data["full_input_path_single_file"]
+        stream = copy.deepcopy(ffprobe_streams(
+            full_input_path, self.log, temp_data["staging_dir"]
+        )[0])
+        fps = fractions.Fraction(temp_data["fps"]).limit_denominator(1001)
+        stream.update({
+            "width": new_repre["resolutionWidth"],
+            "height": new_repre["resolutionHeight"],
+            "r_frame_rate": "{}/{}".format(fps.numerator, fps.denominator)
+        })
+
+        script_data = {
+            "input": full_input_path,
+            "burnin_data": self.prepare_burnin_data(
+                instance, new_repre, output_def
+            ),
+            "options": prepare_burnin_options(
+                burnin_defs["options"], burnin_def
+            ),
+            "values": prepare_burnin_values(burnin_defs["fields"], burnin_def),
+            "streams": [stream]
+        }
+        filters = self.burnin_filters(script_data)
+        if not filters:
+            return False
+
+        temp_data["ffmpeg_args_parts"][1].extend(filters)
+        new_repre["tags"].remove("burnin")
+        self.log.info("Added burnins to ffmpeg command.")
+        return True
+
+    def prepare_burnin_data(self, instance, new_repre, output_def):
+        """Data for filling burnin strings, same as ExtractBurnin prepares.
+
+        Returns:
+            dict: Data for burnin script.
+        """
+        burnin_data, temp_data = prepare_basic_burnin_data(
+            instance, self.log
+        )
+        # Name of new representation is set after encoding
+        burnin_repre = dict(new_repre, name=output_def["filename_suffix"])
+        prepare_repre_burnin_data(
+            instance, burnin_repre, burnin_data, temp_data
+        )
+        return burnin_data
+
+    def burnin_filters(self, script_data):
+        """Drawtext filters of burnins created by burnin script.
+
+        Args:
+            script_data (dict): Input path, burnin data, options, values and
+                streams for burnin script.
+
+        Returns:
+            list: Drawtext filters for ffmpeg.
+        """
+        filters_file = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".json", delete=False
+        )
+        filters_file.close()
+        filters_filepath = filters_file.name.replace("\\", "/")
+        script_data["filters_output"] = filters_filepath
+
+        self.log.debug(
+            "script_data: {}".format(json.dumps(script_data, indent=4))
+        )
+
+        temporary_json_file = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".json", delete=False
+        )
+        temporary_json_file.write(json.dumps(script_data))
+        temporary_json_file.close()
+        temporary_json_filepath = temporary_json_file.name.replace(
+            "\\", "/"
+        )
+
+        scriptpath = os.path.normpath(os.path.join(
+            openpype.PACKAGE_DIR, "scripts", "otio_burnin.py"
+        ))
+        args = get_pype_execute_args("run", scriptpath)
+        args.append(temporary_json_filepath)
+        self.log.debug("Executing: {}".format(" ".join(args)))
+
+        # Environments for script process
+        env = os.environ.copy()
+        env.pop("PYTHONPATH", None)
+        try:
+            openpype.api.run_subprocess(
+                args, shell=True, logger=self.log, env=env
+            )
+            with open(filters_filepath, "r") as stream:
+                return json.load(stream)["filters"]
+
+        finally:
+            os.remove(temporary_json_filepath)
+            os.remove(filters_filepath)
+
     def main_family_from_instance(self, instance):
         """Returns main family of entered instance."""
         family = instance.data.get("family")
@@ -26,7 +26,11 @@ class ExtractReviewSlate(openpype.api.Extractor):
         slate_path = inst_data.get("slateFrame")
         ffmpeg_path = openpype.lib.get_ffmpeg_tool_path("ffmpeg")
 
-        slate_stream = openpype.lib.ffprobe_streams(slate_path, self.log)[0]
+        # Persist ffprobe results in staging dir which may not be in temp
+        staging_dir = inst_data.get("stagingDir")
+        slate_stream = openpype.lib.ffprobe_streams(
+            slate_path, self.log, staging_dir
+        )[0]
         slate_width = slate_stream["width"]
         slate_height = slate_stream["height"]
 
@@ -116,7 +120,7 @@ class ExtractReviewSlate(openpype.api.Extractor):
                 output_args.extend(repre["_profile"].get('output', []))
             else:
                 # Codecs are copied from source for whole input
-                codec_args = self.codec_args(repre)
+                codec_args = self.codec_args(repre, staging_dir)
                 output_args.extend(codec_args)
 
             # make sure colors are correct
@@ -287,8 +291,14 @@ class ExtractReviewSlate(openpype.api.Extractor):
 
         return vf_back
 
-    def codec_args(self, repre):
-        """Detect possible codec arguments from representation."""
+    def codec_args(self, repre, staging_dir=None):
+        """Detect possible codec arguments from representation.
+
+        Args:
+            repre (dict): Representation with input file.
+            staging_dir (str): Staging directory of instance where ffprobe
+                result is persisted.
+        """
         codec_args = []
 
         # Get one filename of representation files
@@ -301,7 +311,9 @@ class ExtractReviewSlate(openpype.api.Extractor):
 
         try:
             # Get information about input file via ffprobe tool
-            streams = openpype.lib.ffprobe_streams(full_input_path, self.log)
+            streams = openpype.lib.ffprobe_streams(
+                full_input_path, self.log, staging_dir
+            )
         except Exception:
             self.log.warning(
                 "Could not get codec data from input.",
@@ -8,6 +8,7 @@ from pymongo import InsertOne, ReplaceOne
 import pyblish.api
 from avalon import api, io, schema
 from avalon.vendor import filelink
+from openpype.lib import get_content_store
 
 
 class IntegrateHeroVersion(pyblish.api.InstancePlugin):
@@ -32,6 +33,8 @@ class IntegrateHeroVersion(pyblish.api.InstancePlugin):
         "project", "asset", "task", "subset", "representation",
         "family", "hierarchy", "task", "username"
     ]
+    # Cross drive files are hardlinked from content store instead of copy
+    content_store_enabled = False
     # TODO add family filtering
     # QUESTION/TODO this process should happen on server if crashed due to
     # permissions error on files (files were used or user didn't have perms)
@@ -274,7 +277,7 @@ class IntegrateHeroVersion(pyblish.api.InstancePlugin):
                 anatomy_data.pop("version", None)
 
                 # Get filled path to repre context
-                anatomy_filled = anatomy.format(anatomy_data)
+                anatomy_filled = anatomy.format(anatomy_data, lazy=True)
                 template_filled = anatomy_filled["hero"]["path"]
 
                 repre_data = {
@@ -318,7 +321,7 @@ class IntegrateHeroVersion(pyblish.api.InstancePlugin):
                     # Get head and tail for collection
                     frame_splitter = "_-_FRAME_SPLIT_-_"
                     anatomy_data["frame"] = frame_splitter
-                    _anatomy_filled = anatomy.format(anatomy_data)
+                    _anatomy_filled = anatomy.format(anatomy_data, lazy=True)
                     _template_filled = _anatomy_filled["hero"]["path"]
                     head, tail = _template_filled.split(frame_splitter)
                     padding = int(
@@ -395,10 +398,10 @@ class IntegrateHeroVersion(pyblish.api.InstancePlugin):
             # TODO should we *only* create hardlinks?
             # TODO should we keep files for deletion until this is successful?
             for src_path, dst_path in src_to_dst_file_paths:
-                self.copy_file(src_path, dst_path)
+                self.copy_file(src_path, dst_path, anatomy)
 
             for src_path, dst_path in other_file_paths_mapping:
-                self.copy_file(src_path, dst_path)
+                self.copy_file(src_path, dst_path, anatomy)
 
             # Archive not replaced old representations
             for repre_name_low, repre in old_repres_to_delete.items():
@@ -498,7 +501,7 @@ class IntegrateHeroVersion(pyblish.api.InstancePlugin):
 
         return publish_folder
 
-    def copy_file(self, src_path, dst_path):
+    def copy_file(self, src_path, dst_path, anatomy=None):
         # TODO check drives if are the same to check if cas hardlink
         dirname = os.path.dirname(dst_path)
 
@@ -527,6 +530,13 @@ class IntegrateHeroVersion(pyblish.api.InstancePlugin):
             if exc.errno != errno.EXDEV:
                 raise
 
+        # Hardlink from content store of destination root
+        if self.content_store_enabled and anatomy is not None:
+            store = get_content_store(anatomy, dst_path)
+            if store is not None:
+                store.link_file(src_path, dst_path)
+                return
+
         shutil.copy(src_path, dst_path)
 
     def version_from_representations(self, repres):
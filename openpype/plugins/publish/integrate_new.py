@@ -1,5 +1,4 @@
 import os
-from os.path import getsize
 import logging
 import sys
 import copy
@@ -9,20 +8,20 @@ import six
 import re
 import shutil
 
-from pymongo import DeleteOne, InsertOne
+from pymongo import DeleteMany, InsertOne, UpdateOne
 import pyblish.api
 from avalon import io
 from avalon.vendor import filelink
 import openpype.api
+from openpype.lib import (
+    FileTransfers,
+    FileTransferError,
+    get_content_store,
+    replace_file
+)
 from datetime import datetime
 # from pype.modules import ModulesManager
 
-# this is needed until speedcopy for linux is fixed
-if sys.platform == "win32":
-    from speedcopy import copyfile
-else:
-    from shutil import copyfile
-
 log = logging.getLogger(__name__)
 
 
@@ -103,6 +102,14 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
     ]
     default_template_name = "publish"
     template_name_profiles = None
+    # Parallel file transfers
+    transfer_workers = 4
+    transfer_retries = 2
+    transfer_verification = "size"
+    # Published files of these families are hardlinked from content store
+    # - all families are used when list is empty
+    content_store_enabled = False
+    content_store_families = []
 
     # file_url : file_size of all published and uploaded files
     integrated_file_sizes = {}
@@ -138,15 +145,12 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
         project_entity = instance.data["projectEntity"]
 
         context_asset_name = context.data["assetEntity"]["name"]
+        entities_cache = self.get_context_entities(context)
 
         asset_name = instance.data["asset"]
         asset_entity = instance.data.get("assetEntity")
         if not asset_entity or asset_entity["name"] != context_asset_name:
-            asset_entity = io.find_one({
-                "type": "asset",
-                "name": asset_name,
-                "parent": project_entity["_id"]
-            })
+            asset_entity = entities_cache["assets"].get(asset_name)
             assert asset_entity, (
                 "No asset found by the name \"{0}\" in project \"{1}\""
             ).format(asset_name, project_entity["name"])
@@ -188,7 +192,10 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
             )
         )
 
-        subset = self.get_subset(asset_entity, instance)
+        # All documents of the instance are written with one ordered bulk
+        #   write after files are integrated
+        bulk_writes = []
+        subset = self.get_subset(asset_entity, instance, bulk_writes)
         instance.data["subsetEntity"] = subset
 
         version_number = instance.data["version"]
@@ -212,36 +219,40 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
 
         new_repre_names_low = [_repre["name"].lower() for _repre in repres]
 
-        existing_version = io.find_one({
-            'type': 'version',
-            'parent': subset["_id"],
-            'name': version_number
-        })
+        existing_version = entities_cache["versions"].get(
+            (subset["_id"], version_number)
+        )
 
+        # Representations which will be replaced by new representations
+        # - ids of archived representations are reused by representations
+        #   with the same name
+        existing_repres = []
         if existing_version is None:
-            version_id = io.insert_one(version).inserted_id
+            version["_id"] = io.ObjectId()
+            bulk_writes.append(InsertOne(version))
         else:
             # Check if instance have set `append` mode which cause that
             # only replicated representations are set to archive
             append_repres = instance.data.get("append", False)
 
             # Update version data
-            # TODO query by _id and
-            io.update_many({
-                'type': 'version',
-                'parent': subset["_id"],
-                'name': version_number
-            }, {
-                '$set': version
-            })
-            version_id = existing_version['_id']
-
-            # Find representations of existing version and archive them
-            current_repres = list(io.find({
-                "type": "representation",
-                "parent": version_id
-            }))
-            bulk_writes = []
+            bulk_writes.append(UpdateOne(
+                {"_id": existing_version["_id"]},
+                {"$set": version}
+            ))
+            _version = copy.deepcopy(existing_version)
+            _version.update(version)
+            version = _version
+
+            current_repres = []
+            for repre in entities_cache["representations"].get(
+                version["_id"], []
+            ):
+                if repre["type"] == "archived_representation":
+                    existing_repres.append(repre)
+                else:
+                    current_repres.append(repre)
+
             for repre in current_repres:
                 if append_repres:
                     # archive only duplicated representations
@@ -250,28 +261,14 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
                 # Representation must change type,
                 # `_id` must be stored to other key and replaced with new
                 # - that is because new representations should have same ID
-                repre_id = repre["_id"]
-                bulk_writes.append(DeleteOne({"_id": repre_id}))
-
-                repre["orig_id"] = repre_id
-                repre["_id"] = io.ObjectId()
+                repre = copy.deepcopy(repre)
+                repre["orig_id"] = repre["_id"]
                 repre["type"] = "archived_representation"
-                bulk_writes.append(InsertOne(repre))
-
-            # bulk updates
-            if bulk_writes:
-                io._database[io.Session["AVALON_PROJECT"]].bulk_write(
-                    bulk_writes
-                )
+                existing_repres.append(repre)
 
-        version = io.find_one({"_id": version_id})
+        version_id = version["_id"]
         instance.data["versionEntity"] = version
 
-        existing_repres = list(io.find({
-            "parent": version_id,
-            "type": "archived_representation"
-        }))
-
         instance.data['version'] = version['name']
 
         intent_value = instance.context.data.get("intent")
@@ -371,7 +368,7 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
                 test_dest_files = list()
                 for i in [1, 2]:
                     template_data["frame"] = src_padding_exp % i
-                    anatomy_filled = anatomy.format(template_data)
+                    anatomy_filled = anatomy.format(template_data, lazy=True)
                     template_filled = anatomy_filled[template_name]["path"]
                     if repre_context is None:
                         repre_context = template_filled.used_values
@@ -466,7 +463,7 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
                 )
 
                 src = os.path.join(stagingdir, fname)
-                anatomy_filled = anatomy.format(template_data)
+                anatomy_filled = anatomy.format(template_data, lazy=True)
                 template_filled = anatomy_filled[template_name]["path"]
                 repre_context = template_filled.used_values
                 dst = os.path.normpath(template_filled)
@@ -557,12 +554,23 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
             repre_ids_to_remove = []
             for repre in existing_repres:
                 repre_ids_to_remove.append(repre["_id"])
-            io.delete_many({"_id": {"$in": repre_ids_to_remove}})
+            bulk_writes.append(
+                DeleteMany({"_id": {"$in": repre_ids_to_remove}})
+            )
 
         for rep in instance.data["representations"]:
             self.log.debug("__ rep: {}".format(rep))
 
-        io.insert_many(representations)
+        for representation in representations:
+            bulk_writes.append(InsertOne(representation))
+
+        io._database[io.Session["AVALON_PROJECT"]].bulk_write(
+            bulk_writes, ordered=True
+        )
+        self.update_context_entities(
+            entities_cache, subset, version, representations, existing_repres
+        )
+
         instance.data["published_representations"] = (
             published_representations
         )
@@ -574,6 +582,10 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
 
             Through `instance.data["transfers"]`
 
+            Files are copied in parallel with `transfer_workers` threads,
+            each failed copy is retried `transfer_retries` times and copied
+            files are verified with `transfer_verification`.
+
             Args:
                 instance: the instance to integrate
             Returns:
@@ -582,13 +594,30 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
         """
         # store destination url and size for reporting and rollback
         integrated_file_sizes = {}
-        transfers = list(instance.data.get("transfers", list()))
-        for src, dest in transfers:
+        transfers = []
+        for src, dest in instance.data.get("transfers", list()):
             if os.path.normpath(src) != os.path.normpath(dest):
-                dest = self.get_dest_temp_url(dest)
-                self.copy_file(src, dest)
+                transfers.append((src, self.get_dest_temp_url(dest)))
+
+        if transfers and self.is_content_store_used(instance):
+            transfers = self.link_from_content_store(
+                instance, transfers, integrated_file_sizes
+            )
+
+        if transfers:
+            self.log.debug("Copying {} files with {} workers ...".format(
+                len(transfers), self.transfer_workers
+            ))
+            file_transfers = self._get_file_transfers()
+            try:
                 # TODO needs to be updated during site implementation
-                integrated_file_sizes[dest] = os.path.getsize(dest)
+                integrated_file_sizes.update(
+                    file_transfers.copy_files(transfers)
+                )
+            except FileTransferError as exc:
+                # Copied files must be removed on rollback
+                self.integrated_file_sizes.update(exc.transferred)
+                raise
 
         # Produce hardlinked copies
         # Note: hardlink can only be produced between two files on the same
@@ -607,46 +636,86 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
 
         return integrated_file_sizes
 
-    def copy_file(self, src, dst):
-        """ Copy given source to destination
+    def is_content_store_used(self, instance):
+        if not self.content_store_enabled:
+            return False
+
+        if not self.content_store_families:
+            return True
+
+        families = [instance.data["family"]]
+        families.extend(instance.data.get("families") or [])
+        for family in families:
+            if family in self.content_store_families:
+                return True
+        return False
+
+    def link_from_content_store(
+        self, instance, transfers, integrated_file_sizes
+    ):
+        """Hardlink destination files from content store of their root.
+
+        Content of source files is stored to store only if it is not stored
+        yet, so unchanged files cost only calculation of hash.
+
+        Args:
+            instance: Instance which is integrated.
+            transfers (list): Source and destination path pairs.
+            integrated_file_sizes (dict): Sizes of linked files are added.
 
-        Arguments:
-            src (str): the source file which needs to be copied
-            dst (str): the destination of the sourc file
         Returns:
-            None
+            list: Transfers which are not in any root and must be copied.
         """
-        src = os.path.normpath(src)
-        dst = os.path.normpath(dst)
-        self.log.debug("Copying file ... {} -> {}".format(src, dst))
-        dirname = os.path.dirname(dst)
-        try:
-            os.makedirs(dirname)
-        except OSError as e:
-            if e.errno == errno.EEXIST:
-                pass
+        anatomy = instance.context.data["anatomy"]
+        remaining_transfers = []
+        store_transfers = []
+        for src, dst in transfers:
+            store = get_content_store(anatomy, dst)
+            if store is None:
+                remaining_transfers.append((src, dst))
             else:
-                self.log.critical("An unexpected error occurred.")
-                six.reraise(*sys.exc_info())
+                store_transfers.append((store, src, dst))
 
-        # copy file with speedcopy and check if size of files are simetrical
-        while True:
-            if not shutil._samefile(src, dst):
-                copyfile(src, dst)
-            else:
-                self.log.critical(
-                    "files are the same {} to {}".format(src, dst)
-                )
-                os.remove(dst)
-                try:
-                    shutil.copyfile(src, dst)
-                    self.log.debug("Copying files with shutil...")
-                except OSError as e:
-                    self.log.critical("Cannot copy {} to {}".format(src, dst))
-                    self.log.critical(e)
-                    six.reraise(*sys.exc_info())
-            if str(getsize(src)) in str(getsize(dst)):
-                break
+        if not store_transfers:
+            return remaining_transfers
+
+        # Register destinations for removal in case of failure
+        for _store, _src, dst in store_transfers:
+            self.integrated_file_sizes[dst] = 0
+
+        def _link_file(item):
+            store, src, dst = item
+            self.log.debug(
+                "Linking from content store ... {} -> {}".format(src, dst)
+            )
+            return store.link_file(src, dst)
+
+        file_transfers = self._get_file_transfers()
+        results = file_transfers.process_files(_link_file, store_transfers)
+        reused_count = 0
+        reused_size = 0
+        for (_store, _src, dst), reused in results:
+            size = os.path.getsize(dst)
+            integrated_file_sizes[dst] = size
+            if reused:
+                reused_count += 1
+                reused_size += size
+
+        self.log.info((
+            "Linked {} files from content store,"
+            " {} were already stored ({:.1f} MB saved)"
+        ).format(
+            len(store_transfers), reused_count, reused_size / (1024.0 ** 2)
+        ))
+        return remaining_transfers
+
+    def _get_file_transfers(self):
+        return FileTransfers(
+            workers=self.transfer_workers,
+            retries=self.transfer_retries,
+            verification=self.transfer_verification,
+            logger=self.log
+        )
 
     def hardlink_file(self, src, dst):
         dirname = os.path.dirname(dst)
@@ -662,13 +731,128 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
 
         filelink.create(src, dst, filelink.HARDLINK)
 
-    def get_subset(self, asset, instance):
+    def get_context_entities(self, context):
+        """Query documents related to all instances in context.
+
+        Assets, subsets, versions and representations which may be affected
+        by publishing are queried only once per context (with one query per
+        document type) and are shared by all integrated instances.
+
+        Returns:
+            dict: Documents by type. Assets are stored by name, subsets by
+                parent id and name, versions by parent id and version number
+                and representations by version id.
+        """
+        entities_cache = context.data.get("integrateEntitiesCache")
+        if entities_cache is not None:
+            return entities_cache
+
+        project_entity = context.data["projectEntity"]
+        context_asset = context.data["assetEntity"]
+
+        asset_names = set()
+        subset_names = set()
+        version_numbers = set()
+        for instance in context:
+            asset_name = instance.data.get("asset")
+            if asset_name and asset_name != context_asset["name"]:
+                asset_names.add(asset_name)
+
+            subset_name = instance.data.get("subset")
+            if subset_name:
+                subset_names.add(subset_name)
+
+            version_number = instance.data.get("version")
+            if version_number is not None:
+                version_numbers.add(version_number)
+
+        assets_by_name = {context_asset["name"]: context_asset}
+        if asset_names:
+            for asset in io.find({
+                "type": "asset",
+                "name": {"$in": list(asset_names)},
+                "parent": project_entity["_id"]
+            }):
+                assets_by_name[asset["name"]] = asset
+
+        subsets_by_key = {}
+        if subset_names:
+            asset_ids = [asset["_id"] for asset in assets_by_name.values()]
+            for subset in io.find({
+                "type": "subset",
+                "parent": {"$in": asset_ids},
+                "name": {"$in": list(subset_names)}
+            }):
+                subsets_by_key[(subset["parent"], subset["name"])] = subset
+
+        versions_by_key = {}
+        if subsets_by_key and version_numbers:
+            subset_ids = [subset["_id"] for subset in subsets_by_key.values()]
+            for version in io.find({
+                "type": "version",
+                "parent": {"$in": subset_ids},
+                "name": {"$in": list(version_numbers)}
+            }):
+                versions_by_key[(version["parent"], version["name"])] = (
+                    version
+                )
+
+        repres_by_version_id = {}
+        if versions_by_key:
+            version_ids = [
+                version["_id"] for version in versions_by_key.values()
+            ]
+            for repre in io.find({
+                "type": {
+                    "$in": ["representation", "archived_representation"]
+                },
+                "parent": {"$in": version_ids}
+            }):
+                repres_by_version_id.setdefault(
+                    repre["parent"], []
+                ).append(repre)
+
+        entities_cache = {
+            "assets": assets_by_name,
+            "subsets": subsets_by_key,
+            "versions": versions_by_key,
+            "representations": repres_by_version_id
+        }
+        context.data["integrateEntitiesCache"] = entities_cache
+        return entities_cache
+
+    def update_context_entities(
+        self, entities_cache, subset, version, representations, removed_repres
+    ):
+        """Store written documents to context cache."""
+        entities_cache["subsets"][(subset["parent"], subset["name"])] = subset
+        entities_cache["versions"][(version["parent"], version["name"])] = (
+            version
+        )
+        removed_ids = set(repre["_id"] for repre in removed_repres)
+        repres = [
+            repre
+            for repre in entities_cache["representations"].get(
+                version["_id"], []
+            )
+            if repre["_id"] not in removed_ids
+        ]
+        repres.extend(representations)
+        entities_cache["representations"][version["_id"]] = repres
+
+    def get_subset(self, asset, instance, bulk_writes):
+        """Subset document of instance.
+
+        Operations creating or updating the subset are added to passed
+        bulk writes.
+        """
         subset_name = instance.data["subset"]
-        subset = io.find_one({
-            "type": "subset",
-            "parent": asset["_id"],
-            "name": subset_name
-        })
+        entities_cache = self.get_context_entities(instance.context)
+        subset = entities_cache["subsets"].get((asset["_id"], subset_name))
+
+        families = [instance.data["family"]]
+        families.extend(instance.data.get("families", []))
+        subset_group = instance.data.get("subsetGroup")
 
         if subset is None:
             self.log.info("Subset '%s' not found, creating ..." % subset_name)
@@ -676,16 +860,8 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
             self.log.debug(
                 "families.  %s" % type(instance.data.get('families')))
 
-            family = instance.data.get("family")
-            families = []
-            if family:
-                families.append(family)
-
-            for _family in (instance.data.get("families") or []):
-                if _family not in families:
-                    families.append(_family)
-
-            _id = io.insert_one({
+            subset = {
+                "_id": io.ObjectId(),
                 "schema": "openpype:subset-3.0",
                 "type": "subset",
                 "name": subset_name,
@@ -693,27 +869,26 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
                     "families": families
                 },
                 "parent": asset["_id"]
-            }).inserted_id
-
-            subset = io.find_one({"_id": _id})
-
-        # add group if available
-        if instance.data.get("subsetGroup"):
-            io.update_many({
-                'type': 'subset',
-                '_id': io.ObjectId(subset["_id"])
-            }, {'$set': {'data.subsetGroup':
-                         instance.data.get('subsetGroup')}}
-            )
+            }
+            # add group if available
+            if subset_group:
+                subset["data"]["subsetGroup"] = subset_group
+            bulk_writes.append(InsertOne(subset))
+            return subset
 
+        subset = copy.deepcopy(subset)
         # Update families on subset.
-        families = [instance.data["family"]]
-        families.extend(instance.data.get("families", []))
-        io.update_many(
-            {"type": "subset", "_id": io.ObjectId(subset["_id"])},
-            {"$set": {"data.families": families}}
-        )
-
+        update_data = {"data.families": families}
+        subset.setdefault("data", {})["families"] = families
+        # add group if available
+        if subset_group:
+            update_data["data.subsetGroup"] = subset_group
+            subset["data"]["subsetGroup"] = subset_group
+
+        bulk_writes.append(UpdateOne(
+            {"_id": subset["_id"]},
+            {"$set": update_data}
+        ))
         return subset
 
     def create_version(self, subset, version_number, data=None):
@@ -1018,40 +1193,56 @@ class IntegrateAssetNew(pyblish.api.InstancePlugin):
                   'finalize' - rename files,
                                remove TMP_FILE_EXT suffix denoting temp file
         """
-        if integrated_file_sizes:
-            for file_url, _file_size in integrated_file_sizes.items():
-                if not os.path.exists(file_url):
-                    self.log.debug(
-                        "File {} was not found.".format(file_url)
-                    )
-                    continue
+        if not integrated_file_sizes:
+            return
 
-                try:
-                    if mode == 'remove':
-                        self.log.debug("Removing file {}".format(file_url))
-                        os.remove(file_url)
-                    if mode == 'finalize':
-                        new_name = re.sub(
-                            r'\.{}$'.format(self.TMP_FILE_EXT),
-                            '',
-                            file_url
-                        )
+        def _process_file(file_url):
+            if not os.path.exists(file_url):
+                self.log.debug(
+                    "File {} was not found.".format(file_url)
+                )
+                return
+
+            try:
+                if mode == 'remove':
+                    self.log.debug("Removing file {}".format(file_url))
+                    os.remove(file_url)
+                if mode == 'finalize':
+                    new_name = re.sub(
+                        r'\.{}$'.format(self.TMP_FILE_EXT),
+                        '',
+                        file_url
+                    )
 
-                        if os.path.exists(new_name):
-                            self.log.debug(
-                                "Overwriting file {} to {}".format(
-                                    file_url, new_name
-                                )
+                    if os.path.exists(new_name) and not (
+                        self._is_hardlinked(file_url)
+                        or self._is_hardlinked(new_name)
+                    ):
+                        self.log.debug(
+                            "Overwriting file {} to {}".format(
+                                file_url, new_name
                             )
-                            shutil.copy(file_url, new_name)
-                        else:
-                            self.log.debug(
-                                "Renaming file {} to {}".format(
-                                    file_url, new_name
-                                )
+                        )
+                        shutil.copy(file_url, new_name)
+                    else:
+                        # Hardlinked files (e.g. from content store) must
+                        #   not be overwritten as content of all links
+                        #   would change, link is replaced instead
+                        self.log.debug(
+                            "Renaming file {} to {}".format(
+                                file_url, new_name
                             )
-                            os.rename(file_url, new_name)
-                except OSError:
-                    self.log.error("Cannot {} file {}".format(mode, file_url),
-                                   exc_info=True)
-                    six.reraise(*sys.exc_info())
+                        )
+                        replace_file(file_url, new_name)
+            except OSError:
+                self.log.error("Cannot {} file {}".format(mode, file_url),
+                               exc_info=True)
+                six.reraise(*sys.exc_info())
+
+        file_transfers = self._get_file_transfers()
+        file_transfers.process_files(
+            _process_file, list(integrated_file_sizes.keys())
+        )
+
+    def _is_hardlinked(self, path):
+        return os.stat(path).st_nlink > 1
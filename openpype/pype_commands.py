@@ -113,6 +113,29 @@ class PypeCommands:
     def texture_copy(self, project, asset, path):
         pass
 
+    def content_store_gc(self, project, dry_run=False):
+        from openpype.lib import Anatomy, collect_content_store_garbage
+
+        anatomy = Anatomy(project)
+        result = collect_content_store_garbage(anatomy, dry_run)
+        for root, root_result in result.items():
+            print((
+                ">>> {}: {} {} unreferenced blobs ({:.1f} MB),"
+                " {:.1f} MB saved by stored blobs"
+            ).format(
+                root,
+                "Found" if dry_run else "Removed",
+                root_result["removed"],
+                root_result["removed_size"] / (1024.0 ** 2),
+                root_result["saved_size"] / (1024.0 ** 2)
+            ))
+
+    def prune_file_hash_cache(self, max_age_days=None):
+        from openpype.lib import get_file_hash_cache
+
+        removed = get_file_hash_cache().prune(max_age_days)
+        print(">>> Removed {} cached file hashes".format(removed))
+
     def run_application(self, app, project, asset, task, tools, arguments):
         pass
 
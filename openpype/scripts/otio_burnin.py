@@ -10,17 +10,12 @@ import openpype.lib
 
 
 ffmpeg_path = openpype.lib.get_ffmpeg_tool_path("ffmpeg")
-ffprobe_path = openpype.lib.get_ffmpeg_tool_path("ffprobe")
 
 
 FFMPEG = (
     '"{}" -i "%(input)s" %(filters)s %(args)s%(output)s'
 ).format(ffmpeg_path)
 
-FFPROBE = (
-    '"{}" -v quiet -print_format json -show_format -show_streams "%(source)s"'
-).format(ffprobe_path)
-
 DRAWTEXT = (
     "drawtext=fontfile='%(font)s':text=\\'%(text)s\\':"
     "x=%(x)s:y=%(y)s:fontcolor=%(color)s@%(opacity).1f:fontsize=%(size)d"
@@ -40,15 +35,13 @@ SOURCE_TIMECODE_KEY = "{source_timecode}"
 
 def _streams(source):
     """Reimplemented from otio burnins to be able use full path to ffprobe
+
+    Uses ffprobe cache of 'openpype.lib' so result of extractors probing
+    the same file in publish process is reused.
     :param str source: source media file
     :rtype: [{}, ...]
     """
-    command = FFPROBE % {'source': source}
-    proc = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE)
-    out = proc.communicate()[0]
-    if proc.returncode != 0:
-        raise RuntimeError("Failed to run: %s" % command)
-    return json.loads(out)['streams']
+    return openpype.lib.ffprobe_streams(source)
 
 
 def get_fps(str_value):
@@ -370,7 +363,8 @@ def example(input_path, output_path):
 
 def burnins_from_data(
     input_path, output_path, data,
-    codec_data=None, options=None, burnin_values=None, overwrite=True
+    codec_data=None, options=None, burnin_values=None, overwrite=True,
+    streams=None
 ):
     """This method adds burnins to video/image file based on presets setting.
 
@@ -386,6 +380,9 @@ def burnins_from_data(
         burnin_values (dict): Contain positioned values.
         overwrite (bool): Output will be overriden if already exists,
             True by default.
+        streams (list): Stream data of input used instead of ffprobe
+            output. Resolution and frame rate of first stream define position
+            and timing of burnins.
 
     Presets must be set separately. Should be dict with 2 keys:
     - "options" - sets look of burnins - colors, opacity,...(more info: ModifiedBurnins doc)
@@ -427,8 +424,65 @@ def burnins_from_data(
         "shot": "sh0010"
     }
     """
+    burnin = prepare_burnins(
+        input_path, data, options, burnin_values, streams
+    )
+
+    ffmpeg_args = []
+    if codec_data:
+        # Use codec definition from method arguments
+        ffmpeg_args = codec_data
+
+    else:
+        ffprobe_data = burnin._streams[0]
+        codec_name = ffprobe_data.get("codec_name")
+        if codec_name:
+            if codec_name == "prores":
+                tags = ffprobe_data.get("tags") or {}
+                encoder = tags.get("encoder") or ""
+                if encoder.endswith("prores_ks"):
+                    codec_name = "prores_ks"
+
+                elif encoder.endswith("prores_aw"):
+                    codec_name = "prores_aw"
+            ffmpeg_args.append("-codec:v {}".format(codec_name))
+
+        profile_name = ffprobe_data.get("profile")
+        if profile_name:
+            # lower profile name and repalce spaces with underscore
+            profile_name = profile_name.replace(" ", "_").lower()
+            ffmpeg_args.append("-profile:v {}".format(profile_name))
+
+        bit_rate = ffprobe_data.get("bit_rate")
+        if bit_rate:
+            ffmpeg_args.append("-b:v {}".format(bit_rate))
+
+        pix_fmt = ffprobe_data.get("pix_fmt")
+        if pix_fmt:
+            ffmpeg_args.append("-pix_fmt {}".format(pix_fmt))
+
+    # Use group one (same as `-intra` argument, which is deprecated)
+    ffmpeg_args.append("-g 1")
+
+    ffmpeg_args_str = " ".join(ffmpeg_args)
+    burnin.render(
+        output_path, args=ffmpeg_args_str, overwrite=overwrite, **data
+    )
+
+
+def prepare_burnins(
+    input_path, data, options=None, burnin_values=None, streams=None
+):
+    """Create burnins object with drawtext filters based on presets.
 
-    burnin = ModifiedBurnins(input_path, options_init=options)
+    Arguments have same meaning as in `burnins_from_data`.
+
+    Returns:
+        ModifiedBurnins: Burnins with filled filters.
+    """
+    burnin = ModifiedBurnins(
+        input_path, streams=streams, options_init=options
+    )
 
     frame_start = data.get("frame_start")
     frame_end = data.get("frame_end")
@@ -537,46 +591,25 @@ def burnins_from_data(
         text = value.format(**data)
         burnin.add_text(text, align, frame_start, frame_end)
 
-    ffmpeg_args = []
-    if codec_data:
-        # Use codec definition from method arguments
-        ffmpeg_args = codec_data
-
-    else:
-        ffprobe_data = burnin._streams[0]
-        codec_name = ffprobe_data.get("codec_name")
-        if codec_name:
-            if codec_name == "prores":
-                tags = ffprobe_data.get("tags") or {}
-                encoder = tags.get("encoder") or ""
-                if encoder.endswith("prores_ks"):
-                    codec_name = "prores_ks"
+    return burnin
 
-                elif encoder.endswith("prores_aw"):
-                    codec_name = "prores_aw"
-            ffmpeg_args.append("-codec:v {}".format(codec_name))
 
-        profile_name = ffprobe_data.get("profile")
-        if profile_name:
-            # lower profile name and repalce spaces with underscore
-            profile_name = profile_name.replace(" ", "_").lower()
-            ffmpeg_args.append("-profile:v {}".format(profile_name))
-
-        bit_rate = ffprobe_data.get("bit_rate")
-        if bit_rate:
-            ffmpeg_args.append("-b:v {}".format(bit_rate))
-
-        pix_fmt = ffprobe_data.get("pix_fmt")
-        if pix_fmt:
-            ffmpeg_args.append("-pix_fmt {}".format(pix_fmt))
+def burnin_filters_from_data(
+    input_path, data, options=None, burnin_values=None, streams=None
+):
+    """Drawtext filters of burnins without rendering.
 
-    # Use group one (same as `-intra` argument, which is deprecated)
-    ffmpeg_args.append("-g 1")
+    Filters can be added to filters of another ffmpeg process so burnins are
+    rendered during its encoding. Filters are escaped for double quoted
+    argument. Arguments have same meaning as in `burnins_from_data`.
 
-    ffmpeg_args_str = " ".join(ffmpeg_args)
-    burnin.render(
-        output_path, args=ffmpeg_args_str, overwrite=overwrite, **data
+    Returns:
+        list: Drawtext filters.
+    """
+    burnin = prepare_burnins(
+        input_path, data, options, burnin_values, streams
     )
+    return list(burnin.filters["drawtext"])
 
 
 if __name__ == "__main__":
@@ -585,12 +618,35 @@ if __name__ == "__main__":
     with open(in_data_json_path, "r") as file_stream:
         in_data = json.load(file_stream)
 
-    burnins_from_data(
-        in_data["input"],
-        in_data["output"],
-        in_data["burnin_data"],
-        codec_data=in_data.get("codec"),
-        options=in_data.get("options"),
-        burnin_values=in_data.get("values")
-    )
+    # Probe input with persist root of publishing process so result of
+    #   extractors is reused also when staging dir is not in temp directory
+    streams = in_data.get("streams")
+    if not streams:
+        streams = openpype.lib.ffprobe_streams(
+            in_data["input"], persist_root=in_data.get("ffprobe_cache_root")
+        )
+
+    # Only store filters to json file if "filters_output" is set
+    filters_output = in_data.get("filters_output")
+    if filters_output:
+        filters = burnin_filters_from_data(
+            in_data["input"],
+            in_data["burnin_data"],
+            options=in_data.get("options"),
+            burnin_values=in_data.get("values"),
+            streams=streams
+        )
+        with open(filters_output, "w") as file_stream:
+            json.dump({"filters": filters}, file_stream)
+
+    else:
+        burnins_from_data(
+            in_data["input"],
+            in_data["output"],
+            in_data["burnin_data"],
+            codec_data=in_data.get("codec"),
+            options=in_data.get("options"),
+            burnin_values=in_data.get("values"),
+            streams=streams
+        )
     print("* Burnin script has finished")
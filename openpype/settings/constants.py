@@ -20,6 +20,8 @@ SYSTEM_SETTINGS_KEY = "system_settings"
 PROJECT_SETTINGS_KEY = "project_settings"
 PROJECT_ANATOMY_KEY = "project_anatomy"
 LOCAL_SETTING_KEY = "local_settings"
+# Document with stamp which is changed on each settings change
+SETTINGS_CHANGE_STAMP_KEY = "settings_change_stamp"
 
 DEFAULT_PROJECT_KEY = "__default_project__"
 
@@ -38,6 +40,7 @@ __all__ = (
     "PROJECT_SETTINGS_KEY",
     "PROJECT_ANATOMY_KEY",
     "LOCAL_SETTING_KEY",
+    "SETTINGS_CHANGE_STAMP_KEY",
 
     "DEFAULT_PROJECT_KEY",
 
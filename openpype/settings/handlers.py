@@ -2,6 +2,7 @@ import os
 import json
 import copy
 import logging
+import threading
 import collections
 import datetime
 from abc import ABCMeta, abstractmethod
@@ -12,7 +13,9 @@ from .constants import (
     SYSTEM_SETTINGS_KEY,
     PROJECT_SETTINGS_KEY,
     PROJECT_ANATOMY_KEY,
-    LOCAL_SETTING_KEY
+    LOCAL_SETTING_KEY,
+    SETTINGS_CHANGE_STAMP_KEY,
+    DEFAULT_PROJECT_KEY
 )
 from .lib import load_json_file
 
@@ -104,6 +107,35 @@ class SettingsHandler:
         """
         pass
 
+    def get_change_stamp(self):
+        """Stamp which is changed on each change of stored settings.
+
+        Stamp is used to validate cached settings. Settings are not cached
+        if handler does not support change stamps.
+
+        Returns:
+            object: Any comparable value or None if not supported.
+        """
+        return None
+
+    def clear_cache(self):
+        """Clear cached values so next access will load stored data."""
+        pass
+
+    def get_settings_changes(self, from_stamp, to_stamp):
+        """Settings changed between two change stamps.
+
+        Args:
+            from_stamp (object): Older change stamp.
+            to_stamp (object): Newer change stamp.
+
+        Returns:
+            list: Tuples of settings type and name (see
+                `bump_settings_change_stamp`) or None if changes are not
+                known.
+        """
+        return None
+
 
 @six.add_metaclass(ABCMeta)
 class LocalSettingsHandler:
@@ -126,11 +158,24 @@ class LocalSettingsHandler:
         """Studio overrides of system settings."""
         pass
 
+    def clear_cache(self):
+        """Clear cached values so next access will load stored data."""
+        pass
+
 
 class CacheValues:
+    """Cached settings data.
+
+    Cached data are outdated after `lifetime` seconds. Lifetime can be set
+    to None when cache is invalidated by other logic (e.g. by
+    `SettingsChangesWatcher`).
+    """
     cache_lifetime = 10
 
-    def __init__(self):
+    def __init__(self, lifetime=-1):
+        if lifetime == -1:
+            lifetime = self.cache_lifetime
+        self.lifetime = lifetime
         self.data = None
         self.creation_time = None
 
@@ -152,17 +197,253 @@ class CacheValues:
                 value = document["value"]
                 if value:
                     data = json.loads(value)
-        self.data = data
+        self.update_data(data)
 
     def to_json_string(self):
         return json.dumps(self.data or {})
 
+    def set_outdated(self):
+        """Mark data as outdated so they're reloaded on next access.
+
+        Data are kept to be able return them from a different thread which
+        already passed validation.
+        """
+        self.creation_time = None
+
     @property
     def is_outdated(self):
         if self.creation_time is None:
             return True
+        if self.lifetime is None:
+            return False
         delta = (datetime.datetime.now() - self.creation_time).seconds
-        return delta > self.cache_lifetime
+        return delta > self.lifetime
+
+
+def get_settings_change_stamp(collection):
+    """Current change stamp of settings stored in passed collection.
+
+    Args:
+        collection (pymongo.collection.Collection): Settings collection.
+
+    Returns:
+        int: Stamp value. Zero if settings were never changed.
+    """
+    document = collection.find_one(
+        {"type": SETTINGS_CHANGE_STAMP_KEY},
+        {"stamp": True}
+    )
+    if not document:
+        return 0
+    return document.get("stamp") or 0
+
+
+def bump_settings_change_stamp(collection, settings_type, name=None):
+    """Change settings change stamp to notify other processes about change.
+
+    Stamp document contains global stamp and counter for each changed
+    settings so watchers can find out which settings have changed.
+
+    Args:
+        collection (pymongo.collection.Collection): Settings collection.
+        settings_type (str): Type of changed settings e.g.
+            `SYSTEM_SETTINGS_KEY`.
+        name (str): Project name or site id for project or local settings.
+            Value `DEFAULT_PROJECT_KEY` is used for project settings defaults.
+    """
+    changes_key = "changes.{}".format(settings_type)
+    if name is not None:
+        changes_key += ".{}".format(name)
+
+    collection.update_one(
+        {"type": SETTINGS_CHANGE_STAMP_KEY},
+        {
+            "$inc": {
+                "stamp": 1,
+                changes_key: 1
+            },
+            "$currentDate": {"last_change": True}
+        },
+        upsert=True
+    )
+
+
+class SettingsChangesWatcher(threading.Thread):
+    """Thread watching changes of settings in settings collection.
+
+    Watched is settings change stamp document which is changed on each
+    settings save (`bump_settings_change_stamp`). Change stream of the
+    collection is used when deployment supports it (replica set), otherwise
+    is the document polled in interval.
+
+    Callback is called with list of changed settings. Each item is tuple
+    with settings type and name (project name or site id) which is None
+    for system settings. New stamp is set after callback has finished, so
+    data cached by callback owner are invalidated when stamp changes.
+
+    Args:
+        collection (pymongo.collection.Collection): Settings collection.
+        callback (callable): Called with changes on each change.
+        poll_interval (float): Seconds between polls when change stream
+            is not available.
+    """
+    poll_interval = 2
+    # Count of remembered changes (see `get_changes`)
+    history_size = 100
+
+    def __init__(self, collection, callback, poll_interval=None):
+        super(SettingsChangesWatcher, self).__init__()
+        self.daemon = True
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.collection = collection
+        self.callback = callback
+        if poll_interval is not None:
+            self.poll_interval = poll_interval
+
+        self.stamp = None
+        self.uses_change_stream = None
+        self._last_changes = {}
+        self._history = collections.deque(maxlen=self.history_size)
+        self._history_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._ready_event = threading.Event()
+
+    @property
+    def is_running(self):
+        return self.is_alive() and not self._stop_event.is_set()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def wait_ready(self, timeout=None):
+        """Wait until stamp document was loaded for the first time."""
+        return self._ready_event.wait(timeout)
+
+    def process_document(self, document):
+        """Process stamp document and trigger callback if has changed.
+
+        Args:
+            document (dict): Settings change stamp document.
+        """
+        document = document or {}
+        stamp = document.get("stamp") or 0
+        changes = document.get("changes") or {}
+        if stamp == self.stamp:
+            return
+
+        changed = []
+        for settings_type, value in changes.items():
+            last_value = self._last_changes.get(settings_type)
+            if not isinstance(value, dict):
+                if value != last_value:
+                    changed.append((settings_type, None))
+                continue
+
+            if not isinstance(last_value, dict):
+                last_value = {}
+
+            for name, counter in value.items():
+                if last_value.get(name) != counter:
+                    changed.append((settings_type, name))
+
+        previous_stamp = self.stamp
+        self._last_changes = changes
+        if previous_stamp is not None:
+            with self._history_lock:
+                self._history.append((previous_stamp, stamp, changed))
+
+            if changed:
+                try:
+                    self.callback(changed)
+                except Exception:
+                    self.log.warning(
+                        "Settings change callback failed.", exc_info=True
+                    )
+        self.stamp = stamp
+
+    def get_changes(self, from_stamp, to_stamp):
+        """Settings changed between two processed stamps.
+
+        Returns:
+            list: Changed settings or None if changes are not remembered.
+        """
+        with self._history_lock:
+            history = list(self._history)
+
+        output = []
+        stamp = from_stamp
+        for previous_stamp, next_stamp, changed in history:
+            if stamp == to_stamp:
+                break
+            if previous_stamp == stamp:
+                output.extend(changed)
+                stamp = next_stamp
+
+        if stamp != to_stamp:
+            return None
+        return output
+
+    def _load_document(self):
+        self.process_document(self.collection.find_one(
+            {"type": SETTINGS_CHANGE_STAMP_KEY}
+        ))
+
+    def run(self):
+        from pymongo.errors import PyMongoError, OperationFailure
+
+        while not self._stop_event.is_set():
+            try:
+                self._load_document()
+                self._ready_event.set()
+                if self.uses_change_stream is not False:
+                    self._watch_change_stream()
+                else:
+                    self._poll()
+
+            except (OperationFailure, NotImplementedError):
+                # Change streams are available only on replica sets
+                if self.uses_change_stream is not False:
+                    self.log.info((
+                        "Change streams are not available."
+                        " Polling settings changes every {} seconds."
+                    ).format(self.poll_interval))
+                    self.uses_change_stream = False
+                else:
+                    self.log.warning(
+                        "Polling of settings changes failed.", exc_info=True
+                    )
+                    self._stop_event.wait(self.poll_interval)
+
+            except PyMongoError:
+                self.log.warning(
+                    "Watching of settings changes failed.", exc_info=True
+                )
+                self._stop_event.wait(self.poll_interval)
+
+    def _watch_change_stream(self):
+        # Collection stand-ins may not implement change streams
+        if not hasattr(type(self.collection), "watch"):
+            raise NotImplementedError("Collection does not support watch.")
+
+        pipeline = [
+            {"$match": {"fullDocument.type": SETTINGS_CHANGE_STAMP_KEY}}
+        ]
+        with self.collection.watch(
+            pipeline,
+            full_document="updateLookup",
+            max_await_time_ms=int(self.poll_interval * 1000)
+        ) as stream:
+            self.uses_change_stream = True
+            # Catch changes made before stream was opened
+            self._load_document()
+            while not self._stop_event.is_set() and stream.alive:
+                change = stream.try_next()
+                if change is not None:
+                    self.process_document(change.get("fullDocument"))
+
+    def _poll(self):
+        while not self._stop_event.wait(self.poll_interval):
+            self._load_document()
 
 
 class MongoSettingsHandler(SettingsHandler):
@@ -192,9 +473,81 @@ class MongoSettingsHandler(SettingsHandler):
         self.collection = settings_collection[database_name][collection_name]
         self.avalon_db = AvalonMongoDB()
 
-        self.system_settings_cache = CacheValues()
-        self.project_settings_cache = collections.defaultdict(CacheValues)
-        self.project_anatomy_cache = collections.defaultdict(CacheValues)
+        self._watcher = None
+        self._last_change_stamp = None
+        self.system_settings_cache = self._create_cache_values()
+        self.project_settings_cache = collections.defaultdict(
+            self._create_cache_values
+        )
+        self.project_anatomy_cache = collections.defaultdict(
+            self._create_cache_values
+        )
+
+    def _create_cache_values(self):
+        # Cached values don't have lifetime when watcher is running
+        if self.is_watcher_running:
+            return CacheValues(None)
+        return CacheValues()
+
+    @property
+    def is_watcher_running(self):
+        return self._watcher is not None and self._watcher.is_running
+
+    def start_watcher(self, poll_interval=None):
+        """Start thread watching settings changes.
+
+        Cached values don't have lifetime when watcher is running and only
+        changed values are invalidated when settings are saved. This is
+        meant for long running processes (tray, servers).
+
+        Args:
+            poll_interval (float): Seconds between polls when change stream
+                of settings collection is not available.
+        """
+        if self.is_watcher_running:
+            return
+
+        self._watcher = SettingsChangesWatcher(
+            self.collection, self._on_settings_changes, poll_interval
+        )
+        self._watcher.start()
+        self._watcher.wait_ready(5)
+        self.system_settings_cache.lifetime = None
+        self.clear_cache()
+
+    def stop_watcher(self):
+        """Stop thread watching settings changes."""
+        if self._watcher is None:
+            return
+        self._watcher.stop()
+        self._watcher = None
+        self.system_settings_cache.lifetime = CacheValues.cache_lifetime
+        self.clear_cache()
+
+    def get_settings_changes(self, from_stamp, to_stamp):
+        if not self.is_watcher_running:
+            return None
+        return self._watcher.get_changes(from_stamp, to_stamp)
+
+    def _on_settings_changes(self, changes):
+        """Invalidate cached values of changed settings."""
+        for settings_type, name in changes:
+            if settings_type == SYSTEM_SETTINGS_KEY:
+                self.system_settings_cache.set_outdated()
+                continue
+
+            if name == DEFAULT_PROJECT_KEY:
+                name = None
+
+            if settings_type == PROJECT_SETTINGS_KEY:
+                caches = self.project_settings_cache
+            elif settings_type == PROJECT_ANATOMY_KEY:
+                caches = self.project_anatomy_cache
+            else:
+                continue
+
+            if name in caches:
+                caches[name].set_outdated()
 
     def _prepare_project_settings_keys(self):
         from .entities import ProjectSettings
@@ -271,6 +624,7 @@ class MongoSettingsHandler(SettingsHandler):
             },
             upsert=True
         )
+        bump_settings_change_stamp(self.collection, SYSTEM_SETTINGS_KEY)
 
     def save_project_settings(self, project_name, overrides):
         """Save studio overrides of project settings.
@@ -294,6 +648,11 @@ class MongoSettingsHandler(SettingsHandler):
         self._save_project_data(
             project_name, PROJECT_SETTINGS_KEY, data_cache
         )
+        bump_settings_change_stamp(
+            self.collection,
+            PROJECT_SETTINGS_KEY,
+            project_name or DEFAULT_PROJECT_KEY
+        )
 
     def save_project_anatomy(self, project_name, anatomy_data):
         """Save studio overrides of project anatomy data.
@@ -313,6 +672,11 @@ class MongoSettingsHandler(SettingsHandler):
             self._save_project_data(
                 project_name, PROJECT_ANATOMY_KEY, data_cache
             )
+        bump_settings_change_stamp(
+            self.collection,
+            PROJECT_ANATOMY_KEY,
+            project_name or DEFAULT_PROJECT_KEY
+        )
 
     @classmethod
     def prepare_mongo_update_dict(cls, in_data):
@@ -415,18 +779,40 @@ class MongoSettingsHandler(SettingsHandler):
             upsert=True
         )
 
+    def get_change_stamp(self):
+        """Change stamp stored in settings collection.
+
+        Stamp known by watcher is used when watcher is running. Otherwise
+        is stamp queried and all cached values are cleared if has changed.
+        """
+        if self.is_watcher_running and self._watcher.stamp is not None:
+            return self._watcher.stamp
+
+        stamp = get_settings_change_stamp(self.collection)
+        if stamp != self._last_change_stamp:
+            self.clear_cache()
+            self._last_change_stamp = stamp
+        return stamp
+
+    def clear_cache(self):
+        self.system_settings_cache.set_outdated()
+        self.project_settings_cache.clear()
+        self.project_anatomy_cache.clear()
+
     def get_studio_system_settings_overrides(self):
         """Studio overrides of system settings."""
-        if self.system_settings_cache.is_outdated:
+        data_cache = self.system_settings_cache
+        if data_cache.is_outdated:
             document = self.collection.find_one({
                 "type": SYSTEM_SETTINGS_KEY
             })
 
-            self.system_settings_cache.update_from_document(document)
-        return self.system_settings_cache.data_copy()
+            data_cache.update_from_document(document)
+        return data_cache.data_copy()
 
     def _get_project_settings_overrides(self, project_name):
-        if self.project_settings_cache[project_name].is_outdated:
+        data_cache = self.project_settings_cache[project_name]
+        if data_cache.is_outdated:
             document_filter = {
                 "type": PROJECT_SETTINGS_KEY,
             }
@@ -435,10 +821,8 @@ class MongoSettingsHandler(SettingsHandler):
             else:
                 document_filter["project_name"] = project_name
             document = self.collection.find_one(document_filter)
-            self.project_settings_cache[project_name].update_from_document(
-                document
-            )
-        return self.project_settings_cache[project_name].data_copy()
+            data_cache.update_from_document(document)
+        return data_cache.data_copy()
 
     def get_studio_project_settings_overrides(self):
         """Studio overrides of default project settings."""
@@ -493,24 +877,28 @@ class MongoSettingsHandler(SettingsHandler):
         return output
 
     def _get_project_anatomy_overrides(self, project_name):
-        if self.project_anatomy_cache[project_name].is_outdated:
+        data_cache = self.project_anatomy_cache[project_name]
+        if project_name is not None:
+            # Project document may be changed out of settings so watcher
+            #   can't be used to invalidate project anatomy
+            data_cache.lifetime = CacheValues.cache_lifetime
+
+        if data_cache.is_outdated:
             if project_name is None:
                 document_filter = {
                     "type": PROJECT_ANATOMY_KEY,
                     "is_default": True
                 }
                 document = self.collection.find_one(document_filter)
-                self.project_anatomy_cache[project_name].update_from_document(
-                    document
-                )
+                data_cache.update_from_document(document)
             else:
                 collection = self.avalon_db.database[project_name]
                 project_doc = collection.find_one({"type": "project"})
-                self.project_anatomy_cache[project_name].update_data(
+                data_cache.update_data(
                     self.project_doc_to_anatomy_data(project_doc)
                 )
 
-        return self.project_anatomy_cache[project_name].data_copy()
+        return data_cache.data_copy()
 
     def get_studio_project_anatomy_overrides(self):
         """Studio overrides of default project anatomy data."""
@@ -589,6 +977,12 @@ class MongoLocalSettingsHandler(LocalSettingsHandler):
             },
             upsert=True
         )
+        bump_settings_change_stamp(
+            self.collection, LOCAL_SETTING_KEY, self.local_site_id
+        )
+
+    def clear_cache(self):
+        self.local_settings_cache.set_outdated()
 
     def get_local_settings(self):
         """Local settings for local site id."""
@@ -1,8 +1,10 @@
 import os
 import json
+import time
 import functools
 import logging
 import platform
+import threading
 import copy
 from .exceptions import (
     SaveWarningExc
@@ -33,6 +35,32 @@ DEFAULTS_DIR = os.path.join(
 
 # Variable where cache of default settings are stored
 _DEFAULT_SETTINGS = None
+# Modification times of default settings files used for cached defaults
+_DEFAULT_SETTINGS_STAMP = None
+
+# Cached settings with applied overrides by function and it's arguments
+_SETTINGS_CACHE = {}
+# Last change stamp of settings handler
+_SETTINGS_HANDLER_STAMP = None
+# Lock of cached settings invalidation
+_SETTINGS_CACHE_LOCK = threading.Lock()
+# Cached functions affected by change of settings type, first function is
+#   affected by change of defaults and second by change of project
+_SETTINGS_CACHE_FUNCTIONS = {
+    SYSTEM_SETTINGS_KEY: ("get_system_settings", None),
+    PROJECT_SETTINGS_KEY: (
+        "get_default_project_settings", "get_project_settings"
+    ),
+    PROJECT_ANATOMY_KEY: (
+        "get_default_anatomy_settings", "get_anatomy_settings"
+    )
+}
+# Stamp used during nested calls of cached settings functions
+_SETTINGS_STAMP_CONTEXT = threading.local()
+
+# Project anatomy overrides are stored on project document which may be
+#   changed out of settings (without change of stamp)
+PROJECT_ANATOMY_CACHE_LIFETIME = 10
 
 # Handler of studio overrides
 _SETTINGS_HANDLER = None
@@ -61,6 +89,56 @@ def require_local_handler(func):
     return wrapper
 
 
+def cache_settings(lifetime=None):
+    """Cache output of function returning settings data.
+
+    Output is cached by function arguments and is valid until settings
+    stamp changes. Settings stamp is combination of default settings files
+    modification times and change stamp of settings handler. Change stamp
+    is received only once for nested calls of cached functions. Values
+    not affected by change of stored settings stay valid if handler knows
+    what has changed (see `_invalidate_settings_cache`).
+
+    Returned value is always a copy of cached value.
+
+    Args:
+        lifetime (int): Maximum age of cached value in seconds.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            is_top_call = not hasattr(_SETTINGS_STAMP_CONTEXT, "stamp")
+            if is_top_call:
+                _SETTINGS_STAMP_CONTEXT.stamp = _get_settings_stamp()
+
+            try:
+                stamp = _SETTINGS_STAMP_CONTEXT.stamp
+                # Handler does not support stamps
+                if stamp is None:
+                    return func(*args, **kwargs)
+
+                key = (func.__name__, args, tuple(sorted(kwargs.items())))
+                cached = _SETTINGS_CACHE.get(key)
+                current_time = time.time()
+                if (
+                    cached is None
+                    or cached[0] != stamp
+                    or (
+                        lifetime is not None
+                        and current_time - cached[1] > lifetime
+                    )
+                ):
+                    cached = (stamp, current_time, func(*args, **kwargs))
+                    _SETTINGS_CACHE[key] = cached
+                return copy.deepcopy(cached[2])
+
+            finally:
+                if is_top_call:
+                    del _SETTINGS_STAMP_CONTEXT.stamp
+        return wrapper
+    return decorator
+
+
 def create_settings_handler():
     from .handlers import MongoSettingsHandler
     # Handler can't be created in global space on initialization but only when
@@ -318,15 +396,171 @@ class DuplicatedEnvGroups(Exception):
 def reset_default_settings():
     global _DEFAULT_SETTINGS
     _DEFAULT_SETTINGS = None
+    _SETTINGS_CACHE.clear()
+
+
+def clear_settings_cache():
+    """Clear all cached settings.
+
+    Next call of any settings function will load stored data.
+    """
+    _SETTINGS_CACHE.clear()
+    if _SETTINGS_HANDLER is not None:
+        _SETTINGS_HANDLER.clear_cache()
+
+    if _LOCAL_SETTINGS_HANDLER is not None:
+        _LOCAL_SETTINGS_HANDLER.clear_cache()
+
+
+@require_handler
+def start_settings_watcher(poll_interval=None):
+    """Start watching of settings changes in long running process.
+
+    Cached settings are invalidated immediately after settings change
+    instead of reloading them periodically. Does nothing if settings
+    handler does not support watching.
+
+    Args:
+        poll_interval (float): Seconds between polls when change stream
+            is not available.
+    """
+    start_watcher = getattr(_SETTINGS_HANDLER, "start_watcher", None)
+    if start_watcher is not None:
+        start_watcher(poll_interval)
+
+
+@require_handler
+def stop_settings_watcher():
+    """Stop watching of settings changes."""
+    stop_watcher = getattr(_SETTINGS_HANDLER, "stop_watcher", None)
+    if stop_watcher is not None:
+        stop_watcher()
+
+
+def _get_default_settings_stamp():
+    """Modification times of default settings files."""
+    stamp = []
+    for base, _directories, filenames in os.walk(DEFAULTS_DIR):
+        for filename in filenames:
+            if filename.endswith(".json"):
+                full_path = os.path.join(base, filename)
+                stamp.append((full_path, os.path.getmtime(full_path)))
+    stamp.sort()
+    return tuple(stamp)
+
+
+@require_handler
+def _get_settings_stamp():
+    """Stamp of default settings and stored settings overrides.
+
+    Cached settings affected by changes are removed when change stamp of
+    settings handler has changed since last call. All cached settings are
+    cleared when handler can't tell what has changed. Settings handler takes
+    care about it's cached values on it's own.
+
+    Returns:
+        tuple: Stamp of default settings and change stamp of handler. None
+            is returned if handler does not support change stamps.
+    """
+    global _SETTINGS_HANDLER_STAMP
+
+    handler_stamp = _SETTINGS_HANDLER.get_change_stamp()
+    if handler_stamp is None:
+        return None
+
+    with _SETTINGS_CACHE_LOCK:
+        if handler_stamp != _SETTINGS_HANDLER_STAMP:
+            changes = None
+            if _SETTINGS_HANDLER_STAMP is not None:
+                changes = _SETTINGS_HANDLER.get_settings_changes(
+                    _SETTINGS_HANDLER_STAMP, handler_stamp
+                )
+            _invalidate_settings_cache(
+                changes, _SETTINGS_HANDLER_STAMP, handler_stamp
+            )
+            _SETTINGS_HANDLER_STAMP = handler_stamp
+    return (_get_default_settings_stamp(), handler_stamp)
+
+
+def _is_settings_cache_key_affected(key, changes):
+    func_name, args, kwargs = key
+    for settings_type, name in changes:
+        func_names = _SETTINGS_CACHE_FUNCTIONS.get(settings_type)
+        # Local or unknown settings may affect all settings
+        if func_names is None:
+            return True
+
+        defaults_func_name, project_func_name = func_names
+        if func_name == defaults_func_name:
+            return True
+
+        if func_name != project_func_name:
+            continue
+
+        if name == DEFAULT_PROJECT_KEY:
+            return True
+
+        project_name = args[0] if args else dict(kwargs).get("project_name")
+        if project_name == name:
+            return True
+    return False
+
+
+def _invalidate_settings_cache(changes, previous_stamp, stamp):
+    """Remove cached settings affected by changes.
+
+    Cached settings not affected by changes are marked as valid for new
+    stamp if were cached with previous stamp. Values cached with older stamp
+    may be loaded before changes were applied in settings handler.
+
+    Args:
+        changes (list): Changed settings (see `bump_settings_change_stamp`)
+            or None if changes are not known.
+        previous_stamp (object): Last known change stamp of handler.
+        stamp (object): New change stamp of handler.
+    """
+    if changes is None:
+        _SETTINGS_CACHE.clear()
+        if _LOCAL_SETTINGS_HANDLER is not None:
+            _LOCAL_SETTINGS_HANDLER.clear_cache()
+        return
+
+    if _LOCAL_SETTINGS_HANDLER is not None:
+        for settings_type, _ in changes:
+            if settings_type not in _SETTINGS_CACHE_FUNCTIONS:
+                _LOCAL_SETTINGS_HANDLER.clear_cache()
+                break
+
+    for key, cached in tuple(_SETTINGS_CACHE.items()):
+        cached_stamp = cached[0]
+        if (
+            cached_stamp[1] != previous_stamp
+            or _is_settings_cache_key_affected(key, changes)
+        ):
+            _SETTINGS_CACHE.pop(key, None)
+            continue
+        _SETTINGS_CACHE[key] = (
+            (cached_stamp[0], stamp), cached[1], cached[2]
+        )
 
 
 def get_default_settings():
-    # TODO add cacher
-    return load_jsons_from_dir(DEFAULTS_DIR)
-    # global _DEFAULT_SETTINGS
-    # if _DEFAULT_SETTINGS is None:
-    #     _DEFAULT_SETTINGS = load_jsons_from_dir(DEFAULTS_DIR)
-    # return copy.deepcopy(_DEFAULT_SETTINGS)
+    """Default settings loaded from json files.
+
+    Files are loaded only once and are reloaded only if any of them
+    was modified.
+
+    Returns:
+        dict: Copy of loaded default settings.
+    """
+    global _DEFAULT_SETTINGS
+    global _DEFAULT_SETTINGS_STAMP
+
+    stamp = _get_default_settings_stamp()
+    if _DEFAULT_SETTINGS is None or stamp != _DEFAULT_SETTINGS_STAMP:
+        _DEFAULT_SETTINGS = load_jsons_from_dir(DEFAULTS_DIR)
+        _DEFAULT_SETTINGS_STAMP = stamp
+    return copy.deepcopy(_DEFAULT_SETTINGS)
 
 
 def load_json_file(fpath):
@@ -700,6 +934,7 @@ def apply_local_settings_on_project_settings(
         sync_server_config["remote_site"] = remote_site
 
 
+@cache_settings()
 def get_system_settings(clear_metadata=True, exclude_locals=None):
     """System settings with applied studio overrides."""
     default_values = get_default_settings()[SYSTEM_SETTINGS_KEY]
@@ -723,6 +958,7 @@ def get_system_settings(clear_metadata=True, exclude_locals=None):
     return result
 
 
+@cache_settings()
 def get_default_project_settings(clear_metadata=True, exclude_locals=None):
     """Project settings with applied studio's default project overrides."""
     default_values = get_default_settings()[PROJECT_SETTINGS_KEY]
@@ -744,6 +980,7 @@ def get_default_project_settings(clear_metadata=True, exclude_locals=None):
     return result
 
 
+@cache_settings()
 def get_default_anatomy_settings(clear_metadata=True, exclude_locals=None):
     """Project anatomy data with applied studio's default project overrides."""
     default_values = get_default_settings()[PROJECT_ANATOMY_KEY]
@@ -766,6 +1003,7 @@ def get_default_anatomy_settings(clear_metadata=True, exclude_locals=None):
     return result
 
 
+@cache_settings(lifetime=PROJECT_ANATOMY_CACHE_LIFETIME)
 def get_anatomy_settings(
     project_name, site_name=None, clear_metadata=True, exclude_locals=None
 ):
@@ -801,6 +1039,7 @@ def get_anatomy_settings(
     return result
 
 
+@cache_settings()
 def get_project_settings(
     project_name, clear_metadata=True, exclude_locals=None
 ):
@@ -0,0 +1,152 @@
+import copy
+import random
+import time
+
+from openpype.settings.constants import PROJECT_ANATOMY_KEY
+from openpype.settings.lib import (
+    get_default_settings,
+    clear_metadata_from_settings
+)
+from openpype.lib.anatomy import (
+    Anatomy,
+    Templates,
+    Roots
+)
+
+
+class BenchmarkAnatomy(Anatomy):
+    """Anatomy with default anatomy data which does not need database."""
+
+    def __init__(self, project_name="benchmark"):
+        self.project_name = project_name
+
+        data = copy.deepcopy(get_default_settings()[PROJECT_ANATOMY_KEY])
+        clear_metadata_from_settings(data)
+        self._data = data
+
+        self._templates_obj = Templates(self)
+        self._roots_obj = Roots(self)
+
+
+class TestAnatomyPerformance():
+    '''
+        Class for testing performance of anatomy templates formatting.
+
+        Formats full default anatomy with regex based formatting, with
+        compiled templates and lazily with compiled templates when only
+        publish path is used. Compares both speed and results.
+
+        Usage:
+            python openpype/tests/test_anatomy_performance.py
+    '''
+
+    def __init__(self, contexts=3000, seed=0):
+        self.anatomy = BenchmarkAnatomy()
+        self.contexts = self.prepare(contexts, seed)
+
+    def prepare(self, no_of_contexts, seed=0):
+        '''
+            Produce 'no_of_contexts' of fill data similar to publishing
+            context. Some of them miss optional or required keys.
+        '''
+        rand = random.Random(seed)
+        contexts = []
+        for idx in range(no_of_contexts):
+            data = {
+                "project": {
+                    "name": "project_{}".format(idx % 5),
+                    "code": "prj{}".format(idx % 5)
+                },
+                "hierarchy": "shots/sq{:0>2}".format(idx % 20),
+                "asset": "sh{:0>4}".format(idx),
+                "task": rand.choice(("compositing", "animation", "lighting")),
+                "family": rand.choice(("render", "review", "model")),
+                "subset": "subset{}".format(idx % 7),
+                "version": rand.randint(1, 200),
+                "ext": rand.choice(("exr", "mov", "abc")),
+                "comment": "comment"
+            }
+            if idx % 2:
+                data["output"] = "beauty"
+            if idx % 3:
+                data["frame"] = rand.randint(1001, 1100)
+            if idx % 11 == 0:
+                data.pop("task")
+            if idx % 13 == 0:
+                # Invalid type of value
+                data["subset"] = ["subset"]
+            contexts.append(data)
+        return contexts
+
+    def run(self, loops=3):
+        '''
+            Format all contexts 'loops' times with both formatting modes.
+        '''
+        print('Formatting {} contexts in {} loops'.format(
+            len(self.contexts), loops
+        ))
+        templates_obj = self.anatomy.templates_obj
+        results = {}
+        for use_compiled in (False, True):
+            templates_obj.use_compiled_templates = use_compiled
+            label = "compiled" if use_compiled else "regex"
+            results[label] = self.run_loops(label, loops, lambda data: (
+                self.anatomy.format_all(data)
+            ))
+
+        # Lazy formatting when only publish path is used
+        lazy_paths = self.run_loops("compiled lazy", loops, lambda data: (
+            self.anatomy.format_all(data, lazy=True)["publish"]["path"]
+        ))
+
+        mismatches = 0
+        for regex_result, compiled_result, lazy_path in zip(
+            results["regex"], results["compiled"], lazy_paths
+        ):
+            compiled_values = self.result_values(compiled_result)
+            if (
+                self.result_values(regex_result) != compiled_values
+                or self.result_values({"path": lazy_path})["path"]
+                != compiled_values["publish"]["path"]
+            ):
+                mismatches += 1
+        print('Results mismatch in {} contexts'.format(mismatches))
+        return mismatches
+
+    def run_loops(self, label, loops, callback):
+        durations = []
+        for _ in range(loops):
+            start = time.time()
+            output = [callback(data) for data in self.contexts]
+            durations.append(time.time() - start)
+        best = min(durations)
+        print('{}: best loop {:.3f}s ({:.0f} contexts/s)'.format(
+            label, best, len(self.contexts) / best
+        ))
+        return output
+
+    def result_values(self, templates_dict):
+        output = {}
+        for key, value in templates_dict.items():
+            if isinstance(value, dict):
+                output[key] = self.result_values(value)
+                continue
+
+            if not hasattr(value, "solved"):
+                output[key] = value
+                continue
+
+            output[key] = (
+                str(value),
+                value.rootless,
+                value.solved,
+                sorted(value.missing_keys),
+                value.invalid_types,
+                value.used_values
+            )
+        return output
+
+
+if __name__ == '__main__':
+    tp = TestAnatomyPerformance(3000)
+    tp.run(3)
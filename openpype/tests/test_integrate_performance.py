@@ -0,0 +1,189 @@
+import os
+import time
+import tempfile
+import getpass
+from datetime import datetime
+
+import bson
+import mongomock
+import pyblish.api
+
+from openpype.tests.test_anatomy_performance import BenchmarkAnatomy
+
+
+class CountingCollection(object):
+    """Collection wrapper counting calls which are round-trips to database."""
+
+    round_trip_methods = (
+        "find", "find_one", "insert_one", "insert_many", "update_one",
+        "update_many", "replace_one", "delete_one", "delete_many",
+        "bulk_write"
+    )
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.round_trips = 0
+
+    def __getattr__(self, attr_name):
+        value = getattr(self._collection, attr_name)
+        if attr_name not in self.round_trip_methods:
+            return value
+
+        def _counted(*args, **kwargs):
+            self.round_trips += 1
+            return value(*args, **kwargs)
+        return _counted
+
+
+class CountingIo(object):
+    """Replacement of 'avalon.io' using mongomock collection."""
+
+    ObjectId = bson.ObjectId
+
+    def __init__(self, project_name):
+        self.Session = {
+            "AVALON_PROJECT": project_name,
+            "AVALON_TASK": "compositing"
+        }
+        collection = mongomock.MongoClient()["avalon"][project_name]
+        self.collection = CountingCollection(collection)
+        self._database = {project_name: self.collection}
+
+    def install(self):
+        pass
+
+    def __getattr__(self, attr_name):
+        return getattr(self.collection, attr_name)
+
+
+class BenchmarkIntegrateMixin(object):
+    """Integrator which does not transfer any files."""
+
+    def integrate(self, instance):
+        return {
+            self.get_dest_temp_url(dst): 0
+            for _src, dst in instance.data["transfers"]
+        }
+
+    def get_files_info(self, instance, integrated_file_sizes):
+        return []
+
+
+class TestIntegratePerformance():
+    '''
+        Class for counting database round-trips of 'IntegrateAssetNew'.
+
+        Publishes 'no_of_instances' instances with two representations
+        into mongomock database. Documents are queried once per context
+        and each instance is written with one bulk write.
+
+        Usage:
+            python openpype/tests/test_integrate_performance.py
+    '''
+
+    PROJECT_NAME = "benchmark"
+
+    def __init__(self, no_of_instances=50):
+        # Plugin is imported here as it requires avalon to be available
+        from openpype.plugins.publish import integrate_new
+
+        self.io = CountingIo(self.PROJECT_NAME)
+        integrate_new.io = self.io
+        self.plugin_class = type(
+            "BenchmarkIntegrate",
+            (BenchmarkIntegrateMixin, integrate_new.IntegrateAssetNew),
+            {}
+        )
+        self.anatomy = BenchmarkAnatomy(self.PROJECT_NAME)
+        self.staging_dir = tempfile.mkdtemp()
+        self.no_of_instances = no_of_instances
+
+        project = {
+            "_id": bson.ObjectId(),
+            "type": "project",
+            "name": self.PROJECT_NAME,
+            "data": {"code": "bench"}
+        }
+        asset = {
+            "_id": bson.ObjectId(),
+            "type": "asset",
+            "name": "sh0010",
+            "parent": project["_id"],
+            "data": {"parents": ["shots", "sq01"]}
+        }
+        self.io.collection.insert_many([project, asset])
+        self.project = project
+        self.asset = asset
+
+    def prepare(self):
+        '''
+            Create publish context with 'no_of_instances' render instances.
+        '''
+        context = pyblish.api.Context()
+        context.data.update({
+            "projectEntity": self.project,
+            "assetEntity": self.asset,
+            "anatomy": self.anatomy,
+            "currentFile": os.path.join(self.staging_dir, "workfile.nk"),
+            "time": datetime.now().strftime("%Y%m%dT%H%M%SZ"),
+            "user": getpass.getuser(),
+            "system_settings": {
+                "modules": {"sync_server": {"enabled": False}}
+            }
+        })
+        for idx in range(self.no_of_instances):
+            subset_name = "renderMain{}".format(idx)
+            instance = context.create_instance(subset_name)
+            instance.data.update({
+                "family": "render",
+                "families": ["review"],
+                "asset": self.asset["name"],
+                "assetEntity": self.asset,
+                "projectEntity": self.project,
+                "subset": subset_name,
+                "version": 1,
+                "stagingDir": self.staging_dir,
+                "source": "{root[work]}/benchmark/workfile.nk",
+                "anatomyData": {
+                    "project": {"name": self.PROJECT_NAME, "code": "bench"},
+                    "asset": self.asset["name"],
+                    "hierarchy": "shots/sq01",
+                    "task": "compositing",
+                    "subset": subset_name,
+                    "family": "render",
+                    "version": 1
+                },
+                "representations": [
+                    {"name": "exr", "ext": "exr", "files": "beauty.exr"},
+                    {"name": "mov", "ext": "mov", "files": "review.mov"}
+                ]
+            })
+        return context
+
+    def run(self, loops=2):
+        '''
+            Publish whole context 'loops' times. First loop creates
+            subsets and versions, next loops replace representations
+            of existing versions.
+        '''
+        print('Publishing {} instances in {} loops'.format(
+            self.no_of_instances, loops
+        ))
+        for loop in range(loops):
+            context = self.prepare()
+            self.io.collection.round_trips = 0
+            start = time.time()
+            for instance in context:
+                plugin = self.plugin_class()
+                plugin.register(instance)
+            duration = time.time() - start
+            print('Loop {}: {} round-trips ({:.2f} per instance) {:.3f}s'
+                  .format(loop + 1, self.io.collection.round_trips,
+                          self.io.collection.round_trips
+                          / float(self.no_of_instances),
+                          duration))
+
+
+if __name__ == '__main__':
+    tp = TestIntegratePerformance(50)
+    tp.run(2)
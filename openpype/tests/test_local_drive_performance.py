@@ -0,0 +1,140 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+import concurrent.futures
+
+
+class LegacyLocalCopy(object):
+    """Copy of file as done by previous 'LocalDriveHandler'.
+
+    Each file is copied by new thread with 'shutil.copy' while size of
+    target is polled every 0.5s. Files were processed by executor of
+    sync server with 3 workers.
+    """
+
+    workers = 3
+    poll_interval = 0.5
+
+    def copy_file(self, source_path, target_path):
+        thread = threading.Thread(target=shutil.copy,
+                                  args=(source_path, target_path))
+        thread.start()
+        source_file_size = os.path.getsize(source_path)
+        target_file_size = 0
+        while source_file_size != target_file_size:
+            if os.path.exists(target_path):
+                target_file_size = os.path.getsize(target_path)
+            time.sleep(self.poll_interval)
+        thread.join()
+
+    def copy_files(self, transfers):
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as executor:
+            for future in [
+                executor.submit(self.copy_file, source_path, target_path)
+                for source_path, target_path in transfers
+            ]:
+                future.result()
+
+
+class TestLocalDrivePerformance():
+    '''
+        Class for comparing copy of image sequence by 'LocalDriveHandler'
+        and previous implementation.
+
+        Creates synthetic sequence of 'no_of_files' files and copies it
+        with batch transfer of 'LocalDriveHandler' (pool of threads,
+        reflink/copy_file_range/sendfile). Previous implementation sleeps
+        at least 0.5s per file, so it is measured on 'legacy_sample' files
+        only and extrapolated.
+
+        Usage:
+            python openpype/tests/test_local_drive_performance.py
+    '''
+
+    def __init__(self, no_of_files=10000, file_size=256 * 1024,
+                 legacy_sample=60):
+        self.no_of_files = no_of_files
+        self.file_size = file_size
+        self.legacy_sample = legacy_sample
+        self.root = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.root, "source")
+
+    def prepare(self):
+        '''
+            Create sequence 'render.####.exr' with random content.
+        '''
+        print('Creating {} files of {} KB'.format(
+            self.no_of_files, self.file_size // 1024))
+        os.makedirs(self.source_dir)
+        content = os.urandom(self.file_size)
+        for idx in range(self.no_of_files):
+            path = os.path.join(self.source_dir,
+                                "render.{:04d}.exr".format(idx))
+            with open(path, "wb") as stream:
+                stream.write(content)
+
+    def get_transfers(self, target_dir, count=None):
+        os.makedirs(target_dir)
+        filenames = sorted(os.listdir(self.source_dir))[:count]
+        return [
+            (os.path.join(self.source_dir, filename),
+             os.path.join(target_dir, filename))
+            for filename in filenames
+        ]
+
+    def run_handler(self):
+        # Provider is imported here as it requires avalon to be available
+        from openpype.modules.sync_server.providers.local_drive import (
+            LocalDriveHandler
+        )
+
+        handler = LocalDriveHandler("benchmark", "studio")
+        transfers = [
+            (source_path, target_path, None)
+            for source_path, target_path in self.get_transfers(
+                os.path.join(self.root, "handler"))
+        ]
+        start = time.time()
+        results = handler.transfer_files(transfers, True)
+        duration = time.time() - start
+        errors = [result for result in results
+                  if isinstance(result, Exception)]
+        self.check_copies(transfers)
+        print('LocalDriveHandler: {} files in {:.2f}s ({} errors)'.format(
+            len(transfers), duration, len(errors)))
+        return duration
+
+    def run_legacy(self):
+        transfers = self.get_transfers(os.path.join(self.root, "legacy"),
+                                       self.legacy_sample)
+        start = time.time()
+        LegacyLocalCopy().copy_files(transfers)
+        duration = time.time() - start
+        estimate = duration / len(transfers) * self.no_of_files
+        print('Legacy: {} files in {:.2f}s, {} files ~{:.0f}s'.format(
+            len(transfers), duration, self.no_of_files, estimate))
+        return estimate
+
+    def check_copies(self, transfers):
+        for source_path, target_path, _progress in transfers:
+            source_stat = os.stat(source_path)
+            target_stat = os.stat(target_path)
+            assert source_stat.st_size == target_stat.st_size
+            assert source_stat.st_mtime_ns == target_stat.st_mtime_ns
+
+    def run(self):
+        try:
+            self.prepare()
+            handler_duration = self.run_handler()
+            legacy_duration = self.run_legacy()
+            print('Speedup ~{:.0f}x'.format(
+                legacy_duration / handler_duration))
+        finally:
+            shutil.rmtree(self.root)
+
+
+if __name__ == '__main__':
+    tp = TestLocalDrivePerformance(10000)
+    tp.run()
@@ -6,7 +6,10 @@ from avalon import style
 from Qt import QtCore, QtGui, QtWidgets
 from openpype.api import Logger, resources
 from openpype.modules import TrayModulesManager, ITrayService
-from openpype.settings.lib import get_system_settings
+from openpype.settings.lib import (
+    get_system_settings,
+    start_settings_watcher
+)
 import openpype.version
 from .pype_info_widget import PypeInfoWidget
 
@@ -25,6 +28,9 @@ class TrayManager:
 
         self.log = Logger.get_logger(self.__class__.__name__)
 
+        # Tray is long running process so settings changes are watched
+        #   instead of periodical reload of settings
+        start_settings_watcher()
         self.module_settings = get_system_settings()["modules"]
 
         self.modules_manager = TrayModulesManager()
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+from openpype.lib.vendor_bin_utils import FFprobeCache
+
+DATA = {"streams": [{"width": 1920, "height": 1080}], "format": {}}
+
+
+@pytest.fixture
+def filepath(tmpdir):
+    path = tmpdir.join("review.mov")
+    path.write_binary(b"content")
+    return str(path)
+
+
+def test_result_is_shared_through_directory(filepath, tmpdir):
+    FFprobeCache([str(tmpdir)]).set(filepath, DATA)
+    assert os.path.exists(
+        os.path.join(os.path.dirname(filepath), FFprobeCache.filename)
+    )
+
+    # new process reads result stored next to probed file
+    assert FFprobeCache([str(tmpdir)]).get(filepath) == DATA
+
+
+def test_result_outside_persist_roots_is_not_stored(filepath, tmpdir):
+    cache = FFprobeCache([str(tmpdir.join("staging"))])
+    cache.set(filepath, DATA)
+    assert not os.path.exists(
+        os.path.join(os.path.dirname(filepath), FFprobeCache.filename)
+    )
+
+    # result is still shared in process
+    assert cache.get(filepath) == DATA
+    assert FFprobeCache([str(tmpdir)]).get(filepath) is None
+
+
+def test_changed_file_is_probed_again(filepath):
+    cache = FFprobeCache()
+    cache.set(filepath, DATA)
+    with open(filepath, "ab") as stream:
+        stream.write(b"more content")
+
+    assert cache.get(filepath) is None
+    assert FFprobeCache().get(filepath) is None
+
+
+def test_result_is_persisted_under_passed_root(filepath, tmpdir):
+    cache = FFprobeCache([str(tmpdir.join("temp"))])
+    cache.set(filepath, DATA, persist_root=str(tmpdir))
+    assert os.path.exists(
+        os.path.join(os.path.dirname(filepath), FFprobeCache.filename)
+    )
+
+    other_cache = FFprobeCache([str(tmpdir.join("temp"))])
+    assert other_cache.get(filepath) is None
+    assert other_cache.get(filepath, persist_root=str(tmpdir)) == DATA
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+from openpype.lib.file_hash_cache import FileHashCache, file_content_hash
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return FileHashCache(str(tmpdir.join("file_hashes.db")))
+
+
+@pytest.fixture
+def filepath(tmpdir):
+    path = tmpdir.join("texture.tx")
+    path.write_binary(b"content" * 1000)
+    return str(path)
+
+
+def test_hash_is_cached(cache, filepath, monkeypatch):
+    content_hash = cache.get_file_hash(filepath)
+    assert content_hash == file_content_hash(filepath)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("Unchanged file was read again")
+
+    monkeypatch.setattr(
+        "openpype.lib.file_hash_cache.file_content_hash", _fail
+    )
+    assert cache.get_file_hash(filepath) == content_hash
+
+
+def test_changed_file_is_hashed(cache, filepath):
+    content_hash = cache.get_file_hash(filepath)
+    stat = os.stat(filepath)
+    with open(filepath, "ab") as stream:
+        stream.write(b"changed")
+    os.utime(filepath, (stat.st_atime, stat.st_mtime + 10))
+
+    new_hash = cache.get_file_hash(filepath)
+    assert new_hash != content_hash
+    assert new_hash == file_content_hash(filepath)
+
+
+def test_prune(cache, filepath, tmpdir):
+    other_path = tmpdir.join("other.tx")
+    other_path.write_binary(b"other")
+    cache.get_file_hash(filepath)
+    cache.get_file_hash(str(other_path))
+
+    os.remove(str(other_path))
+    assert cache.prune() == 1
+    assert cache.prune(max_age_days=0) == 1
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+from openpype.lib import file_transfers
+from openpype.lib.file_transfers import (
+    VERIFICATION_XXHASH,
+    VERIFICATION_BLAKE2,
+    FileTransferError,
+    FileTransfers
+)
+
+CONTENT = b"content" * 1000
+
+
+@pytest.fixture
+def src(tmpdir):
+    path = tmpdir.join("source", "render.exr")
+    path.write_binary(CONTENT, ensure=True)
+    return str(path)
+
+
+@pytest.fixture
+def dst(tmpdir):
+    return str(tmpdir.join("publish", "render.exr"))
+
+
+def create_transfers(**kwargs):
+    transfers = FileTransfers(**kwargs)
+    transfers.retry_delay = 0
+    return transfers
+
+
+def test_copy_is_retried_after_error(src, dst, monkeypatch):
+    attempts = []
+
+    def copyfile(source, destination):
+        attempts.append(source)
+        if len(attempts) == 1:
+            # partially copied file
+            with open(destination, "wb") as stream:
+                stream.write(CONTENT[:10])
+            raise IOError("Connection reset")
+        with open(destination, "wb") as stream:
+            stream.write(CONTENT)
+
+    monkeypatch.setattr(file_transfers, "copyfile", copyfile)
+
+    output = create_transfers(retries=1).copy_files([(src, dst)])
+    assert len(attempts) == 2
+    assert output == {os.path.normpath(dst): len(CONTENT)}
+    with open(dst, "rb") as stream:
+        assert stream.read() == CONTENT
+
+
+def test_size_mismatch_fails_and_removes_destination(src, dst, monkeypatch):
+    def copyfile(source, destination):
+        with open(destination, "wb") as stream:
+            stream.write(CONTENT[:10])
+
+    monkeypatch.setattr(file_transfers, "copyfile", copyfile)
+
+    with pytest.raises(FileTransferError) as exc_info:
+        create_transfers(retries=1).copy_files([(src, dst)])
+
+    assert exc_info.value.transferred == {}
+    assert [item for item, _ in exc_info.value.failed] == [
+        (os.path.normpath(src), os.path.normpath(dst))
+    ]
+    assert not os.path.exists(dst)
+
+
+@pytest.mark.parametrize(
+    "verification", [VERIFICATION_XXHASH, VERIFICATION_BLAKE2]
+)
+def test_hash_mismatch_fails(src, dst, verification, monkeypatch):
+    if file_transfers.get_hash_function(verification) is None:
+        pytest.skip("{} is not available".format(verification))
+
+    transfers = create_transfers(retries=0, verification=verification)
+    assert transfers.verification == verification
+    monkeypatch.setattr(transfers, "file_hash", lambda filepath: "corrupted")
+
+    with pytest.raises(FileTransferError) as exc_info:
+        transfers.copy_files([(src, dst)])
+
+    assert "does not match" in exc_info.value.failed[0][1]
+    assert not os.path.exists(dst)
+
+
+def test_process_files_raises_error_of_worker():
+    def callback(item):
+        if item == 2:
+            raise ValueError("Item {} is invalid".format(item))
+        return item * 10
+
+    transfers = create_transfers(workers=2)
+    assert transfers.process_files(callback, [0, 1]) == [(0, 0), (1, 10)]
+
+    with pytest.raises(FileTransferError) as exc_info:
+        transfers.process_files(callback, [0, 1, 2, 3])
+    assert exc_info.value.failed == [(2, "Item 2 is invalid")]
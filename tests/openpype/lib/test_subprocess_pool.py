@@ -0,0 +1,91 @@
+import sys
+import time
+import logging
+
+import pytest
+from openpype.lib.execute import SubprocessJob, SubprocessPool
+
+
+def python_job(code, label=None):
+    return SubprocessJob([sys.executable, "-c", code], label=label)
+
+
+def test_results_keep_order_of_jobs():
+    # each job prints its index and start and end time of its sleep
+    code = (
+        "import time; start = time.time(); time.sleep({}); "
+        "print({}, start, time.time())"
+    )
+    jobs = [
+        python_job(code.format(delay, idx))
+        for idx, delay in enumerate((1.0, 0.0, 0.2))
+    ]
+    SubprocessPool(workers=3).run(jobs)
+
+    outputs = [job.output.split() for job in jobs]
+    assert [output[0] for output in outputs] == ["0", "1", "2"]
+    # jobs were running in parallel
+    (_, start_0, end_0), _, (_, start_2, end_2) = [
+        (idx, float(start), float(end)) for idx, start, end in outputs
+    ]
+    assert start_2 < end_0 and start_0 < end_2
+
+
+def create_failing_jobs():
+    return [
+        python_job("print('ok')"),
+        python_job("import sys; sys.exit('first')"),
+        python_job("import sys; sys.exit('second')")
+    ]
+
+
+def test_failed_jobs():
+    jobs = create_failing_jobs()
+    SubprocessPool(workers=1).run(jobs, raise_error=False)
+    assert [job.failed for job in jobs] == [False, True, True]
+
+    # jobs after failure are not started
+    jobs = create_failing_jobs()
+    with pytest.raises(RuntimeError, match="first"):
+        SubprocessPool(workers=1).run(jobs)
+    assert [job.finished for job in jobs] == [True, True, False]
+
+
+def test_output_is_logged_while_job_runs():
+    class Handler(logging.Handler):
+        def __init__(self):
+            super(Handler, self).__init__()
+            self.records = []
+
+        def emit(self, record):
+            self.records.append((record, time.time()))
+
+    handler = Handler()
+    logger = logging.getLogger("test_subprocess_pool")
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+
+    code = (
+        "import sys, time; print('first'); sys.stdout.flush(); "
+        "time.sleep(1.0); sys.stderr.write('second\\n')"
+    )
+    job = python_job(code, label="job")
+    try:
+        SubprocessPool(workers=1, logger=logger).run([job])
+    finally:
+        logger.removeHandler(handler)
+
+    assert job.output.split() == ["first", "second"]
+    messages = [
+        (record.levelno, record.getMessage())
+        for record, _ in handler.records
+    ]
+    assert messages[:2] == [
+        (logging.DEBUG, "[job] first"),
+        (logging.WARNING, "[job] second")
+    ]
+    # first line was logged before the process finished
+    first_time, second_time = [
+        emit_time for _, emit_time in handler.records[:2]
+    ]
+    assert second_time - first_time > 0.5
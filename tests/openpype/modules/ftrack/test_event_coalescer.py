@@ -0,0 +1,66 @@
+import datetime
+
+from openpype.modules.ftrack.ftrack_server.lib import EventCoalescer
+
+STORED = datetime.datetime(2021, 6, 1, 12, 0, 0)
+
+
+def create_update_event(mongo_id, seconds, entity_id, status_change,
+                        project_id="project"):
+    old_status, new_status = status_change
+    return {
+        "_id": mongo_id,
+        "topic": "ftrack.update",
+        "source": {"user": {"username": "artist"}},
+        "pype_data": {
+            "stored": STORED + datetime.timedelta(seconds=seconds),
+            "is_processed": False
+        },
+        "data": {
+            "entities": [{
+                "entityId": entity_id,
+                "entityType": "task",
+                "action": "update",
+                "keys": ["statusid"],
+                "changes": {
+                    "statusid": {"old": old_status, "new": new_status}
+                },
+                "parents": [{"entityType": "show", "entityId": project_id}]
+            }]
+        }
+    }
+
+
+def test_events_within_window_are_merged():
+    events = [
+        create_update_event(1, 0, "task_a", ("ready", "wip")),
+        create_update_event(2, 1, "task_a", ("wip", "review")),
+        create_update_event(3, 2, "task_b", ("ready", "wip"))
+    ]
+    output = EventCoalescer(5).coalesce(events)
+
+    assert len(output) == 1
+    event_data, mongo_ids = output[0]
+    assert mongo_ids == [1, 2, 3]
+    entities = event_data["data"]["entities"]
+    assert [entity["entityId"] for entity in entities] == ["task_a", "task_b"]
+    assert entities[0]["changes"]["statusid"] == {
+        "old": "ready", "new": "review"
+    }
+    # source documents are not modified
+    assert events[0]["data"]["entities"][0]["changes"]["statusid"] == {
+        "old": "ready", "new": "wip"
+    }
+
+
+def test_events_outside_window_or_disabled_are_not_merged():
+    events = [
+        create_update_event(1, 0, "task_a", ("ready", "wip")),
+        create_update_event(2, 6, "task_a", ("wip", "review")),
+        create_update_event(3, 7, "task_a", ("ready", "wip"), "other")
+    ]
+    output = EventCoalescer(5).coalesce(events)
+    assert [mongo_ids for _, mongo_ids in output] == [[1], [2], [3]]
+
+    output = EventCoalescer(0).coalesce(events)
+    assert [mongo_ids for _, mongo_ids in output] == [[1], [2], [3]]
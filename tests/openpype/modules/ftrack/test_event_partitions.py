@@ -0,0 +1,97 @@
+from openpype.modules.ftrack.ftrack_server.lib import (
+    EventPartition,
+    ProcessEventHub
+)
+from openpype.modules.ftrack.lib.metadata_cache import get_metadata_cache
+
+
+class Session(object):
+    """Session of partition recording queries."""
+    def __init__(self):
+        self.event_hub = self
+        self.queries = []
+
+    def subscribe(self, subscription, callback, priority=100):
+        pass
+
+    def query(self, query):
+        self.queries.append(query)
+        return self
+
+    def all(self):
+        return []
+
+
+def create_event(mongo_id, project_id):
+    return {
+        "id": mongo_id,
+        "topic": "ftrack.update",
+        "data": {
+            "_event_mongo_id": mongo_id,
+            "entities": [{"entityType": "show", "entityId": project_id}]
+        }
+    }
+
+
+def create_hub(partitions_count):
+    hub = ProcessEventHub.__new__(ProcessEventHub)
+    hub._partitions = [
+        EventPartition(index, None, None)
+        for index in range(partitions_count)
+    ]
+    hub._partition_by_project_id = {}
+    hub.handled = []
+    hub._handle = hub.handled.append
+    hub.set_processed = lambda mongo_ids: None
+    return hub
+
+
+def test_projects_of_failed_partition_are_reassigned():
+    hub = create_hub(2)
+    failed, healthy = hub._partitions
+    hub.dispatch_event(create_event("1", "project"))
+    hub.dispatch_event(create_event("2", "project"))
+    assert failed.queue_size == 2
+
+    failed.failed = True
+    hub.dispatch_event(create_event("3", "project"))
+
+    # Waiting events are moved before the new event
+    assert failed.queue_size == 0
+    assert [event["id"] for event in healthy.take_events()] == [
+        "1", "2", "3"
+    ]
+
+
+def test_events_are_handled_by_processor_when_all_partitions_failed():
+    hub = create_hub(1)
+    partition = hub._partitions[0]
+    hub.dispatch_event(create_event("1", "project"))
+
+    partition.failed = True
+    hub.dispatch_event(create_event("2", "project"))
+
+    assert [event["id"] for event in hub.handled] == ["1", "2"]
+
+
+def test_schema_update_invalidates_caches_of_all_partitions():
+    hub = create_hub(2)
+    caches = []
+    for partition in hub._partitions:
+        partition.session = Session()
+        caches.append(get_metadata_cache(partition.session))
+        caches[-1].get_statuses()
+
+    status_event = {
+        "id": "1",
+        "topic": "ftrack.update",
+        "data": {
+            "_event_mongo_id": "1",
+            "entities": [{"entityType": "status", "entityId": "status"}]
+        }
+    }
+    hub.dispatch_event(status_event)
+
+    for cache in caches:
+        cache.get_statuses()
+        assert cache.session.queries == ["Status", "Status"]
@@ -0,0 +1,100 @@
+import mongomock
+import pytest
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import AutoReconnect
+
+from openpype.modules.sync_server.db_buffer import SiteUpdatesBuffer
+
+PREFIX = SiteUpdatesBuffer.site_key_prefix
+REPRE_ID = ObjectId()
+FILE_IDS = [ObjectId(), ObjectId()]
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Operations passed to bulk write, errors raised before them."""
+    output = {"operations": [], "errors": []}
+
+    def bulk_write(collection, operations, ordered=True):
+        if output["errors"]:
+            raise output["errors"].pop(0)
+        output["operations"].extend(operations)
+
+    monkeypatch.setattr(
+        mongomock.collection.Collection, "bulk_write", bulk_write
+    )
+    return output
+
+
+@pytest.fixture
+def buffer():
+    database = mongomock.MongoClient()["avalon"]
+    return SiteUpdatesBuffer(database, max_latency=60)
+
+
+def progress_update(value):
+    return {"$set": {PREFIX + "progress": value}}
+
+
+def result_update(created_dt):
+    return {
+        "$set": {PREFIX + "created_dt": created_dt},
+        "$unset": {PREFIX + "progress": ""}
+    }
+
+
+def expected_operation(updates):
+    array_filters = []
+    for idx, file_id in enumerate(FILE_IDS[:len(updates)]):
+        array_filters.append({"f{}._id".format(idx): file_id})
+        array_filters.append({"s{}.name".format(idx): "gdrive"})
+    return UpdateOne(
+        {"_id": REPRE_ID}, updates, upsert=True, array_filters=array_filters
+    )
+
+
+def test_updates_of_representation_are_coalesced(buffer, written):
+    buffer.add("project", REPRE_ID, FILE_IDS[0], "gdrive",
+               progress_update(0.5), is_progress=True)
+    buffer.add("project", REPRE_ID, FILE_IDS[0], "gdrive",
+               result_update(10))
+    # progress must not replace result of transfer
+    buffer.add("project", REPRE_ID, FILE_IDS[0], "gdrive",
+               progress_update(0.9), is_progress=True)
+    buffer.add("project", REPRE_ID, FILE_IDS[1], "gdrive",
+               progress_update(0.2), is_progress=True)
+
+    assert buffer.flush() == 1
+    assert written["operations"] == [expected_operation({
+        "$set": {
+            "files.$[f0].sites.$[s0].created_dt": 10,
+            "files.$[f1].sites.$[s1].progress": 0.2
+        },
+        "$unset": {"files.$[f0].sites.$[s0].progress": ""}
+    })]
+    assert buffer.flush() == 0
+
+
+def test_failed_updates_are_written_with_next_flush(buffer, written):
+    buffer.add("project", REPRE_ID, FILE_IDS[0], "gdrive",
+               result_update(10))
+    buffer.add("project", REPRE_ID, FILE_IDS[1], "gdrive",
+               progress_update(0.2), is_progress=True)
+
+    written["errors"].append(AutoReconnect("connection lost"))
+    assert buffer.flush() == 0
+    assert buffer.is_due() is False
+
+    # newer update is not overridden by failed one
+    buffer.add("project", REPRE_ID, FILE_IDS[1], "gdrive",
+               progress_update(0.7), is_progress=True)
+
+    assert buffer.flush() == 1
+    assert written["operations"] == [expected_operation({
+        "$set": {
+            "files.$[f0].sites.$[s0].created_dt": 10,
+            "files.$[f1].sites.$[s1].progress": 0.7
+        },
+        "$unset": {"files.$[f0].sites.$[s0].progress": ""}
+    })]
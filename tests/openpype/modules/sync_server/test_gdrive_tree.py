@@ -0,0 +1,150 @@
+import pytest
+from openpype.modules.sync_server.providers.gdrive_tree import (
+    FOLDER_STR,
+    GDriveFolderTree
+)
+
+
+class FakeRequest(object):
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+
+class FakeDrive(object):
+    """In-process stand-in of Drive API v3 service with folders only."""
+
+    page_size = 2
+
+    def __init__(self):
+        self.files_by_id = {}
+        self.changes_log = []
+        self.files_list_calls = 0
+        self.changes_list_calls = 0
+        self._next_id = 0
+
+    def create_folder(self, name, parent):
+        self._next_id += 1
+        folder_id = "folder{}".format(self._next_id)
+        self.update_folder(folder_id, name=name, parents=[parent])
+        return folder_id
+
+    def update_folder(self, folder_id, **kwargs):
+        folder = self.files_by_id.setdefault(folder_id, {
+            "id": folder_id,
+            "mimeType": FOLDER_STR,
+            "trashed": False
+        })
+        folder.update(kwargs)
+        self.changes_log.append({
+            "fileId": folder_id,
+            "removed": False,
+            "file": dict(folder)
+        })
+
+    def remove_folder(self, folder_id):
+        self.files_by_id.pop(folder_id)
+        self.changes_log.append({"fileId": folder_id, "removed": True})
+
+    def files(self):
+        return self
+
+    def changes(self):
+        return self
+
+    def getStartPageToken(self, **kwargs):
+        return FakeRequest({"startPageToken": str(len(self.changes_log))})
+
+    def list(self, pageToken=None, **kwargs):
+        if "q" in kwargs:
+            self.files_list_calls += 1
+            items = [
+                {"id": item["id"], "name": item["name"],
+                 "parents": item["parents"]}
+                for item in self.files_by_id.values()
+                if not item["trashed"]
+            ]
+            key = "files"
+        else:
+            self.changes_list_calls += 1
+            items = self.changes_log
+            key = "changes"
+
+        start = int(pageToken or 0)
+        end = start + self.page_size
+        response = {key: items[start:end]}
+        if end < len(items):
+            response["nextPageToken"] = str(end)
+        elif key == "changes":
+            response["newStartPageToken"] = str(len(items))
+        return FakeRequest(response)
+
+
+ROOTS = {"My Drive": {"id": "root"}}
+
+
+@pytest.fixture
+def drive():
+    drive = FakeDrive()
+    project_id = drive.create_folder("project", "root")
+    drive.create_folder("assets", project_id)
+    drive.create_folder("shots", project_id)
+    return drive
+
+
+@pytest.fixture
+def db_path(tmpdir):
+    return str(tmpdir.join("gdrive.db"))
+
+
+def create_tree(db_path):
+    folder_tree = GDriveFolderTree("gdrive", db_path)
+    folder_tree.changes_interval = 0
+    return folder_tree
+
+
+def test_tree_is_persisted(drive, db_path):
+    tree = create_tree(db_path).get_tree(drive, ROOTS)
+    assert set(tree) == {
+        "/My Drive",
+        "/My Drive/project",
+        "/My Drive/project/assets",
+        "/My Drive/project/shots"
+    }
+    assert drive.files_list_calls == 2
+
+    # new process loads stored folders and queries only changes
+    new_tree = create_tree(db_path).get_tree(drive, ROOTS)
+    assert new_tree == tree
+    assert drive.files_list_calls == 2
+    assert drive.changes_list_calls == 1
+
+
+def test_changes_are_applied(drive, db_path):
+    folder_tree = create_tree(db_path)
+    tree = folder_tree.get_tree(drive, ROOTS)
+    project_id = tree["/My Drive/project"]["id"]
+    shots_id = tree["/My Drive/project/shots"]["id"]
+
+    sh010_id = drive.create_folder("sh010", shots_id)
+    drive.update_folder(project_id, name="renamed")
+    drive.remove_folder(tree["/My Drive/project/assets"]["id"])
+
+    tree = create_tree(db_path).get_tree(drive, ROOTS)
+    assert tree == {
+        "/My Drive": {"id": "root"},
+        "/My Drive/renamed": {"id": project_id},
+        "/My Drive/renamed/shots": {"id": shots_id},
+        "/My Drive/renamed/shots/sh010": {"id": sh010_id}
+    }
+    assert drive.files_list_calls == 2
+
+
+def test_changed_roots_list_all_folders(drive, db_path):
+    create_tree(db_path).get_tree(drive, ROOTS)
+    roots = dict(ROOTS, shared={"id": "shared_drive"})
+    tree = create_tree(db_path).get_tree(drive, roots)
+    assert "/shared" in tree
+    assert drive.files_list_calls == 4
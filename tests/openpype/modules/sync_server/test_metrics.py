@@ -0,0 +1,42 @@
+from openpype.modules.sync_server.metrics import SyncMetrics
+
+
+def test_render_prometheus_text():
+    metrics = SyncMetrics()
+    metrics.record_transfer("project", "gdrive", "gdrive", "upload", 1024)
+    metrics.record_transfer("project", "gdrive", "gdrive", "upload",
+                            error="Timeout")
+    metrics.observe("loop_duration_seconds", {"project": "project"}, 3)
+
+    lines = metrics.render().splitlines()
+    labels = (
+        '{direction="upload",project="project",provider="gdrive",'
+        'site="gdrive"}'
+    )
+    assert "openpype_sync_transferred_bytes_total{} 1024".format(
+        labels) in lines
+    assert "openpype_sync_failed_files_total{} 1".format(labels) in lines
+    assert "# TYPE openpype_sync_loop_duration_seconds histogram" in lines
+    assert (
+        'openpype_sync_loop_duration_seconds_bucket'
+        '{project="project",le="2.5"} 0'
+    ) in lines
+    assert (
+        'openpype_sync_loop_duration_seconds_bucket'
+        '{project="project",le="+Inf"} 1'
+    ) in lines
+
+
+def test_history_contains_rates():
+    metrics = SyncMetrics()
+    assert metrics.sample() is None
+
+    metrics.record_transfer("project", "local", "local_drive", "download",
+                            2048)
+    metrics.set("queue_depth", {"project": "project", "site": "gdrive"}, 5)
+    sample = metrics.sample(force=True)
+
+    assert sample["files"] == 1
+    assert sample["bytes_per_second"] > 0
+    assert sample["queue_depth"] == 5
+    assert metrics.get_history() == [sample]
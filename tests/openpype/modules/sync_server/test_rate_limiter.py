@@ -0,0 +1,136 @@
+import pytest
+
+from openpype.modules.sync_server import rate_limiter
+from openpype.modules.sync_server.rate_limiter import (
+    TokenBucket,
+    AdaptiveConcurrency,
+    SiteRateLimiter
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time, sleeping moves the time forward."""
+    class Clock(object):
+        now = 1000.0
+
+        def time(self):
+            return self.now
+
+        def sleep(self, seconds):
+            self.now += seconds
+
+    _clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, "time", _clock.time)
+    monkeypatch.setattr(rate_limiter.time, "sleep", _clock.sleep)
+    return _clock
+
+
+def test_bucket_is_refilled_by_rate(clock):
+    bucket = TokenBucket(2)
+    assert bucket.get_wait_time() == 0
+    assert bucket.get_wait_time() == 0
+    assert bucket.get_wait_time() == pytest.approx(0.5)
+
+    clock.now += 0.25
+    assert bucket.acquire() == pytest.approx(0.25)
+    assert clock.now == pytest.approx(1000.5)
+
+    # capacity limits tokens stored while idle
+    clock.now += 60
+    assert bucket.get_wait_time() == 0
+    assert bucket.get_wait_time() == 0
+    assert bucket.get_wait_time() == pytest.approx(0.5)
+
+
+def test_blocked_bucket_gives_no_tokens(clock):
+    bucket = TokenBucket(2)
+    bucket.block(3)
+    assert bucket.get_wait_time() == pytest.approx(3)
+
+    # tokens are refilled only after block ended
+    clock.now += 3
+    assert bucket.get_wait_time() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.get_wait_time() == 0
+
+
+def test_bucket_without_rate_is_not_limited(clock):
+    bucket = TokenBucket(0)
+    for _ in range(100):
+        assert bucket.acquire() == 0
+
+
+def test_concurrency_grows_additively(clock):
+    concurrency = AdaptiveConcurrency(3)
+    concurrency.on_error()
+    assert concurrency.limit == 1
+
+    concurrency.on_success()
+    assert concurrency.limit == 2
+    # limit grows by 1 after 'limit' successes
+    concurrency.on_success()
+    assert concurrency.limit == 2
+    for _ in range(10):
+        concurrency.on_success()
+    assert concurrency.limit == 3
+
+
+def test_concurrency_is_halved_once_per_interval(clock):
+    concurrency = AdaptiveConcurrency(8)
+    concurrency.on_error()
+    assert concurrency.limit == 4
+    concurrency.on_error()
+    assert concurrency.limit == 4
+
+    clock.now += concurrency.decrease_interval
+    concurrency.on_error()
+    assert concurrency.limit == 2
+
+    clock.now += concurrency.decrease_interval
+    concurrency.on_error()
+    clock.now += concurrency.decrease_interval
+    concurrency.on_error()
+    assert concurrency.limit == concurrency.minimum
+
+
+def test_high_latency_decreases_concurrency(clock):
+    concurrency = AdaptiveConcurrency(4)
+    concurrency.on_success(0.1)
+    concurrency.on_success(0.2)
+    assert concurrency.limit == 4
+
+    concurrency.on_success(0.1 * concurrency.latency_ratio * 2)
+    assert concurrency.limit == 2
+
+
+def test_concurrency_limits_transfers(clock):
+    concurrency = AdaptiveConcurrency(2)
+    assert concurrency.try_acquire()
+    assert concurrency.try_acquire()
+    assert not concurrency.try_acquire()
+
+    concurrency.release()
+    assert concurrency.in_flight == 1
+    assert concurrency.try_acquire()
+
+
+def test_throttling_backs_off_exponentially(clock):
+    limiter = SiteRateLimiter("gdrive", 10, 4)
+    assert [limiter.record_throttled() for _ in range(3)] == [1, 2, 4]
+    assert limiter.bucket.get_wait_time() == pytest.approx(4)
+    # concurrency is decreased only once per interval
+    assert limiter.concurrency.limit == 2
+
+    for _ in range(10):
+        limiter.record_throttled()
+    assert limiter.record_throttled() == limiter.max_backoff
+
+    # successful request resets backoff
+    clock.now += limiter.max_backoff
+    limiter.record_success()
+    assert limiter.record_throttled() == 1
+    clock.now += 1
+    assert limiter.record_throttled(retry_after=30) == 30
+    assert limiter.bucket.get_wait_time() == pytest.approx(30)
+    assert limiter.get_status()["throttled_count"] == 16
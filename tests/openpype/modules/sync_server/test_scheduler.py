@@ -0,0 +1,49 @@
+from openpype.modules.sync_server import scheduler
+from openpype.modules.sync_server.scheduler import SyncScheduler
+
+SITES = ["studio", "gdrive"]
+
+
+def create_representation(repre_id, priority=None, size=1):
+    site = {"name": "gdrive"}
+    if priority is not None:
+        site["priority"] = priority
+    return {
+        "_id": repre_id,
+        "files": [{
+            "size": size,
+            "sites": [{"name": "studio", "created_dt": 1}, site]
+        }]
+    }
+
+
+def test_order_by_priority_and_size():
+    representations = [
+        create_representation("bulk_big", size=100),
+        create_representation("bulk_small", size=10),
+        create_representation("requested", priority=80, size=1000),
+        create_representation("low", priority=0)
+    ]
+    ordered = SyncScheduler().order("project", representations, SITES)
+    assert [repre["_id"] for repre in ordered] == [
+        "requested", "bulk_small", "bulk_big", "low"
+    ]
+
+
+def test_waiting_representations_are_not_starved(monkeypatch):
+    current_time = [1000.0]
+    monkeypatch.setattr(scheduler.time, "time", lambda: current_time[0])
+    sync_scheduler = SyncScheduler(aging_per_minute=1.0)
+    old = create_representation("old", priority=0)
+    sync_scheduler.order("project", [old], SITES)
+
+    # after 90 minutes 'old' outranks newly requested representation
+    current_time[0] += 90 * 60
+    new = create_representation("new", priority=80)
+    ordered = sync_scheduler.order("project", [new, old], SITES)
+    assert [repre["_id"] for repre in ordered] == ["old", "new"]
+
+    # synced representation is forgotten, its waiting time restarts
+    sync_scheduler.order("project", [new], SITES)
+    ordered = sync_scheduler.order("project", [new, old], SITES)
+    assert [repre["_id"] for repre in ordered] == ["new", "old"]
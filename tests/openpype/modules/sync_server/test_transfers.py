@@ -0,0 +1,86 @@
+import pytest
+
+from openpype.modules.sync_server.providers import transfers
+from openpype.modules.sync_server.providers.transfers import (
+    TransferSessions,
+    AdaptiveChunkSize
+)
+
+KB = 1024
+STAT = [100, 1622548800.0]
+
+
+@pytest.fixture
+def now(monkeypatch):
+    current = {"time": 1000000.0}
+    monkeypatch.setattr(transfers.time, "time", lambda: current["time"])
+    return current
+
+
+@pytest.fixture
+def sessions(tmpdir):
+    return TransferSessions(str(tmpdir.join("sync_server", "transfers.db")))
+
+
+def test_state_is_persisted(sessions):
+    key = sessions.get_key("gdrive", "Upload", "/source", "/target")
+    sessions.set(key, {"session_uri": "uri"}, STAT)
+
+    reopened = TransferSessions(sessions.db_path)
+    assert reopened.get(key, STAT) == {"session_uri": "uri"}
+
+    reopened.remove(key)
+    assert sessions.get(key, STAT) is None
+
+
+def test_state_of_changed_source_is_removed(sessions):
+    key = sessions.get_key("gdrive", "Upload", "/source", "/target")
+    sessions.set(key, {"session_uri": "uri"}, STAT)
+
+    assert sessions.get(key, [200, STAT[1]]) is None
+    assert sessions.get(key, STAT) is None
+
+
+def test_old_states_expire(sessions, now):
+    old_key = sessions.get_key("gdrive", "Upload", "/old", "/target")
+    new_key = sessions.get_key("gdrive", "Upload", "/new", "/target")
+    sessions.set(old_key, {}, STAT)
+    now["time"] += sessions.max_age - 10
+    sessions.set(new_key, {}, STAT)
+    now["time"] += 20
+
+    assert sessions.get(old_key, STAT) is None
+    sessions.set(old_key, {}, STAT)
+    now["time"] += sessions.max_age - 5
+    assert sessions.prune() == 1
+    assert sessions.get(old_key, STAT) == {}
+    assert sessions.get(new_key, STAT) is None
+
+
+def test_chunk_size_is_rounded_to_multiple():
+    chunk_size = AdaptiveChunkSize(1000 * KB, 300 * KB, 3000 * KB, 256 * KB)
+    assert chunk_size.chunk_size == 768 * KB
+    assert chunk_size.minimum == 256 * KB
+    assert chunk_size.maximum == 2816 * KB
+
+
+def test_chunk_size_follows_duration():
+    chunk_size = AdaptiveChunkSize(4 * KB, KB, 16 * KB, target_duration=5)
+
+    # fast chunks double the size up to maximum
+    assert chunk_size.record(4 * KB, 1) == 8 * KB
+    assert chunk_size.record(8 * KB, 1) == 16 * KB
+    assert chunk_size.record(16 * KB, 1) == 16 * KB
+
+    # duration around target keeps the size
+    assert chunk_size.record(16 * KB, 7) == 16 * KB
+
+    # last chunk of file is smaller and does not change the size
+    assert chunk_size.record(KB, 60) == 16 * KB
+
+    # slow chunks halve the size down to minimum
+    assert chunk_size.record(16 * KB, 11) == 8 * KB
+    assert chunk_size.failed() == 4 * KB
+    assert chunk_size.failed() == 2 * KB
+    assert chunk_size.failed() == KB
+    assert chunk_size.failed() == KB
@@ -0,0 +1,123 @@
+import time
+
+import pytest
+from openpype.settings.constants import (
+    SYSTEM_SETTINGS_KEY,
+    PROJECT_SETTINGS_KEY,
+    DEFAULT_PROJECT_KEY
+)
+from openpype.settings.handlers import (
+    CacheValues,
+    SettingsChangesWatcher,
+    bump_settings_change_stamp,
+    get_settings_change_stamp
+)
+
+mongomock = pytest.importorskip("mongomock")
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient()["openpype_test"]["settings"]
+
+
+@pytest.fixture
+def watcher(collection):
+    changes = []
+    w = SettingsChangesWatcher(collection, changes.extend, 0.01)
+    w.changes = changes
+    w.start()
+    assert w.wait_ready(5)
+    yield w
+    w.stop()
+    w.join(5)
+
+
+def wait_for(condition, timeout=5):
+    start = time.time()
+    while not condition():
+        if time.time() - start > timeout:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_change_stamp(collection):
+    assert get_settings_change_stamp(collection) == 0
+    bump_settings_change_stamp(collection, SYSTEM_SETTINGS_KEY)
+    bump_settings_change_stamp(collection, PROJECT_SETTINGS_KEY, "prj")
+    assert get_settings_change_stamp(collection) == 2
+
+
+def test_watcher_reports_changed_settings(collection, watcher):
+    # Polling fallback is used as mongomock does not support change streams
+    bump_settings_change_stamp(collection, SYSTEM_SETTINGS_KEY)
+    assert wait_for(lambda: watcher.stamp == 1)
+    assert watcher.uses_change_stream is False
+    assert watcher.changes == [(SYSTEM_SETTINGS_KEY, None)]
+
+    bump_settings_change_stamp(
+        collection, PROJECT_SETTINGS_KEY, DEFAULT_PROJECT_KEY
+    )
+    assert wait_for(lambda: watcher.stamp == 2)
+    assert watcher.changes[1:] == [
+        (PROJECT_SETTINGS_KEY, DEFAULT_PROJECT_KEY)
+    ]
+
+
+def test_cache_values_without_lifetime():
+    cache = CacheValues(None)
+    assert cache.is_outdated
+
+    cache.update_data({"key": "value"})
+    assert not cache.is_outdated
+
+    cache.set_outdated()
+    assert cache.is_outdated
+    assert cache.data_copy() == {"key": "value"}
+
+
+def test_watcher_invalidates_before_stamp_changes(collection):
+    stamps = []
+    w = SettingsChangesWatcher(
+        collection, lambda changes: stamps.append(w.stamp)
+    )
+    w.process_document({"stamp": 1, "changes": {SYSTEM_SETTINGS_KEY: 1}})
+    w.process_document({"stamp": 3, "changes": {
+        SYSTEM_SETTINGS_KEY: 1, PROJECT_SETTINGS_KEY: {"prj": 2}
+    }})
+    # callback was called before new stamp was set
+    assert stamps == [1]
+    assert w.stamp == 3
+    assert w.get_changes(1, 3) == [(PROJECT_SETTINGS_KEY, "prj")]
+    assert w.get_changes(0, 3) is None
+
+
+def test_invalidate_only_changed_settings(monkeypatch):
+    from openpype.settings import lib
+
+    def cached(name, *args):
+        return ((name, args, ()), (("defaults", 1), 0, name))
+
+    monkeypatch.setattr(lib, "_SETTINGS_CACHE", dict([
+        cached("get_system_settings"),
+        cached("get_project_settings", "prj"),
+        cached("get_project_settings", "other"),
+        cached("get_anatomy_settings", "prj")
+    ]))
+    lib._invalidate_settings_cache([(PROJECT_SETTINGS_KEY, "prj")], 1, 2)
+    assert sorted(
+        (key[0], key[1], cached[0])
+        for key, cached in lib._SETTINGS_CACHE.items()
+    ) == [
+        ("get_anatomy_settings", ("prj",), ("defaults", 2)),
+        ("get_project_settings", ("other",), ("defaults", 2)),
+        ("get_system_settings", (), ("defaults", 2))
+    ]
+
+    lib._invalidate_settings_cache(
+        [(PROJECT_SETTINGS_KEY, DEFAULT_PROJECT_KEY)], 2, 3
+    )
+    assert [key[0] for key in lib._SETTINGS_CACHE] == [
+        "get_system_settings", "get_anatomy_settings"
+    ]